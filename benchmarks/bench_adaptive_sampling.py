@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark adaptive time-grid sampling (Astrometry.adaptive_sample) for 2L1S events.
+
+Draws synthetic binary-lens events on a dense observation grid (8,500 epochs
+by default, like the GULLS light curves), solves each with
+Astrometry.binary_lens_solver on every epoch and adaptively, and reports the
+number of solves, the wall-clock time and the largest interpolation error.
+
+Usage:
+    python benchmarks/bench_adaptive_sampling.py [--events N] [--epochs T] [--tol TOL]
+"""
+
+import sys
+import time
+import pathlib
+import argparse
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(pathlib.Path(__file__).parent.parent))
+
+from src.astrometry import Astrometry
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Astrometry.adaptive_sample.")
+    parser.add_argument("--events", type=int, default=10, help="Number of synthetic events.")
+    parser.add_argument("--epochs", type=int, default=8500, help="Epochs per event.")
+    parser.add_argument("--tol", type=float, default=1e-4, help="Centroid error bound (Einstein radii).")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    times = np.linspace(0, 200, args.epochs)
+
+    print(f"{'event':>5s} {'solves':>7s} {'full [s]':>9s} {'adaptive [s]':>13s} {'speedup':>8s} {'max error':>10s}")
+    total_full = total_adaptive = total_solves = 0.0
+    for i in range(args.events):
+        data = {
+            "t0": rng.uniform(80, 120),
+            "tE": rng.uniform(5, 40),
+            "u0": rng.uniform(0.01, 0.5),
+            "rho": 10 ** rng.uniform(-3, -2),
+            "q": 10 ** rng.uniform(-4, 0),
+            "s": 10 ** rng.uniform(-0.3, 0.3),
+            "alpha": rng.uniform(0, 360),
+        }
+        solve = Astrometry.binary_lens_solver(data)
+
+        start = time.perf_counter()
+        full_x, full_y, _ = solve(times)
+        t_full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        dx, dy, solved = Astrometry.adaptive_sample(solve, times, tol=args.tol, max_step=data["tE"] / 10.0)
+        t_adaptive = time.perf_counter() - start
+
+        error = max(np.max(np.abs(dx - full_x)), np.max(np.abs(dy - full_y)))
+        print(f"{i:5d} {len(solved):7d} {t_full:9.3f} {t_adaptive:13.3f} {t_full / t_adaptive:7.1f}x {error:10.2e}")
+        total_full += t_full
+        total_adaptive += t_adaptive
+        total_solves += len(solved)
+
+    print(f"solves: {total_solves / args.events:.0f} of {args.epochs} per event "
+          f"({args.epochs * args.events / total_solves:.1f}x fewer), time: {total_full / total_adaptive:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
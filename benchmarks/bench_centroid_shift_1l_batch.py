@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark Astrometry.centroid_shift_1l_batch against a per-epoch VBMicrolensing loop.
+
+Draws synthetic 1L1S events (t0, tE, u0, rho) on a common time grid, checks
+that the batch engine agrees with VBMicrolensing.ESPLMag2 (the engine behind
+OneL1S, at its RelTol = Tol = 1e-3) to 2e-3 Einstein radii and prints the
+timings per epoch.
+
+Usage:
+    python benchmarks/bench_centroid_shift_1l_batch.py [--events N] [--epochs T] [--reference_events K]
+"""
+
+import sys
+import time
+import pathlib
+import argparse
+
+import numpy as np
+import VBMicrolensing
+
+# Add project root to path
+sys.path.append(str(pathlib.Path(__file__).parent.parent))
+
+from src.astrometry import Astrometry
+
+
+def reference_centroid_shift(t0, tE, u0, rho, times):
+    """Per-epoch ESPLMag2 loop, as OneL1S evaluates one event."""
+    vbm = VBMicrolensing.VBMicrolensing()
+    vbm.RelTol = 1e-3
+    vbm.Tol = 1e-3
+    vbm.astrometry = True
+
+    tau = (times - t0) / tE
+    dx = np.empty_like(times)
+    dy = np.empty_like(times)
+    for i, (x, y) in enumerate(zip(tau, np.full_like(tau, u0))):
+        u = np.hypot(x, y)
+        vbm.ESPLMag2(u, rho)
+        shift = vbm.astrox1 - u
+        dx[i] = shift * x / u
+        dy[i] = shift * y / u
+    return dx, dy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Astrometry.centroid_shift_1l_batch.")
+    parser.add_argument("--events", type=int, default=1000, help="Number of synthetic events.")
+    parser.add_argument("--epochs", type=int, default=1000, help="Epochs per event.")
+    parser.add_argument("--reference_events", type=int, default=20, help="Events run through the VBMicrolensing loop.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    t0 = rng.uniform(20, 80, args.events)
+    tE = rng.uniform(5, 50, args.events)
+    u0 = rng.uniform(0.001, 0.5, args.events)  # u0 = 0 would divide by zero in the reference loop
+    rho = 10 ** rng.uniform(-3, -0.5, args.events)
+    times = np.tile(np.linspace(0, 100, args.epochs), (args.events, 1))
+
+    start = time.perf_counter()
+    dx, dy = Astrometry.centroid_shift_1l_batch(t0, tE, u0, rho, times)
+    t_batch = time.perf_counter() - start
+
+    k = min(args.reference_events, args.events)
+    start = time.perf_counter()
+    worst = 0.0
+    for i in range(k):
+        ref_dx, ref_dy = reference_centroid_shift(t0[i], tE[i], u0[i], rho[i], times[i])
+        worst = max(worst, np.max(np.abs(dx[i] - ref_dx)), np.max(np.abs(dy[i] - ref_dy)))
+    t_reference = time.perf_counter() - start
+    assert worst < 2e-3, f"batch engine differs from VBMicrolensing by {worst:.2e}"
+
+    per_batch = t_batch / (args.events * args.epochs)
+    per_reference = t_reference / (k * args.epochs)
+    print(f"events: {args.events}  epochs/event: {args.epochs}")
+    print(f"batch engine:           {t_batch:8.3f} s  ({per_batch * 1e6:8.3f} us/epoch)")
+    print(f"VBMicrolensing loop:    {t_reference:8.3f} s  ({per_reference * 1e6:8.3f} us/epoch, {k} events)")
+    print(f"speedup:                {per_reference / per_batch:8.1f}x")
+    print(f"max |difference|:       {worst:.2e} Einstein radii")
+
+
+if __name__ == "__main__":
+    main()
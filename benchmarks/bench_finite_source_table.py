@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark the finite-source 1L lookup table (Astrometry.finite_source_shift).
+
+Draws lens-source separations and limb-darkened sources (rho, LDgamma),
+reports the table error against direct integration
+(Astrometry.limb_darkened_shift) in units of rho, and times the table, the
+direct integral and a per-epoch VBMicrolensing.ESPLMag2 loop (the engine
+behind OneL1S, at its RelTol = Tol = 1e-3, with a1 = 3 Gamma / (2 + Gamma)).
+
+Usage:
+    python benchmarks/bench_finite_source_table.py [--epochs N] [--cache_dir DIR]
+"""
+
+import sys
+import time
+import pathlib
+import argparse
+
+import numpy as np
+import VBMicrolensing
+
+# Add project root to path
+sys.path.append(str(pathlib.Path(__file__).parent.parent))
+
+from src.astrometry import Astrometry
+
+
+def reference_shift(u, rho, gamma):
+    """Per-epoch ESPLMag2 loop, as OneL1S evaluates one event."""
+    vbm = VBMicrolensing.VBMicrolensing()
+    vbm.RelTol = 1e-3
+    vbm.Tol = 1e-3
+    vbm.astrometry = True
+
+    shift = np.empty_like(u)
+    for i, (ui, rhoi, gi) in enumerate(zip(u, rho, gamma)):
+        vbm.a1 = 3 * gi / (2 + gi)
+        vbm.ESPLMag2(ui, rhoi)
+        shift[i] = vbm.astrox1 - ui
+    return shift
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the finite-source 1L lookup table.")
+    parser.add_argument("--epochs", type=int, default=1_000_000, help="Epochs evaluated with the table.")
+    parser.add_argument("--reference_epochs", type=int, default=20_000, help="Epochs of the direct and VBMicrolensing runs.")
+    parser.add_argument("--cache_dir", type=str, default=None, help="Lookup table directory.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    rho = 10 ** rng.uniform(-3, -1, args.epochs)
+    u = rho * rng.uniform(0, 30, args.epochs)
+    gamma = rng.uniform(0, 1, args.epochs)
+
+    table, t_load = timed(Astrometry.finite_source_table, args.cache_dir)
+    fast, t_fast = timed(Astrometry.finite_source_shift, u, rho, gamma, table)
+
+    k = slice(0, min(args.reference_epochs, args.epochs))
+    direct, t_direct = timed(Astrometry.limb_darkened_shift, u[k], rho[k], gamma[k])
+    vbm, t_vbm = timed(reference_shift, u[k], rho[k], gamma[k])
+
+    n_ref = len(direct)
+    print(f"table load/build:       {t_load:8.3f} s  ({table.shape[0]} z nodes)")
+    print(f"lookup table:           {t_fast / args.epochs * 1e6:8.3f} us/epoch")
+    print(f"direct integration:     {t_direct / n_ref * 1e6:8.3f} us/epoch")
+    print(f"VBMicrolensing loop:    {t_vbm / n_ref * 1e6:8.3f} us/epoch")
+    print(f"speedup vs direct:      {t_direct / n_ref / (t_fast / args.epochs):8.1f}x")
+    print(f"speedup vs VBM:         {t_vbm / n_ref / (t_fast / args.epochs):8.1f}x")
+    print(f"max |table - direct| / rho:  {np.max(np.abs(fast[k] - direct) / rho[k]):.2e}")
+    print(f"max |table - VBM|:           {np.max(np.abs(fast[k] - vbm)):.2e} Einstein radii")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark GullsParser.load_lc_file against the previous readlines/StringIO reader.
+
+Runs both readers over the light curve files in input/1L, checks that they
+return the same (df, comment_text, header) triple and prints the timings,
+plus the time of a repeat load through the LightCurveCache.
+
+Usage:
+    python benchmarks/bench_load_lc_file.py [--repeat N] [--input_dir input/1L]
+"""
+
+import sys
+import time
+import pathlib
+import shutil
+import argparse
+import tempfile
+from functools import partial
+from io import StringIO
+
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(pathlib.Path(__file__).parent.parent))
+
+from src.gulls_parser import GullsParser
+
+
+def legacy_load_lc_file(file_path):
+    """The original multi-pass reader, kept here as the reference implementation."""
+    with open(file_path, 'r') as f:
+        lines = f.readlines()
+
+    comment_lines = [line for line in lines if line.startswith("#")]
+    header_line = next((line for line in lines if not line.startswith("#")), None)
+    if header_line is None:
+        raise ValueError("No header found in the file.")
+
+    header = header_line.strip().split()
+    data_lines = [line for line in lines if not line.startswith("#") and line.strip() != header_line.strip()]
+    data_text = "".join(data_lines)
+    df = pd.read_csv(StringIO(data_text), sep=r'\s+', names=header)
+    comment_text = "\n".join(comment_lines)
+
+    return df, comment_text, header
+
+
+def best_time(func, file_path, repeat):
+    """Return the best wall-clock time of ``repeat`` calls."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(file_path)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GullsParser.load_lc_file.")
+    parser.add_argument("--input_dir", type=str, default="input/1L", help="Directory with .lc files.")
+    parser.add_argument("--repeat", type=int, default=10, help="Number of timed calls per file.")
+    args = parser.parse_args()
+
+    input_dir = pathlib.Path(args.input_dir)
+    data_files = sorted(p for p in input_dir.iterdir() if p.suffix in (".lc", ".lcdata", ".dat"))
+    if not data_files:
+        raise FileNotFoundError(f"No data files found in: {input_dir}")
+
+    cache_dir = tempfile.mkdtemp(prefix="lc_cache_")
+
+    print(f"{'file':45s} {'size [MB]':>10s} {'legacy [ms]':>12s} {'new [ms]':>10s} {'speedup':>8s} {'cached [ms]':>12s}")
+    for data_file in data_files:
+        df_old, comments_old, header_old = legacy_load_lc_file(data_file)
+        df_new, comments_new, header_new = GullsParser.load_lc_file(data_file)
+
+        # Same triple; dtypes may differ where legacy inference guessed int64
+        # for an all-zero float column (e.g. lens1_y)
+        assert header_new == header_old
+        assert comments_new == comments_old
+        pd.testing.assert_frame_equal(df_new, df_old, check_dtype=False)
+
+        t_old = best_time(legacy_load_lc_file, data_file, args.repeat)
+        t_new = best_time(GullsParser.load_lc_file, data_file, args.repeat)
+
+        cached_load = partial(GullsParser.load_lc_file, cache_dir=cache_dir)
+        df_cached, comments_cached, _ = cached_load(data_file)  # fills the cache
+        pd.testing.assert_frame_equal(df_cached, df_new)
+        assert comments_cached == comments_new
+        t_cached = best_time(cached_load, data_file, args.repeat)
+
+        size = data_file.stat().st_size / 1e6
+        print(f"{data_file.name:45s} {size:10.2f} {t_old * 1e3:12.2f} {t_new * 1e3:10.2f} {t_old / t_new:7.2f}x {t_cached * 1e3:12.2f}")
+
+    shutil.rmtree(cache_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark full versus projected master loading (GullsParser.read_master).
+
+Writes a synthetic CSV master with the columns of 1L_master.head and random
+values, then reads it once with every column and once with only the
+columns the single lens mappings need (GullsParser.master_columns), and
+prints the read times and DataFrame memory.
+
+Usage:
+    python benchmarks/bench_load_master.py [--rows N] [--master_head 1L_master.head]
+"""
+
+import sys
+import time
+import shutil
+import pathlib
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(pathlib.Path(__file__).parent.parent))
+
+from src.gulls_parser import GullsParser
+
+
+def write_synthetic_master(master_head, rows, path, seed=0):
+    """Write a CSV master with the columns of master_head and random values."""
+    columns = pd.read_csv(master_head, sep=r'\s+', nrows=0).columns.tolist()
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.normal(size=(rows, len(columns))), columns=columns)
+    df["SubRun"] = rng.integers(0, 10, rows)
+    df["Field"] = rng.integers(0, 1000, rows)
+    df["EventID"] = np.arange(rows)
+    df.to_csv(path, index=False)
+    return len(columns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark projected master loading.")
+    parser.add_argument("--rows", type=int, default=100000, help="Rows in the synthetic master.")
+    parser.add_argument("--master_head", type=str, default="1L_master.head", help="Master file to take the columns from.")
+    args = parser.parse_args()
+
+    tmp_dir = pathlib.Path(tempfile.mkdtemp(prefix="master_bench_"))
+    try:
+        master_file = tmp_dir / "master.csv"
+        n_columns = write_synthetic_master(args.master_head, args.rows, master_file)
+        columns = GullsParser().master_columns("single")
+        print(f"rows: {args.rows}  columns: {n_columns}  file: {master_file.stat().st_size / 1e6:.1f} MB")
+
+        for label, kwargs in (("all columns", {}), (f"projected ({len(columns)})", {"columns": columns})):
+            start = time.perf_counter()
+            df = GullsParser.read_master(master_file, **kwargs)
+            elapsed = time.perf_counter() - start
+            memory = df.memory_usage(deep=True).sum() / 1e6
+            print(f"{label:20s} {elapsed:8.3f} s  {memory:10.1f} MB")
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
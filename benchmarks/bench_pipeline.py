@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the end-to-end augmentation pipeline.
+
+Builds synthetic single lens event sets (10, 1,000 and 100,000 events by
+default) from the light curves in input/1L: a CSV master with one row per
+event and light curve files linked to the samples under event file names.
+For each set it times
+
+  * GullsParser.load_lc_file, load_single_lens_master and get_master_row,
+  * GullsParser.get_magnitudes and get_fluxes, and the fused photometry,
+  * every Astrometry.centroid_shift* method,
+  * CentroidAddition.simulate_astrometric_shift,
+  * GullsParser.save_lc_output,
+  * the whole process_single_lens loop,
+
+and writes the best of --repeat timings per stage to a JSON file named after
+the current commit, so runs can be compared with --compare.
+
+The master stages always see every event of a set. The light curve stages run
+on the first --max_files events (a 100,000-event set would otherwise need
+100,000 light curve files and ~150 GB of text output), and the 2L/3L solvers
+on the first --max_model_events of those; "n_items" in the results says how
+many events a timing covers. A stage that raises is recorded with its error
+instead of aborting the run.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--sizes 10 1000 100000] [--max_files 50] [--repeat 3]
+                                        [--output results.json] [--compare baseline.json]
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import pathlib
+import argparse
+import platform
+import tempfile
+import subprocess
+import datetime
+import contextlib
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+PROJECT_ROOT = pathlib.Path(__file__).parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from src.gulls_parser import GullsParser
+from src.astrometry import Astrometry
+from src.centroid_addition import CentroidAddition
+
+
+def best_time(func, repeat):
+    """Return the best wall-clock time of ``repeat`` calls."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def git_commit():
+    """Current commit hash and whether the work tree has changes (None, None outside git)."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=PROJECT_ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, bool(status.strip())
+
+
+def make_event_set(sample_files, n_events, n_files, set_dir, seed=0):
+    """
+    Write a synthetic single lens event set to set_dir/1L.
+
+    The master has n_events rows with the columns the single, binary and triple
+    lens mappings read; the first n_files events get a light curve, linked
+    (or copied) from the samples in turn. Returns the light curve paths.
+    """
+    lens_dir = set_dir / "1L"
+    lens_dir.mkdir(parents=True)
+    rng = np.random.default_rng(seed)
+
+    # event times follow the BJD span of the sample each event is linked to
+    spans = []
+    for sample in sample_files:
+        bjd = GullsParser.load_lc_file(sample)[0]["BJD"].to_numpy()
+        spans.append((bjd.min(), bjd.max()))
+    sample_index = np.arange(n_events) % len(sample_files)
+    start, stop = np.array(spans)[sample_index].T
+
+    master = pd.DataFrame({
+        "SubRun": np.arange(n_events) // 1000,
+        "Field": np.ones(n_events, dtype=np.int64),
+        "EventID": np.arange(n_events),
+        "t0lens1": start + (stop - start) * rng.uniform(0.3, 0.7, n_events),
+        "tE_ref": rng.uniform(5, 50, n_events),
+        "u0lens1": rng.uniform(0.01, 0.5, n_events),
+        "rho": 10 ** rng.uniform(-3, -2, n_events),
+        "piEN": rng.normal(0, 0.1, n_events),
+        "piEE": rng.normal(0, 0.1, n_events),
+        "q": 10 ** rng.uniform(-4, -1, n_events),
+        "s": 10 ** rng.uniform(-0.3, 0.3, n_events),
+        "alpha": rng.uniform(0, 360, n_events),
+        "q3": 10 ** rng.uniform(-5, -3, n_events),
+        "s3": 10 ** rng.uniform(-0.3, 0.3, n_events),
+        "psi": rng.uniform(0, 360, n_events),
+    })
+    master.to_csv(lens_dir / "master.csv", index=False)
+
+    lc_files = []
+    for row in master.head(n_files).itertuples():
+        lc_file = lens_dir / f"bench_{row.SubRun}_{row.Field}_{row.EventID}.det.lc"
+        sample = sample_files[row.Index % len(sample_files)].resolve()
+        try:
+            os.symlink(sample, lc_file)
+        except OSError:
+            shutil.copyfile(sample, lc_file)
+        lc_files.append(lc_file)
+    return master, lc_files
+
+
+def model_parameters(row, bjd):
+    """Astrometry parameter dictionary of a synthetic master row."""
+    return {
+        "t0": row.t0lens1, "tE": row.tE_ref, "u0": row.u0lens1, "rho": row.rho, "BJD": bjd,
+        "q": row.q, "s": row.s, "alpha": row.alpha, "q2": row.q, "s2": row.s, "q3": row.q3, "s3": row.s3,
+        "psi": row.psi,
+    }
+
+
+def benchmark_event_set(n_events, args, sample_files, work_dir):
+    """Time every stage on one synthetic event set; returns the result records."""
+    set_dir = work_dir / f"events_{n_events}"
+    n_files = min(n_events, args.max_files)
+    n_models = min(n_files, args.max_model_events)
+    master, lc_files = make_event_set(sample_files, n_events, n_files, set_dir / "input", seed=args.seed)
+    records = []
+
+    def stage(name, n_items, func, repeat=args.repeat):
+        record = {"stage": name, "n_events": n_events, "n_items": n_items, "repeat": repeat}
+        try:
+            # save_lc_output reports every file it writes
+            with contextlib.redirect_stdout(io.StringIO()):
+                seconds = best_time(func, repeat)
+        except Exception as error:
+            record["error"] = f"{type(error).__name__}: {error}"
+            print(f"{n_events:>7d} {name:38s} {n_items:>7d}   failed: {record['error'][:80]}")
+        else:
+            record["seconds"] = seconds
+            record["per_item"] = seconds / n_items
+            print(f"{n_events:>7d} {name:38s} {n_items:>7d} {seconds:10.4f} s {seconds / n_items * 1e3:10.4f} ms/item")
+        records.append(record)
+
+    # master loading and lookup over every event of the set
+    parser = GullsParser(input_dir=str(set_dir / "input"), output_dir=str(set_dir / "output"))
+    stage("load_single_lens_master", n_events, parser.load_single_lens_master)
+    keys = list(zip(master["SubRun"].tolist(), master["Field"].tolist(), master["EventID"].tolist()))
+
+    def lookup():
+        for key in keys:
+            GullsParser.get_master_row(parser.single_lens_master, parser.single_lens_master_index, key)
+    stage("get_master_row", n_events, lookup)
+
+    # light curve stages
+    stage("load_lc_file", n_files, lambda: [GullsParser.load_lc_file(lc_file) for lc_file in lc_files])
+
+    events = []
+    for lc_file, row in zip(lc_files, master.itertuples()):
+        df, lc_header, header = GullsParser.load_lc_file(lc_file, parse_header=True)
+        parameters = GullsParser.header_parameters(lc_header)
+        F = df["measured_relative_flux"].to_numpy()
+        events.append({
+            "df": df, "header": header, "comment_text": lc_header.comment_text, "row": row,
+            "F": F, "F_err": df["measured_relative_flux_error"].to_numpy(),
+            "obs": df["observatory_code"].to_numpy(), "fs": parameters["fs"], "ms": parameters["ms"],
+        })
+    zp = GullsParser.get_zeropoint(parser.filters)
+    for event in events:
+        # get_magnitudes wants fs and ms as long as its codes: per-epoch values with identity codes
+        event["epochs"] = np.arange(len(event["F"]))
+        event["fs_epoch"] = np.asarray(event["fs"])[event["obs"]]
+        event["ms_epoch"] = np.asarray(event["ms"])[event["obs"]]
+        event["mag"] = GullsParser.get_magnitudes(event["F"], event["fs_epoch"], event["ms_epoch"], event["epochs"])[0]
+        event["mag_err"] = (2.5 / np.log(10)) * event["F_err"] / event["F"]
+
+    stage("get_magnitudes", n_files, lambda: [
+        GullsParser.get_magnitudes(e["F"], e["fs_epoch"], e["ms_epoch"], e["epochs"]) for e in events])
+    stage("get_fluxes", n_files, lambda: [
+        GullsParser.get_fluxes(e["mag"], e["mag_err"], e["obs"], zp) for e in events])
+    stage("photometry", n_files, lambda: [
+        GullsParser.photometry(e["obs"], e["F"], e["F_err"], e["F"], e["F_err"], e["fs"], e["ms"], zp) for e in events])
+
+    # centroid models; the finite-source table is built (or mapped) before timing
+    Astrometry.finite_source_table()
+    parameters = [model_parameters(e["row"], e["df"]["BJD"].to_numpy()) for e in events]
+    stage("centroid_shift_1l", n_models, lambda: [Astrometry.centroid_shift_1l(p) for p in parameters[:n_models]])
+    stage("centroid_shift_1l[fast]", n_files, lambda: [Astrometry.centroid_shift_1l(p, fast=True) for p in parameters])
+    stage("centroid_shift_1l_batch", n_files, lambda: Astrometry.centroid_shift_1l_batch(
+        [p["t0"] for p in parameters], [p["tE"] for p in parameters], [p["u0"] for p in parameters],
+        [p["rho"] for p in parameters], [p["BJD"] for p in parameters]))
+    stage("centroid_shifts_2l[adaptive]", n_models, lambda: [
+        Astrometry.centroid_shifts_2l(p, adaptive=True) for p in parameters[:n_models]])
+    stage("centroid_shifts_2l_batch", n_models, lambda: Astrometry.centroid_shifts_2l_batch(
+        pd.DataFrame(parameters[:n_models]).drop(columns="BJD"), [p["BJD"] for p in parameters[:n_models]]))
+    stage("centroid_shifts_3l[adaptive]", n_models, lambda: [
+        Astrometry.centroid_shifts_3l(p, adaptive=True) for p in parameters[:n_models]])
+
+    # blending and output
+    centroid_addition = CentroidAddition()
+    blends = []
+    for event in events:
+        df = pd.DataFrame({"relative_flux": event["F"]})
+        source_position = np.array([event["df"]["source_x"].iloc[0], event["df"]["source_y"].iloc[0]])
+        lens_positions = np.array([[event["df"]["lens1_x"].iloc[0], event["df"]["lens1_y"].iloc[0]]])
+        blends.append((df, source_position, lens_positions, np.array([0.1])))
+    stage("simulate_astrometric_shift", n_files, lambda: [
+        centroid_addition.simulate_astrometric_shift(*blend) for blend in blends])
+
+    save_dir = set_dir / "save"
+    save_dir.mkdir()
+    stage("save_lc_output", n_files, lambda: [
+        GullsParser.save_lc_output(e["df"], save_dir / f"{i}.lc", e["header"], e["comment_text"], args.output_format)
+        for i, e in enumerate(events)])
+    shutil.rmtree(save_dir)
+
+    def process():
+        output_dir = set_dir / "output"
+        shutil.rmtree(output_dir, ignore_errors=True)
+        (output_dir / "1L").mkdir(parents=True)
+        GullsParser(input_dir=str(set_dir / "input"), output_dir=str(output_dir), output_format=args.output_format,
+                    noise_seed=args.seed).process_single_lens(add_astrometry=True, workers=args.workers)
+    stage("process_single_lens", n_files, process)
+
+    shutil.rmtree(set_dir)
+    return records
+
+
+def compare(records, baseline_path, threshold):
+    """Print per-item time ratios against a baseline JSON; returns the regressed stages."""
+    baseline = json.loads(pathlib.Path(baseline_path).read_text())
+    previous = {(r["stage"], r["n_events"]): r for r in baseline["results"] if "per_item" in r}
+    print(f"\ncompared with {baseline.get('commit') or baseline_path}:")
+    regressions = []
+    for record in records:
+        old = previous.get((record["stage"], record["n_events"]))
+        if old is None or "per_item" not in record:
+            continue
+        ratio = record["per_item"] / old["per_item"]
+        flag = "  REGRESSION" if ratio > threshold else ""
+        print(f"{record['n_events']:>7d} {record['stage']:38s} {ratio:8.2f}x{flag}")
+        if flag:
+            regressions.append(record)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the end-to-end augmentation pipeline.")
+    parser.add_argument("--input_dir", type=str, default="input/1L", help="Directory with the sample .lc files.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 100000], help="Events per synthetic set.")
+    parser.add_argument("--max_files", type=int, default=50, help="Light curve files per set.")
+    parser.add_argument("--max_model_events", type=int, default=5, help="Events per set run through the 1L/2L/3L solvers.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed calls per stage (the best is kept).")
+    parser.add_argument("--output_format", type=str, default="text", help="Output format of save_lc_output and process_single_lens.")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes of process_single_lens.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the synthetic master.")
+    parser.add_argument("--output", type=str, default=None,
+                        help="JSON results file (default: benchmarks/results/pipeline_<commit>.json).")
+    parser.add_argument("--compare", type=str, default=None, help="Earlier JSON results to compare against.")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio reported as a regression.")
+    args = parser.parse_args()
+
+    sample_files = sorted(pathlib.Path(args.input_dir).glob("*.lc"))
+    if not sample_files:
+        raise FileNotFoundError(f"No data files found in: {args.input_dir}")
+
+    commit, dirty = git_commit()
+    work_dir = pathlib.Path(tempfile.mkdtemp(prefix="pipeline_bench_"))
+    records = []
+    print(f"{'events':>7s} {'stage':38s} {'items':>7s} {'best':>12s} {'per item':>16s}")
+    try:
+        for n_events in args.sizes:
+            records += benchmark_event_set(n_events, args, sample_files, work_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    results = {
+        "benchmark": "pipeline",
+        "commit": commit,
+        "dirty": dirty,
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "machine": {
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "settings": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "samples": [sample.name for sample in sample_files],
+        "results": records,
+    }
+    output = args.output or PROJECT_ROOT / "benchmarks" / "results" / f"pipeline_{(commit or 'unknown')[:12]}.json"
+    output = pathlib.Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\nresults written to {output}")
+
+    if args.compare and compare(records, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark CentroidAddition.psf_centroids against pixel-grid integration of the blended image.
+
+Each epoch has a magnified source, a lens and a blend star under a Gaussian
+or Moffat PSF, measured in a circular aperture. The reference sums the PSF
+images on a dense grid inside the aperture, one epoch at a time.
+
+Usage:
+    python benchmarks/bench_psf_centroids.py [--epochs T] [--aperture R] [--grid N]
+"""
+
+import sys
+import time
+import pathlib
+import argparse
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(pathlib.Path(__file__).parent.parent))
+
+from src.centroid_addition import CentroidAddition, GaussianPSF, MoffatPSF
+
+
+def grid_centroid(psf, positions, fluxes, center, aperture, n):
+    """Centroid of the summed PSF images inside the aperture on an n x n grid."""
+    x = np.linspace(-aperture, aperture, n)
+    X, Y = np.meshgrid(x, x)
+    inside = X ** 2 + Y ** 2 < aperture ** 2
+    image = sum(f * psf.profile(np.hypot(X + center[0] - px, Y + center[1] - py))
+                for (px, py), f in zip(positions, fluxes)) * inside
+    return center + np.array([(image * X).sum(), (image * Y).sum()]) / image.sum()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CentroidAddition.psf_centroids.")
+    parser.add_argument("--epochs", type=int, default=8500, help="Epochs per light curve.")
+    parser.add_argument("--aperture", type=float, default=1.5, help="Aperture radius (PSF FWHM units).")
+    parser.add_argument("--grid", type=int, default=801, help="Reference grid size per axis.")
+    parser.add_argument("--reference_epochs", type=int, default=50, help="Epochs integrated on the grid.")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    positions = np.array([[0.0, 0.0], [0.3, -0.1], [-0.9, 0.7]])  # source, lens, blend
+    fluxes = np.column_stack([
+        1 + 10 / (1 + ((np.arange(args.epochs) - args.epochs / 2) / 200) ** 2),
+        np.full(args.epochs, 0.3),
+        np.full(args.epochs, 0.5),
+    ])
+    center = positions[0]
+    sample = rng.choice(args.epochs, args.reference_epochs, replace=False)
+
+    print(f"{'psf':8s} {'table [ms]':>10s} {'light curve [ms]':>17s} {'grid [ms/epoch]':>16s} {'max error':>10s}")
+    for name, psf in (("gaussian", GaussianPSF(1.0)), ("moffat", MoffatPSF(1.0))):
+        start = time.perf_counter()
+        psf.moment_table(args.aperture)
+        t_table = time.perf_counter() - start
+
+        start = time.perf_counter()
+        centroids = CentroidAddition.psf_centroids(positions, fluxes, psf, aperture=args.aperture, center=center)
+        t_curve = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reference = np.array([grid_centroid(psf, positions, fluxes[i], center, args.aperture, args.grid)
+                              for i in sample])
+        t_grid = (time.perf_counter() - start) / len(sample)
+
+        error = np.max(np.abs(centroids[sample] - reference))
+        print(f"{name:8s} {t_table * 1e3:10.1f} {t_curve * 1e3:17.2f} {t_grid * 1e3:16.2f} {error:10.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark CentroidAddition.simulate_astrometric_shift against the per-epoch iterrows loop.
+
+Uses measured_relative_flux of the light curve files in input/1L as the
+magnified source flux, with the lens at lens1_x/lens1_y and a small blend.
+
+Usage:
+    python benchmarks/bench_simulate_astrometric_shift.py [--repeat N] [--input_dir input/1L]
+"""
+
+import sys
+import time
+import pathlib
+import argparse
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(pathlib.Path(__file__).parent.parent))
+
+from src.gulls_parser import GullsParser
+from src.centroid_addition import CentroidAddition
+
+
+def legacy_simulate_astrometric_shift(light_curve_df, source_position, lens_positions, lens_fluxes):
+    """The original iterrows implementation, kept here as the reference."""
+    shifts = []
+    for _, row in light_curve_df.iterrows():
+        relative_flux = row['relative_flux']
+        if relative_flux <= 0:
+            shifts.append(np.array([0.0, 0.0]))
+            continue
+        all_positions = np.vstack([source_position, lens_positions])
+        all_fluxes = np.hstack([relative_flux, lens_fluxes])
+        shifts.append(CentroidAddition.add_centroids(all_positions, all_fluxes) - source_position)
+
+    light_curve_df['astrometric_shift_x'] = [shift[0] for shift in shifts]
+    light_curve_df['astrometric_shift_y'] = [shift[1] for shift in shifts]
+    return light_curve_df
+
+
+def best_time(func, args, repeat):
+    """Return the best wall-clock time of ``repeat`` calls."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CentroidAddition.simulate_astrometric_shift.")
+    parser.add_argument("--input_dir", type=str, default="input/1L", help="Directory with .lc files.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed calls per file.")
+    args = parser.parse_args()
+
+    centroid_addition = CentroidAddition()
+    data_files = sorted(pathlib.Path(args.input_dir).glob("*.lc"))
+    if not data_files:
+        raise FileNotFoundError(f"No data files found in: {args.input_dir}")
+
+    print(f"{'file':45s} {'epochs':>7s} {'legacy [ms]':>12s} {'new [ms]':>10s} {'speedup':>8s}")
+    for data_file in data_files:
+        df, _, _ = GullsParser.load_lc_file(data_file)
+        df = df.rename(columns={"measured_relative_flux": "relative_flux"})
+        source_position = np.array([df["source_x"].iloc[0], df["source_y"].iloc[0]])
+        lens_positions = np.array([[df["lens1_x"].iloc[0], df["lens1_y"].iloc[0]], [0.5, -0.5]])
+        lens_fluxes = np.array([0.1, 0.02])
+        inputs = (source_position, lens_positions, lens_fluxes)
+
+        old = legacy_simulate_astrometric_shift(df.copy(), *inputs)
+        new = centroid_addition.simulate_astrometric_shift(df.copy(), *inputs)
+        for column in ("astrometric_shift_x", "astrometric_shift_y"):
+            np.testing.assert_allclose(new[column], old[column], rtol=1e-12, atol=1e-15)
+
+        t_old = best_time(legacy_simulate_astrometric_shift, (df.copy(), *inputs), args.repeat)
+        t_new = best_time(centroid_addition.simulate_astrometric_shift, (df.copy(), *inputs), args.repeat)
+        print(f"{data_file.name:45s} {len(df):7d} {t_old * 1e3:12.2f} {t_new * 1e3:10.2f} {t_old / t_new:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
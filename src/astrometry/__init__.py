@@ -1,5 +1,5 @@
 # import module
-from .astrometry import Astrometry
+from .astrometry import Astrometry, CentroidCache
 
 # version
 __version__ = "0.1.0"
\ No newline at end of file
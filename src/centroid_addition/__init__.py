@@ -1,5 +1,5 @@
 # import module
-from .centroid_addition import CentroidAddition
+from .centroid_addition import CentroidAddition, RadialPSF, GaussianPSF, MoffatPSF, TabulatedPSF
 
 # version
 __version__ = "0.1.0"
\ No newline at end of file
@@ -7,12 +7,192 @@ calculations across a light curve to obtain an astrometric shift time series.
 
 The primary class :class:`CentroidAddition` is a lightweight namespace whose
 methods operate either on supplied ``numpy`` arrays or on ``pandas`` DataFrames.
+The PSF models (:class:`GaussianPSF`, :class:`MoffatPSF`,
+:class:`TabulatedPSF`) describe how a centroid measured within a finite
+aperture departs from the flux-weighted one
+(:meth:`CentroidAddition.psf_centroids`).
 """
 
+import abc
+import pathlib
+
 import numpy as np
 import pandas as pd
 
 
+class RadialPSF(abc.ABC):
+    """Circularly symmetric PSF, normalised to unit total flux.
+
+    Subclasses define :meth:`profile` (surface brightness at radius ``r``),
+    :meth:`enclosed` (flux within ``r``) and :meth:`extent`. Positions,
+    radii and widths share one angular unit (e.g. mas or pixels).
+
+    Notes
+    -----
+    For a source at distance ``d`` from the centre of a circular aperture
+    of radius ``R``, the flux inside the aperture, ``E(d)``, and its first
+    moment along the source direction, ``G(d)``, reduce to one-dimensional
+    integrals over the distance ``rho`` from the source: the circle of
+    radius ``rho`` lies entirely inside the aperture for
+    ``rho < R - d`` (contributing ``enclosed(R - d)`` and ``d * enclosed(R -
+    d)``), and partly inside for ``|R - d| < rho < R + d``, where the arc
+    inside is known in closed form. The band is integrated with
+    Gauss-Legendre quadrature once per aperture radius on a grid of ``d``
+    (:meth:`moment_table`), and evaluations interpolate in it.
+    """
+
+    TABLE_SIZE = (4096, 256)  # linear steps across the aperture, log steps into the wings
+    N_NODES = 256
+
+    def __init__(self):
+        self._tables = {}  # aperture radius: (d, E, G)
+
+    @abc.abstractmethod
+    def profile(self, r):
+        """Surface brightness at radius ``r``."""
+
+    @abc.abstractmethod
+    def enclosed(self, r):
+        """Fraction of the flux within radius ``r``."""
+
+    @abc.abstractmethod
+    def extent(self, eps=1e-6):
+        """Radius outside which a fraction ``eps`` of the flux falls."""
+
+    def aperture_moments(self, d, aperture):
+        """Aperture flux ``E`` and first moment ``G`` of sources at distance ``d``, by quadrature.
+
+        Parameters
+        ----------
+        d : ndarray
+            Distances of the source from the aperture centre.
+        aperture : float
+            Aperture radius.
+
+        Returns
+        -------
+        E, G : ndarray
+            Fraction of the source flux inside the aperture, and the first
+            moment of that flux along the direction from the aperture centre
+            to the source (so a point source gives ``E = 1``, ``G = d``).
+        """
+        d = np.asarray(d, dtype=float)
+        R = float(aperture)
+        inner = np.clip(R - d, 0.0, None)
+        E = self.enclosed(inner)
+        G = d * E
+
+        # partial band |R - d| < rho < R + d
+        x, w = np.polynomial.legendre.leggauss(self.N_NODES)
+        lo = np.abs(R - d)[..., None]
+        hi = np.minimum(R + d, np.maximum(R - d, 0.0) + self.extent())[..., None]
+        hi = np.maximum(hi, lo)
+        rho = lo + (x + 1) / 2 * (hi - lo)
+        weight = w * (hi - lo) / 2 * self.profile(rho) * rho
+        with np.errstate(divide='ignore', invalid='ignore'):
+            kappa = np.clip((R * R - d[..., None] ** 2 - rho * rho) / (2 * d[..., None] * rho), -1.0, 1.0)
+        kappa = np.where(np.isfinite(kappa), kappa, 1.0)
+        arc = 2 * np.pi - 2 * np.arccos(kappa)
+        E = E + np.sum(weight * arc, axis=-1)
+        G = G + np.sum(weight * (d[..., None] * arc - 2 * rho * np.sqrt(1 - kappa * kappa)), axis=-1)
+        return E, G
+
+    def moment_table(self, aperture):
+        """``(d, E, G)`` on a grid of source distances for one aperture radius (built once)."""
+        key = float(aperture)
+        if key not in self._tables:
+            near = key + 4 * self.extent(1e-2)
+            far = key + self.extent()
+            d = np.linspace(0.0, near, self.TABLE_SIZE[0])
+            if far > near:
+                d = np.r_[d, np.geomspace(near, far, self.TABLE_SIZE[1])[1:]]
+            self._tables[key] = (d,) + self.aperture_moments(d, key)
+        return self._tables[key]
+
+    def interpolate_moments(self, d, aperture):
+        """``E`` and ``G`` at distances ``d`` from :meth:`moment_table` (zero beyond the table)."""
+        grid, E, G = self.moment_table(aperture)
+        return np.interp(d, grid, E, right=0.0), np.interp(d, grid, G, right=0.0)
+
+
+class GaussianPSF(RadialPSF):
+    """Gaussian PSF of a given FWHM."""
+
+    def __init__(self, fwhm):
+        super().__init__()
+        self.fwhm = float(fwhm)
+        self.sigma = self.fwhm / (2 * np.sqrt(2 * np.log(2)))
+
+    def profile(self, r):
+        return np.exp(-0.5 * (np.asarray(r) / self.sigma) ** 2) / (2 * np.pi * self.sigma ** 2)
+
+    def enclosed(self, r):
+        return -np.expm1(-0.5 * (np.asarray(r) / self.sigma) ** 2)
+
+    def extent(self, eps=1e-6):
+        return self.sigma * np.sqrt(-2 * np.log(eps))
+
+
+class MoffatPSF(RadialPSF):
+    """Moffat PSF of a given FWHM and power index ``beta`` (> 1)."""
+
+    def __init__(self, fwhm, beta=2.5):
+        super().__init__()
+        if beta <= 1:
+            raise ValueError(f"Moffat beta must be > 1, got {beta}.")
+        self.fwhm = float(fwhm)
+        self.beta = float(beta)
+        self.alpha = self.fwhm / (2 * np.sqrt(2 ** (1 / self.beta) - 1))
+
+    def profile(self, r):
+        return (self.beta - 1) / (np.pi * self.alpha ** 2) * (1 + (np.asarray(r) / self.alpha) ** 2) ** -self.beta
+
+    def enclosed(self, r):
+        return 1 - (1 + (np.asarray(r) / self.alpha) ** 2) ** (1 - self.beta)
+
+    def extent(self, eps=1e-6):
+        return self.alpha * np.sqrt(eps ** (-1 / (self.beta - 1)) - 1)
+
+
+class TabulatedPSF(RadialPSF):
+    """PSF given as a tabulated radial profile, e.g. an azimuthally averaged Roman WFI PSF.
+
+    Parameters
+    ----------
+    radius : array_like
+        Increasing radii of the samples, starting at or near 0.
+    profile : array_like
+        Surface brightness at ``radius``, in any normalisation; the profile
+        is renormalised to unit flux and is zero beyond the last radius.
+    """
+
+    def __init__(self, radius, profile):
+        super().__init__()
+        self.radius = np.asarray(radius, dtype=float)
+        values = np.asarray(profile, dtype=float)
+        if self.radius.ndim != 1 or self.radius.shape != values.shape or np.any(np.diff(self.radius) <= 0):
+            raise ValueError("radius and profile must be 1-D arrays of the same length with increasing radius.")
+        ring = np.diff(self.radius) * 0.5 * (values[1:] * self.radius[1:] + values[:-1] * self.radius[:-1])
+        cumulative = np.r_[0.0, np.cumsum(2 * np.pi * ring)]
+        self.values = values / cumulative[-1]
+        self.cumulative = cumulative / cumulative[-1]
+
+    @classmethod
+    def from_file(cls, path):
+        """Read a two-column (radius, profile) text table, e.g. exported from STPSF/WebbPSF."""
+        radius, profile = np.loadtxt(pathlib.Path(path), unpack=True, usecols=(0, 1))
+        return cls(radius, profile)
+
+    def profile(self, r):
+        return np.interp(r, self.radius, self.values, right=0.0)
+
+    def enclosed(self, r):
+        return np.interp(r, self.radius, self.cumulative, right=1.0)
+
+    def extent(self, eps=1e-6):
+        return float(self.radius[np.searchsorted(self.cumulative, 1 - eps).clip(max=len(self.radius) - 1)])
+
+
 class CentroidAddition:
     """Algorithms for adding centroids and simulating astrometric shifts.
 
@@ -59,12 +239,149 @@ class CentroidAddition:
         cumulative_centroid = np.sum(weighted_positions, axis=1) / total_flux
         return cumulative_centroid
 
+    @staticmethod
+    def add_centroids_batch(
+        positions: np.ndarray,
+        fluxes: np.ndarray,
+        out: np.ndarray = None,
+    ) -> np.ndarray:
+        """Compute flux–weighted centroids for stacks of source sets.
+
+        Batched form of :meth:`add_centroids`: the leading (batch) dimensions
+        of ``positions`` and ``fluxes`` are broadcast against each other, so a
+        fixed ``(N, 2)`` position array can be combined with an
+        ``(epochs, N)`` flux history, or a block of events with per-epoch
+        positions, in a single call.
+
+        Parameters
+        ----------
+        positions : ndarray, shape (..., N, 2)
+            Apparent on-sky positions (x, y) of the ``N`` sources.
+        fluxes : ndarray, shape (..., N)
+            Corresponding fluxes.
+        out : ndarray, shape (..., 2), optional
+            Preallocated float array for the result, matching the broadcast
+            batch shape.
+
+        Returns
+        -------
+        ndarray, shape (..., 2)
+            Flux–weighted centroids. Elements whose total flux is zero get a
+            zero vector, as in :meth:`add_centroids`.
+
+        Raises
+        ------
+        ValueError
+            If the trailing dimensions are not ``(N, 2)`` and ``(N,)``, or if
+            ``out`` has the wrong shape.
+        """
+        positions = np.asarray(positions, dtype=float)
+        fluxes = np.asarray(fluxes, dtype=float)
+        if positions.ndim < 2 or positions.shape[-1] != 2:
+            raise ValueError("Positions must have shape (..., N, 2).")
+        if fluxes.ndim < 1 or fluxes.shape[-1] != positions.shape[-2]:
+            raise ValueError("Positions and fluxes must have the same length.")
+
+        batch_shape = np.broadcast_shapes(positions.shape[:-2], fluxes.shape[:-1])
+        if out is None:
+            out = np.empty(batch_shape + (2,))
+        elif out.shape != batch_shape + (2,):
+            raise ValueError(f"out must have shape {batch_shape + (2,)}, got {out.shape}.")
+
+        if positions.ndim == 2:
+            # shared positions: one (..., N) @ (N, 2) product
+            np.matmul(fluxes, positions, out=out)
+        else:
+            np.einsum('...n,...nk->...k', fluxes, positions, out=out)
+
+        total_flux = np.broadcast_to(fluxes.sum(axis=-1), batch_shape)[..., None]
+        nonzero = total_flux != 0
+        np.divide(out, total_flux, out=out, where=nonzero)
+        np.copyto(out, 0.0, where=~nonzero)
+        return out
+
+    @staticmethod
+    def psf_centroids(
+        positions: np.ndarray,
+        fluxes: np.ndarray,
+        psf: RadialPSF = None,
+        aperture: float = None,
+        center: np.ndarray = None,
+        iterations: int = 0,
+    ) -> np.ndarray:
+        """Centroids measured within a circular aperture under a PSF model.
+
+        Parameters
+        ----------
+        positions : ndarray, shape (..., N, 2)
+            Positions of the ``N`` sources (magnified source images, lens,
+            blends), broadcast as in :meth:`add_centroids_batch`.
+        fluxes : ndarray, shape (..., N)
+            Corresponding fluxes.
+        psf : RadialPSF, optional
+            PSF model; required with ``aperture``.
+        aperture : float, optional
+            Radius of the centroiding aperture. Without it the whole PSF is
+            integrated and the result is the flux-weighted centroid of
+            :meth:`add_centroids_batch`, for any PSF.
+        center : ndarray, shape (..., 2), optional
+            Aperture centre, e.g. the catalogue position of the target
+            (default: the flux-weighted centroid).
+        iterations : int, optional
+            Number of times the aperture is re-centred on the measured
+            centroid, as in windowed centroiding.
+
+        Returns
+        -------
+        ndarray, shape (..., 2)
+            Measured centroids. Elements with no flux in the aperture get
+            the aperture centre.
+
+        Raises
+        ------
+        ValueError
+            If ``aperture`` is given without ``psf``.
+
+        Notes
+        -----
+        A source a distance ``d`` from the aperture centre contributes the
+        flux ``f E(d)`` and first moment ``f G(d)`` along its direction
+        (:meth:`RadialPSF.aperture_moments`), interpolated in the PSF's
+        moment table, so no image grid is integrated. Truncation by the
+        aperture pulls the centroid toward the aperture centre relative to
+        flux weighting, by an amount that depends on the PSF wings.
+        """
+        if aperture is None:
+            return CentroidAddition.add_centroids_batch(positions, fluxes)
+        if psf is None:
+            raise ValueError("A PSF model is required with a finite aperture.")
+
+        positions = np.asarray(positions, dtype=float)
+        fluxes = np.asarray(fluxes, dtype=float)
+        if center is None:
+            center = CentroidAddition.add_centroids_batch(positions, fluxes)
+        center = np.asarray(center, dtype=float)
+
+        for _ in range(iterations + 1):
+            offset = positions - center[..., None, :]
+            d = np.hypot(offset[..., 0], offset[..., 1])
+            E, G = psf.interpolate_moments(d, aperture)
+            direction = np.divide(offset, d[..., None], out=np.zeros(np.broadcast(offset, d[..., None]).shape),
+                                  where=d[..., None] > 0)
+            flux = np.sum(fluxes * E, axis=-1)
+            moment = np.sum((fluxes * G)[..., None] * direction, axis=-2)
+            shift = np.divide(moment, flux[..., None], out=np.zeros(moment.shape), where=flux[..., None] != 0)
+            center = center + shift
+        return center
+
     def simulate_astrometric_shift(
         self,
         light_curve_df: pd.DataFrame,
         source_position: np.ndarray,
         lens_positions: np.ndarray,
         lens_fluxes: np.ndarray,
+        psf: RadialPSF = None,
+        aperture: float = None,
     ) -> pd.DataFrame:
         """Augment a light curve with per-epoch astrometric centroid shifts.
 
@@ -81,6 +398,12 @@ class CentroidAddition:
         lens_fluxes : ndarray, shape (N,)
             Relative (or absolute) fluxes of the lens components. Blend flux
             is assumed zero unless encoded here.
+        psf : RadialPSF, optional
+            PSF model of a finite centroiding aperture.
+        aperture : float, optional
+            Radius of a centroiding aperture centred on ``source_position``
+            (see :meth:`psf_centroids`); by default the centroid is flux
+            weighted.
 
         Returns
         -------
@@ -94,23 +417,39 @@ class CentroidAddition:
         The source flux is taken directly from ``relative_flux`` per epoch and
         used as the magnified source contribution. No error propagation is
         performed here.
+
+        All epochs are evaluated at once: the per-epoch fluxes form an
+        ``(epochs, 1 + N)`` matrix that :meth:`add_centroids_batch` combines
+        with the fixed ``(1 + N, 2)`` position array in one call.
+        Epochs with ``relative_flux <= 0`` get a zero shift; epochs with zero
+        total flux get a zero centroid, as in :meth:`add_centroids`.
         """
-        shifts = []
-        for _, row in light_curve_df.iterrows():
-            relative_flux = row['relative_flux']
-            if relative_flux <= 0:
-                shifts.append(np.array([0.0, 0.0]))
-                continue
-
-            magnified_source_flux = relative_flux
-            all_positions = np.vstack([source_position, lens_positions])
-            all_fluxes = np.hstack([magnified_source_flux, lens_fluxes])
-            cumulative_centroid = self.add_centroids(all_positions, all_fluxes)
-            shift = cumulative_centroid - source_position
-            shifts.append(shift)
-
-        light_curve_df['astrometric_shift_x'] = [shift[0] for shift in shifts]
-        light_curve_df['astrometric_shift_y'] = [shift[1] for shift in shifts]
+        source_position = np.asarray(source_position, dtype=float)
+        lens_positions = np.asarray(lens_positions, dtype=float).reshape(-1, 2)
+        lens_fluxes = np.atleast_1d(np.asarray(lens_fluxes, dtype=float))
+        if len(lens_positions) != len(lens_fluxes):
+            raise ValueError("Positions and fluxes must have the same length.")
+
+        relative_flux = light_curve_df['relative_flux'].to_numpy(dtype=float)
+
+        # (epochs, 1 + N) flux matrix: magnified source first, then lenses
+        fluxes = np.empty((len(relative_flux), 1 + len(lens_fluxes)))
+        fluxes[:, 0] = relative_flux
+        fluxes[:, 1:] = lens_fluxes
+        all_positions = np.vstack([source_position, lens_positions])
+
+        if aperture is None:
+            cumulative_centroid = self.add_centroids_batch(all_positions, fluxes)
+        else:
+            cumulative_centroid = self.psf_centroids(
+                all_positions, fluxes, psf=psf, aperture=aperture, center=source_position
+            )
+
+        shifts = cumulative_centroid - source_position
+        shifts[relative_flux <= 0] = 0.0
+
+        light_curve_df['astrometric_shift_x'] = shifts[:, 0]
+        light_curve_df['astrometric_shift_y'] = shifts[:, 1]
         return light_curve_df
 
     def plot_astrometric_shifts(
@@ -1,5 +1,5 @@
 # import gulls_parser
-from .gulls_parser import GullsParser
+from .gulls_parser import GullsParser, LcHeader, ZeroPointRegistry, EventStore, LightCurveCache, RunManifest
 
 # version
 __version__ = "0.1.0"
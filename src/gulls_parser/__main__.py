@@ -0,0 +1,4 @@
+# python -m gulls_parser
+from .gulls_parser import main
+
+main()
@@ -33,14 +33,546 @@ master df, 1L example:
 
 """
 
+import os
 from os import path
+import json
+import hashlib
 import pathlib
+import contextlib
+from dataclasses import dataclass, field
+import queue
+import threading
+import itertools
+import collections
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import pandas as pd
 import numpy as np
-from io import StringIO
+
+# dtypes of the known light curve columns, handed straight to the C parser so
+# it does not have to infer them (unknown columns are still inferred)
+LC_COLUMN_DTYPES = {
+    "Simulation_time": np.float64,
+    "measured_relative_flux": np.float64,
+    "measured_relative_flux_error": np.float64,
+    "true_relative_flux": np.float64,
+    "true_relative_flux_error": np.float64,
+    "observatory_code": np.int64,
+    "saturation_flag": np.int64,
+    "best_single_lens_fit": np.float64,
+    "parallax_shift_t": np.float64,
+    "parallax_shift_u": np.float64,
+    "BJD": np.float64,
+    "source_x": np.float64,
+    "source_y": np.float64,
+    "lens1_x": np.float64,
+    "lens1_y": np.float64,
+    "lens2_x": np.float64,
+    "lens2_y": np.float64,
+    "parallax_shift_x": np.float64,
+    "parallax_shift_y": np.float64,
+    "parallax_shift_z": np.float64,
+}
+
+# output backends for augmented light curves and their file suffixes
+# ("text" keeps the input file name)
+OUTPUT_FORMATS = {
+    "text": None,
+    "parquet": ".parquet",
+    "feather": ".feather",
+    "npz": ".npz",
+    "hdf5": ".h5",  # one consolidated EventStore per run instead of a file per event
+}
+
+# EventStore group for each lens type
+LENS_GROUPS = {"1L": "single", "2L": "binary", "3L": "triple"}
+
+# lens group written by each per-event processing method
+EVENT_METHODS = {
+    "process_single_lens_file": "single",
+    "process_binary_lens_file": "binary",
+    "process_triple_lens_file": "triple",
+}
+
+# compact dtypes of the master columns the pipeline reads (others are inferred)
+MASTER_COLUMN_DTYPES = {
+    "SubRun": np.int32,
+    "Field": np.int32,
+    "EventID": np.int64,
+}
+
+# results of GullsParser.photometry
+PHOTOMETRY_KEYS = ["true_mag", "true_mag_err", "mag", "mag_err", "true_F", "true_F_err", "F", "F_err"]
+
+# Roman WFI PSF FWHM per filter in mas, for the astrometric noise model
+# (GullsParser.astrometric_precision)
+ROMAN_PSF_FWHM = {
+    "F062": 58.0,
+    "F087": 73.0,
+    "F106": 87.0,
+    "F129": 106.0,
+    "F146": 105.0,
+    "F158": 128.0,
+    "F184": 146.0,
+    "F213": 169.0,
+}
+
+# astrometry columns appended to each light curve (GullsParser.add_astrometric_noise):
+# sigma_x/sigma_y are centroid noise offsets and sigma_x_err/sigma_y_err their
+# 1-sigma precision, all in mas
+ASTROMETRY_COLUMNS = ["sigma_x", "sigma_y", "sigma_x_err", "sigma_y_err"]
+
+# columns identifying an event, in file name order (..._{SubRun}_{Field}_{EventID}.det.lc)
+MASTER_KEY_COLUMNS = ["SubRun", "Field", "EventID"]
+
+# light curve file suffixes stripped, in this order, before parsing the event key
+EVENT_FILE_SUFFIXES = [".lc", ".dat", ".det"]
+
+# GULLS comment keywords ("#fs: ...") and the LcHeader fields they fill
+LC_HEADER_KEYWORDS = {
+    "fs": "fs",
+    "Sourcemag": "sourcemag",
+    "Sourcedata": "sourcedata",
+    "Obssrcmag": "obssrcmag",
+    "Lensmag": "lensmag",
+    "Lensdata": "lensdata",
+    "Obslensmag": "obslensmag",
+    "Planet": "planet",
+    "Event": "event",
+    "Obsgroup": "obsgroup",
+}
+
+
+def _empty_array():
+    return np.empty(0)
+
+
+@dataclass(frozen=True)
+class LcHeader:
+    """
+    Parsed comment block of a GULLS light curve file.
+
+    Every "#keyword: v1 v2 ..." line becomes a read-only float array; the
+    per-observatory rows (fs, obssrcmag, obslensmag) are ordered by
+    observatory code. Keywords missing from the file give empty arrays and
+    unknown keywords are kept in ``extra``. ``comment_text`` is the raw
+    block, as returned by ``load_lc_file``.
+    """
+    fs: np.ndarray = field(default_factory=_empty_array)
+    sourcemag: np.ndarray = field(default_factory=_empty_array)
+    sourcedata: np.ndarray = field(default_factory=_empty_array)
+    obssrcmag: np.ndarray = field(default_factory=_empty_array)
+    lensmag: np.ndarray = field(default_factory=_empty_array)
+    lensdata: np.ndarray = field(default_factory=_empty_array)
+    obslensmag: np.ndarray = field(default_factory=_empty_array)
+    planet: np.ndarray = field(default_factory=_empty_array)
+    event: np.ndarray = field(default_factory=_empty_array)
+    obsgroup: np.ndarray = field(default_factory=_empty_array)
+    extra: dict = field(default_factory=dict)
+    comment_text: str = ""
+
+    @classmethod
+    def from_comment_text(cls, comment_text):
+        """
+        Parse the comment block with anchored keyword dispatch.
+
+        Only the keyword before the first ':' selects the field (so "#fs:"
+        never matches "#Obssrcmag:"), and each line's values are converted
+        by a single numpy call.
+        """
+        values = {}
+        extra = {}
+        for line in comment_text.splitlines():
+            line = line.strip()
+            if not line.startswith("#"):
+                continue
+            keyword, sep, rest = line[1:].partition(":")
+            if not sep:
+                continue
+            keyword = keyword.strip()
+            try:
+                array = np.array(rest.split(), dtype=float)
+            except ValueError:
+                raise ValueError(f"Non-numeric values in '#{keyword}' header line: {rest.strip()}")
+            array.flags.writeable = False
+            if keyword in LC_HEADER_KEYWORDS:
+                values[LC_HEADER_KEYWORDS[keyword]] = array
+            else:
+                extra[keyword] = array
+        return cls(**values, extra=extra, comment_text=comment_text)
+
+
+class ZeroPointRegistry:
+    """
+    Zero point tables parsed once into (detector, element) -> ABMag mappings.
+
+    Tables are cached by resolved path and invalidated when the file's
+    modification time or size changes. Lookups for a given list of elements
+    are memoised as ready-made arrays indexed by observatory code.
+    """
+
+    def __init__(self):
+        self._tables = {}  # path: (signature, mapping)
+        self._arrays = {}  # (path, signature, elements, detector): zp array
+
+    @staticmethod
+    def _signature(table_path):
+        stat = table_path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def read_table(table_path):
+        r"""
+        Parse a zero point table into a {(detector, element): ABMag} mapping.
+
+        The first row listed for each element is also stored under
+        (None, element) and used when no detector is requested.
+
+        Table format:
+        # %ECSV 1.0
+        # ---
+        # datatype:
+        # - {name: detector, datatype: string}
+        # - {name: element, datatype: string}
+        # - {name: VegaMag, datatype: float64}
+        # - {name: ABMag, datatype: float64}
+        # - {name: STMag, datatype: float64}
+        # - {name: FLAM, datatype: float64}
+        # - {name: FNU, datatype: float64}
+        # - {name: PHOTLAM, datatype: float64}
+        # - {name: PHOTNU, datatype: float64}
+        # meta: !!omap
+        # - {comments: "Zero points for each detector and imaging optical element (filter) using effective area curves as of 2024 03 01.\nThe\
+        #     \ zeropoints are computed using synphot version 1.4.0. The method unit_response() \ndetermines the flux density that generates a\
+        #     \ count rate of 1 count per second through \nthe bandpass. This is computed as:\n\n\\dfrac{hc}{\\int P_\\lambda \\lambda d\\lambda}\n\
+        #     \nwhere h is the Planck constant, c is the speed of light, P is the effective \narea, and lambda is the wavelength. The integrals\
+        #     \ are approximated using the trapezoid \nmethod. Conversions to other units are performed at the pivot wavelength, which is a \n\
+        #     measure of the effective wavelength of the bandpass. The pivot wavelength is defined as:\n\n\\sqrt{\\dfrac{\\int P_\\lambda \\lambda\
+        #     \ d\\lambda}{\\int (P_\\lambda / \\lambda) d\\lambda}}"}
+        # schema: astropy-2.0
+        detector element VegaMag ABMag STMag FLAM FNU PHOTLAM PHOTNU
+        WFI01 F062 26.417663323428016 26.57551933086481 26.880632649382186 6.423133376578637e-20 8.507310180127394e-31 2.0375262991355374e-08 2.6986623522593194e-19
+        WFI01 F087 25.626924239161607 26.22624275057486 27.242258374678336 4.603590128457495e-20 1.1735535182435983e-30 2.0259717908486147e-08 5.16463511448471e-19
+        ...
+        """
+        zp_table = pd.read_csv(table_path, comment='#', sep=r'\s+', usecols=["detector", "element", "ABMag"])
+
+        mapping = {}
+        for detector, element, abmag in zp_table.itertuples(index=False):
+            mapping[(detector, element)] = float(abmag)
+            mapping.setdefault((None, element), float(abmag))
+        return mapping
+
+    def table(self, table_path):
+        """
+        Return the (detector, element) -> ABMag mapping, re-reading the file only if it changed.
+        """
+        table_path = pathlib.Path(table_path).resolve()
+        signature = self._signature(table_path)
+        cached = self._tables.get(table_path)
+        if cached is None or cached[0] != signature:
+            cached = (signature, self.read_table(table_path))
+            self._tables[table_path] = cached
+        return cached[1]
+
+    def lookup(self, elements, table_path, detector=None):
+        """
+        Return the zero points of elements as an array indexed by observatory code.
+        """
+        table_path = pathlib.Path(table_path).resolve()
+        mapping = self.table(table_path)
+        key = (table_path, self._tables[table_path][0], tuple(elements), detector)
+        zp = self._arrays.get(key)
+        if zp is None:
+            zp = np.zeros(len(elements))
+            for i, element in enumerate(elements):
+                if (detector, element) not in mapping:
+                    if detector is None:
+                        raise ValueError(f"Element '{element}' not found in the zero point table.")
+                    raise ValueError(f"Element '{element}' not found for detector '{detector}' in the zero point table.")
+                zp[i] = mapping[(detector, element)]
+            self._arrays[key] = zp
+        return zp.copy()
+
+
+# zero point tables shared by every GullsParser in this process
+ZERO_POINTS = ZeroPointRegistry()
+
+
+class EventStore:
+    """
+    Consolidated HDF5 store holding every processed light curve of a run.
+
+    Replaces one output file per event with one file per run:
+     * /{lens}/s{SubRun}_f{Field}_e{EventID}: the light curve columns, with the
+       comment metadata (#fs, #Obssrcmag, #Event, ...) as node attributes
+     * /index: table of (lens, SubRun, Field, EventID, group, n_rows, source),
+       appended as events finish
+
+    Events are written and flushed one at a time, so a store interrupted
+    mid-run still holds every event finished before the interruption.
+    Re-writing an event replaces its group and appends a new index row;
+    ``read_index`` keeps the latest row per event. Requires PyTables.
+
+    HDF5 files must not be written by several processes at once: in parallel
+    runs the workers hand their results back to the parent, which is the only
+    writer (see ``GullsParser._run_events``).
+    """
+
+    INDEX_KEY = "index"
+    INDEX_ITEMSIZE = {"lens": 8, "group": 64, "source": 256}
+
+    def __init__(self, store_path, mode="a"):
+        self.store_path = pathlib.Path(store_path)
+        if mode != "r":
+            self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        elif not self.store_path.exists():
+            raise FileNotFoundError(f"Event store not found: {self.store_path}")
+        self._store = pd.HDFStore(self.store_path, mode=mode)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._store.close()
+
+    @staticmethod
+    def group_name(lens, key):
+        """
+        HDF5 group of an event, e.g. ("single", (1, 841, 67)) -> "/single/s1_f841_e67".
+        """
+        if lens not in LENS_GROUPS.values():
+            raise ValueError(f"Unknown lens group '{lens}'. Choose from: {', '.join(LENS_GROUPS.values())}")
+        SubRun, Field, EventID = key
+        return f"/{lens}/s{SubRun}_f{Field}_e{EventID}"
+
+    def append(self, lens, key, df, header, comment_text="", source=""):
+        """
+        Write one event's light curve and add it to the index.
+        """
+        group = self.group_name(lens, key)
+        self._store.put(group, df[header], format="fixed")
+        self._store.get_storer(group).attrs.gulls_metadata = GullsParser.parse_comment_metadata(comment_text)
+
+        SubRun, Field, EventID = key
+        row = pd.DataFrame({
+            "lens": [lens],
+            "SubRun": np.array([SubRun], dtype=np.int64),
+            "Field": np.array([Field], dtype=np.int64),
+            "EventID": np.array([EventID], dtype=np.int64),
+            "group": [group],
+            "n_rows": np.array([len(df)], dtype=np.int64),
+            "source": [str(source)],
+        })
+        self._store.append(
+            self.INDEX_KEY, row, format="table", data_columns=True,
+            min_itemsize=self.INDEX_ITEMSIZE, index=False,
+        )
+        self._store.flush()
+        print(f"Saved processed data to: {self.store_path}:{group}")
+
+    def read(self, lens, key):
+        """
+        Read one event back.
+
+        Returns:
+            tuple: (df, metadata, header) as returned by ``GullsParser.load_lc_output``.
+        """
+        group = self.group_name(lens, key)
+        if group not in self._store:
+            SubRun, Field, EventID = key
+            raise KeyError(f"No {lens} event in store for SubRun: {SubRun}, Field: {Field}, EventID: {EventID}")
+        df = self._store.get(group)
+        metadata = self._store.get_storer(group).attrs.gulls_metadata
+        return df, metadata, df.columns.tolist()
+
+    def stored_rows(self, group):
+        """
+        Number of rows actually stored in an event group, or None if it is missing or unreadable.
+        """
+        if group not in self._store:
+            return None
+        try:
+            return int(self._store.get_storer(group).shape[0])
+        except Exception:
+            return None
+
+    def read_index(self, lens=None):
+        """
+        Return the index table, one row per event (the latest write wins).
+        """
+        if self.INDEX_KEY not in self._store:
+            return pd.DataFrame(columns=["lens", *MASTER_KEY_COLUMNS, "group", "n_rows", "source"])
+        index = self._store.select(self.INDEX_KEY).drop_duplicates("group", keep="last")
+        if lens is not None:
+            index = index[index["lens"] == lens]
+        return index.reset_index(drop=True)
+
+
+class LightCurveCache:
+    """
+    On-disk cache of parsed light curves, used by ``GullsParser.load_lc_file``.
+
+    Each cached file is stored as two entries in cache_dir:
+     * {name}-{hash}.npy: the data rows as one structured array (one field per
+       column, with the parsed dtypes), memory-mapped copy-on-write
+       (np.load(mmap_mode='c')) and wrapped in a DataFrame without copying, so
+       only the pages a caller reads are loaded and edits never reach the file
+     * {name}-{hash}.json: sidecar with the source path, size and mtime, the
+       header, and the comment text
+
+    An entry is used only while the source file's size and mtime match the
+    sidecar. Both files are written to temporary names and renamed into place,
+    the sidecar last, so concurrent workers never read a half-written entry.
+    """
+
+    VERSION = 1
+
+    def __init__(self, cache_dir):
+        self.cache_dir = pathlib.Path(cache_dir)
+
+    def entry_paths(self, file_path):
+        """
+        Return the (.npy, .json) paths of the cache entry for a source file.
+        """
+        file_path = pathlib.Path(file_path).resolve()
+        digest = hashlib.sha1(str(file_path).encode()).hexdigest()[:16]
+        stem = self.cache_dir / f"{file_path.name}-{digest}"
+        return stem.with_suffix(".npy"), stem.with_suffix(".json")
+
+    @staticmethod
+    def _signature(file_path):
+        stat = pathlib.Path(file_path).stat()
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def load(self, file_path):
+        """
+        Return the cached (df, comment_text, header), or None if there is no valid entry.
+        """
+        array_path, sidecar_path = self.entry_paths(file_path)
+        try:
+            with open(sidecar_path, 'r') as f:
+                sidecar = json.load(f)
+            if sidecar.get("version") != self.VERSION or sidecar.get("signature") != self._signature(file_path):
+                return None
+            data = np.load(array_path, mmap_mode='c', allow_pickle=False).view(np.ndarray)
+        except (OSError, ValueError):
+            return None
+
+        header = sidecar["header"]
+        if list(data.dtype.names or ()) != header:
+            return None
+        # one block per field view of the memmap, no copy
+        df = pd.DataFrame({col: data[col] for col in header}, copy=False)
+        return df, sidecar["comment_text"], header
+
+    def store(self, file_path, df, comment_text, header):
+        """
+        Write a cache entry for a parsed light curve.
+
+        Light curves with non-numeric columns are not cached.
+        """
+        if not all(np.issubdtype(df[col].dtype, np.number) for col in header):
+            return
+        array_path, sidecar_path = self.entry_paths(file_path)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        data = np.empty(len(df), dtype=[(col, df[col].dtype) for col in header])
+        for col in header:
+            data[col] = df[col].to_numpy()
+        sidecar = {
+            "version": self.VERSION,
+            "source": str(pathlib.Path(file_path).resolve()),
+            "signature": self._signature(file_path),
+            "header": header,
+            "comment_text": comment_text,
+        }
+
+        suffix = f".{os.getpid()}.tmp"
+        with open(array_path.with_name(array_path.name + suffix), 'wb') as f:
+            np.save(f, data)
+        os.replace(array_path.with_name(array_path.name + suffix), array_path)
+        with open(sidecar_path.with_name(sidecar_path.name + suffix), 'w') as f:
+            json.dump(sidecar, f)
+        os.replace(sidecar_path.with_name(sidecar_path.name + suffix), sidecar_path)
+
+
+class RunManifest:
+    """
+    Record of the events a run has finished writing, for resumable runs.
+
+    The manifest is a JSON Lines file with one entry per finished event:
+     * source: absolute path of the input light curve, with its size and mtime_ns
+     * config: hash of the processing configuration (``GullsParser.config_hash``)
+     * output: output file, or EventStore group for the "hdf5" format, and the
+       size and mtime_ns of the output file (n_rows of the group for "hdf5")
+
+    An entry is appended (and fsync'ed) only after the event's output has been
+    written completely, so an event interrupted mid-write has no entry and is
+    redone. Later entries for the same source replace earlier ones, and a line
+    torn by a crash is ignored.
+    """
+
+    def __init__(self, manifest_path):
+        self.manifest_path = pathlib.Path(manifest_path)
+        self.entries = {}  # source: entry
+        if self.manifest_path.exists():
+            with open(self.manifest_path, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self.entries[entry["source"]] = entry
+
+    @staticmethod
+    def file_signature(file_path):
+        """
+        (size, mtime_ns) of a file as a dict, or None if it does not exist.
+        """
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def lookup(self, data_file, config):
+        """
+        Entry of an input file if it was finished unchanged under config, else None.
+        """
+        entry = self.entries.get(os.path.abspath(data_file))
+        if entry is None or entry["config"] != config:
+            return None
+        if entry["signature"] != self.file_signature(data_file):
+            return None
+        return entry
+
+    def record(self, data_file, config, output, output_signature=None):
+        """
+        Append the entry of a finished event.
+        """
+        entry = {
+            "source": os.path.abspath(data_file),
+            "signature": self.file_signature(data_file),
+            "config": config,
+            "output": str(output),
+            "output_signature": output_signature,
+        }
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_path, 'a') as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.entries[entry["source"]] = entry
+
 
 class GullsParser:
-    def __init__(self, input_dir="input", output_dir="output"):
+    def __init__(self, input_dir="input", output_dir="output", output_format="text", lc_cache_dir=None,
+                 load_all_master_columns=False, master_chunksize=None, prefetch=0, resume=False,
+                 noise_seed=0, astrometric_floor=0.0):
         """
         data (DataFrame) with the columns:
           - Simulation_time
@@ -95,9 +627,9 @@ class GullsParser:
         self.output_triple_lens_dir = self.output_dir / "3L"
 
         self.master_column_mapping = {
-            "t0_lens1": "t0",
+            "t0lens1": "t0",
             "tE_ref": "tE",
-            "u0_lens1": "u0",
+            "u0lens1": "u0",
             "rho": "rho",
             "piEN": "pi_EN",
             "piEE": "pi_EE"
@@ -117,10 +649,47 @@ class GullsParser:
 
         self.filters = ["F146", "F087", "F213"]  # Observatories codes
 
+        # astrometric noise model: run seed of the per-event noise streams and a
+        # systematic floor in mas added in quadrature (see add_astrometric_noise)
+        self.noise_seed = noise_seed
+        self.astrometric_floor = astrometric_floor
+
+        # read only the master columns used by the mappings above (see master_columns)
+        self.load_all_master_columns = load_all_master_columns
+
+        # stream master files in chunks of this many rows, keeping only the
+        # events with light curves in the input directory (see read_lens_master)
+        self.master_chunksize = master_chunksize
+
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{output_format}'. Choose from: {', '.join(OUTPUT_FORMATS)}")
+        self.output_format = output_format
+
+        # consolidated sink for output_format="hdf5" (see write_event)
+        self.event_store_path = self.output_dir / "events.h5"
+        self.event_store = None  # open EventStore while a run is in progress
+        self.deferred_events = None  # events a pool worker hands back to the parent
+
+        # serial runs: number of light curves read ahead of the compute stage
+        # and of results queued for the writer thread (0 = no pipelining, see _run_pipelined)
+        self.prefetch = prefetch
+        self.write_queue = None  # open queue of the writer thread while a pipelined run is in progress
+
+        # resumable runs: skip events finished by an earlier run with the same
+        # configuration (see RunManifest and pending_events)
+        self.manifest_path = self.output_dir / "manifest.jsonl"
+        self.manifest = RunManifest(self.manifest_path) if resume else None
+        self.run_config = None  # config_hash of the run in progress
+
+        # parsed light curve cache for load_lc_file (None = always parse the text)
+        self.lc_cache_dir = pathlib.Path(lc_cache_dir) if lc_cache_dir is not None else None
+
     @staticmethod
-    def concatenate_master_df(path_list):
+    def concatenate_master_df(path_list, columns=None):
         """
         Concatenate a list of DataFrames into a single master DataFrame.
+
+        columns is passed through to ``read_master``.
         """
         df_list = []
 
@@ -129,29 +698,55 @@ class GullsParser:
                 raise FileNotFoundError(f"File not found: {p}")
             
             # Load all DataFrames from the list of paths and concatenate them
-            df = GullsParser.read_master(p)
+            df = GullsParser.read_master(pathlib.Path(p), columns=columns)
             df_list.append(df)
 
         return pd.concat(df_list, ignore_index=True)
     
     #static method to read hdf5 or csv based on suffix
     @staticmethod
-    def read_master(path):
+    def read_master(path, columns=None):
         """ Read a master DataFrame from a file, which can be either .csv or .hdf5.
+
+        With columns, only those columns are read (``usecols`` for text files,
+        ``columns=`` for HDF5 table stores); requested columns that the file
+        does not have are skipped. Key columns get the compact dtypes of
+        ``MASTER_COLUMN_DTYPES``.
+
         Args:
             path (str or pathlib.Path): Path to the master file.
+            columns (list, optional): Columns to read (default: all).
         Returns:
             pd.DataFrame: Loaded DataFrame.
         """
+        path = pathlib.Path(path)
         if path.suffix == ".hdf5":
-            return pd.read_hdf(path)
+            if columns is None:
+                return pd.read_hdf(path)
+            with pd.HDFStore(path, mode="r") as store:
+                key = store.keys()[0]
+                storer = store.get_storer(key)
+                if storer.is_table:
+                    available = storer.non_index_axes[0][1]
+                    df = store.select(key, columns=[col for col in columns if col in available])
+                else:
+                    # fixed format stores cannot be read column-wise
+                    df = store.select(key)
+                    df = df[[col for col in columns if col in df.columns]]
+            dtype = {col: dt for col, dt in MASTER_COLUMN_DTYPES.items() if col in df.columns}
+            return df.astype(dtype)
         else:
-            return pd.read_csv(path)
+            if columns is None:
+                return pd.read_csv(path)
+            wanted = set(columns)
+            return pd.read_csv(path, usecols=lambda col: col in wanted, dtype=MASTER_COLUMN_DTYPES)
 
     @staticmethod
-    def load_master(path):
+    def load_master(path, columns=None):
         """
         Load the master DataFrame for a given lens type.
+
+        columns is passed through to ``read_master`` (default: all columns).
         """
         #if is a string or pathlib.Path
         if isinstance(path, str):
@@ -159,80 +754,564 @@ class GullsParser:
             if not path.exists():
                 raise FileNotFoundError(f"Master file not found: {path}")
             # Load the DataFrame
-            return GullsParser.read_master(path)
+            return GullsParser.read_master(path, columns=columns)
         elif isinstance(path, pathlib.Path):
             if not path.exists():
                 raise FileNotFoundError(f"Master file not found: {path}")
             # Load the DataFrame
-            return GullsParser.read_master(path)
+            return GullsParser.read_master(path, columns=columns)
         elif isinstance(path, list):
             # If a list of paths is given, load all DataFrames and concatenate them
-            return GullsParser.concatenate_master_df(path)
+            return GullsParser.concatenate_master_df(path, columns=columns)
         else:
             raise TypeError("Path must be a string, pathlib.Path, or list of paths.")
+
+    @staticmethod
+    def iter_master_chunks(path, columns=None, chunksize=100000):
+        """
+        Yield a master file as DataFrames of at most chunksize rows.
+
+        Text files are read with ``pd.read_csv(chunksize=...)`` and HDF5 table
+        stores with ``HDFStore.select(chunksize=...)``; fixed format HDF5
+        stores cannot be iterated and are yielded whole. columns is handled as
+        in ``read_master``.
+        """
+        path = pathlib.Path(path)
+        if path.suffix == ".hdf5":
+            with pd.HDFStore(path, mode="r") as store:
+                key = store.keys()[0]
+                storer = store.get_storer(key)
+                if not storer.is_table:
+                    yield GullsParser.read_master(path, columns=columns)
+                    return
+                if columns is not None:
+                    available = storer.non_index_axes[0][1]
+                    columns = [col for col in columns if col in available]
+                for chunk in store.select(key, columns=columns, chunksize=chunksize):
+                    yield chunk.astype({col: dt for col, dt in MASTER_COLUMN_DTYPES.items() if col in chunk.columns})
+        else:
+            usecols = None
+            if columns is not None:
+                wanted = set(columns)
+                usecols = lambda col: col in wanted  # noqa: E731
+            dtype = MASTER_COLUMN_DTYPES if columns is not None else None
+            with pd.read_csv(path, usecols=usecols, dtype=dtype, chunksize=chunksize) as reader:
+                yield from reader
+
+    @staticmethod
+    def stream_master(path_list, keys, columns=None, chunksize=100000):
+        """
+        Build a master DataFrame holding only the rows of the given events.
+
+        The master files are read chunk by chunk (``iter_master_chunks``) and
+        each chunk is filtered on (SubRun, Field, EventID) before the next is
+        read, so peak memory is one chunk plus the kept rows rather than the
+        whole catalogue.
+
+        Args:
+            path_list (list): Master files.
+            keys (iterable): (SubRun, Field, EventID) tuples to keep.
+            columns (list, optional): Columns to read (default: all).
+            chunksize (int): Rows per chunk.
+        Returns:
+            pd.DataFrame: Matching master rows, in file order.
+        """
+        keys = [tuple(int(k) for k in key) for key in keys]
+        kept = []
+        empty = None
+        for p in path_list:
+            if not pathlib.Path(p).exists():
+                raise FileNotFoundError(f"File not found: {p}")
+            for chunk in GullsParser.iter_master_chunks(p, columns=columns, chunksize=chunksize):
+                missing = [col for col in MASTER_KEY_COLUMNS if col not in chunk.columns]
+                if missing:
+                    raise KeyError(f"Master file is missing key column(s): {', '.join(missing)}")
+                if empty is None:
+                    empty = chunk.iloc[:0]
+                chunk_keys = pd.MultiIndex.from_arrays(
+                    [pd.to_numeric(chunk[col]).to_numpy(dtype=np.int64) for col in MASTER_KEY_COLUMNS]
+                )
+                mask = chunk_keys.isin(keys)
+                if mask.any():
+                    kept.append(chunk[mask])
+
+        if not kept:
+            return empty if empty is not None else pd.DataFrame(columns=MASTER_KEY_COLUMNS)
+        return pd.concat(kept, ignore_index=True)
+
+    @staticmethod
+    def event_keys(data_dir):
+        """
+        (SubRun, Field, EventID) keys of the light curve files (.lc, .dat) in a directory.
+
+        Files whose names do not parse are skipped.
+        """
+        data_dir = pathlib.Path(data_dir)
+        keys = set()
+        for data_file in list(data_dir.glob("*.lc")) + list(data_dir.glob("*.dat")):
+            try:
+                keys.add(GullsParser.parse_event_key(data_file))
+            except ValueError:
+                continue
+        return keys
+
+    def read_lens_master(self, lens, data_dir, master_files):
+        """
+        Read the master files of a lens type, streamed and filtered when ``master_chunksize`` is set.
+
+        Args:
+            lens (str): "single", "binary" or "triple" (selects ``master_columns``).
+            data_dir (Path): Directory with the light curve files of this lens type.
+            master_files (list): Master files to read.
+        Returns:
+            pd.DataFrame: Master DataFrame.
+        Raises:
+            KeyError: If the master files lack a column of ``master_columns``.
+        """
+        columns = self.master_columns(lens)
+        if self.master_chunksize is None:
+            master = self.load_master(master_files, columns=columns)
+        else:
+            master = self.stream_master(
+                master_files, GullsParser.event_keys(data_dir), columns=columns, chunksize=self.master_chunksize
+            )
+        # the projection skips absent columns, so check here rather than per event
+        missing = [col for col in self.master_columns(lens, required=True) if col not in master.columns]
+        if missing:
+            raise KeyError(f"Master file(s) missing mapped column(s): {', '.join(missing)} ({lens} lens)")
+        return master
+
+    def master_columns(self, lens, required=False):
+        """
+        Master columns the pipeline needs for a lens type ("single", "binary" or "triple").
+
+        These are the event key columns, the keys of ``master_column_mapping`` and,
+        for binary and triple lenses, the additional 2L (and 3L) columns.
+        Returns None when ``load_all_master_columns`` is set, unless required is True.
+        """
+        if self.load_all_master_columns and not required:
+            return None
+        mappings = {
+            "single": [self.master_column_mapping],
+            "binary": [self.master_column_mapping, self.additional_master_columns_for_2L],
+            "triple": [
+                self.master_column_mapping, self.additional_master_columns_for_2L, self.additional_master_columns_for_3L
+            ],
+        }
+        if lens not in mappings:
+            raise ValueError(f"Unknown lens type '{lens}'. Choose from: {', '.join(mappings)}")
+        columns = list(MASTER_KEY_COLUMNS)
+        for mapping in mappings[lens]:
+            columns += [col for col in mapping if col not in columns]
+        return columns
         
+    def master_files(self, lens):
+        """
+        Master files of a lens type: every .csv or .out file in its input
+        directory, plus .hdf5 files for single lenses.
+        """
+        lens_dir = getattr(self, f"{lens}_lens_dir")
+        suffixes = ["*.csv", "*.out", "*.hdf5"] if lens == "single" else ["*.csv", "*.out"]
+        return [f for suffix in suffixes for f in lens_dir.glob(suffix)]
+
     def load_single_lens_master(self):
         """
         Load the master file(s) for single lens systems and save them as a class attribute.
         """
-        # master files are all files ending in .csv, or .out, or .hdf5
-        master_files = list(self.single_lens_dir.glob("*.csv")) + list(self.single_lens_dir.glob("*.out")) + list(self.single_lens_dir.glob("*.hdf5"))
+        master_files = self.master_files("single")
         if not master_files:
             raise FileNotFoundError(f"No master files found in: {self.single_lens_dir}")
 
         # Load the master DataFrame(s) and concatenate them if multiple
-        self.single_lens_master = self.load_master(master_files)
+        self.single_lens_master = self.read_lens_master("single", self.single_lens_dir, master_files)
+        self.single_lens_master_index = self.build_master_index(self.single_lens_master)
 
     def load_binary_lens_master(self):
         """
         Load the master file(s) for binary lens systems and save them as a class attribute.
         """
-        # master files are all files ending in .csv, or .out
-        master_files = list(self.binary_lens_dir.glob("*.csv")) + list(self.binary_lens_dir.glob("*.out"))
+        master_files = self.master_files("binary")
         if not master_files:
             raise FileNotFoundError(f"No master files found in: {self.binary_lens_dir}")
 
         # Load the master DataFrame(s)
-        self.binary_lens_master = self.load_master(master_files)
+        self.binary_lens_master = self.read_lens_master("binary", self.binary_lens_dir, master_files)
+        self.binary_lens_master_index = self.build_master_index(self.binary_lens_master)
 
     def load_triple_lens_master(self):
         """
         Load the master file(s) for triple lens systems and save them as a class attribute.
         """
-        # master files are all files ending in .csv, or .out
-        master_files = list(self.triple_lens_dir.glob("*.csv")) + list(self.triple_lens_dir.glob("*.out"))
+        master_files = self.master_files("triple")
         if not master_files:
             raise FileNotFoundError(f"No master files found in: {self.triple_lens_dir}")
 
         # Load the master DataFrame(s)
-        self.triple_lens_master = self.load_master(master_files)
+        self.triple_lens_master = self.read_lens_master("triple", self.triple_lens_dir, master_files)
+        self.triple_lens_master_index = self.build_master_index(self.triple_lens_master)
+
+    @staticmethod
+    def build_master_index(master):
+        """
+        Build a hash index of a master DataFrame keyed on (SubRun, Field, EventID).
+
+        The key columns are normalised to int64 so that keys parsed from file
+        names (see ``parse_event_key``) match regardless of whether the master
+        was read as int, float, or str.
+
+        Args:
+            master (pd.DataFrame): Master DataFrame with SubRun, Field, and EventID columns.
+        Returns:
+            dict: Mapping of (SubRun, Field, EventID) int tuples to row positions.
+        Raises:
+            KeyError: If a key column is missing.
+            ValueError: If the same key appears on more than one row.
+        """
+        missing = [col for col in MASTER_KEY_COLUMNS if col not in master.columns]
+        if missing:
+            raise KeyError(f"Master file is missing key column(s): {', '.join(missing)}")
+
+        keys = [pd.to_numeric(master[col]).to_numpy(dtype=np.int64) for col in MASTER_KEY_COLUMNS]
+        index = {key: position for position, key in enumerate(zip(*(k.tolist() for k in keys)))}
+
+        if len(index) != len(master):
+            duplicated = master.duplicated(subset=MASTER_KEY_COLUMNS, keep=False)
+            examples = master.loc[duplicated, MASTER_KEY_COLUMNS].drop_duplicates().head(5)
+            raise ValueError(
+                f"Duplicate (SubRun, Field, EventID) keys in master file: "
+                f"{[tuple(int(v) for v in r) for r in examples.itertuples(index=False)]}"
+            )
+
+        return index
 
     @staticmethod
-    def save_lc_output(df, output_path, header, comment_text=""):
+    def parse_event_key(data_file):
+        """
+        Parse (SubRun, Field, EventID) from a light curve file name.
+
+        File names follow ``<prefix>_{SubRun}_{Field}_{EventID}.det.lc``; only the
+        known suffixes (``EVENT_FILE_SUFFIXES``) are stripped before splitting, so
+        ``.det.lc``, ``.lc`` and ``.dat`` all work and dots in the prefix are kept.
+
+        Args:
+            data_file (str or pathlib.Path): Light curve file path.
+        Returns:
+            tuple: (SubRun, Field, EventID) as ints.
+        """
+        file_name = pathlib.Path(data_file).name
+        for suffix in EVENT_FILE_SUFFIXES:
+            if file_name.endswith(suffix):
+                file_name = file_name[:-len(suffix)]
+        parts = file_name.split("_")
+        try:
+            return tuple(int(part) for part in parts[-3:])
+        except ValueError:
+            raise ValueError(f"Cannot parse SubRun, Field, EventID from file name: {pathlib.Path(data_file).name}")
+
+    @staticmethod
+    def get_master_row(master, master_index, key):
+        """
+        Look up the master row for an event key in O(1).
+
+        Args:
+            master (pd.DataFrame): Master DataFrame.
+            master_index (dict): Index built by ``build_master_index``.
+            key (tuple): (SubRun, Field, EventID).
+        Returns:
+            pd.DataFrame: Single-row DataFrame for the event.
+        """
+        position = master_index.get(tuple(int(k) for k in key))
+        if position is None:
+            SubRun, Field, EventID = key
+            raise ValueError(f"No matching row found in master file for SubRun: {SubRun}, Field: {Field}, EventID: {EventID}")
+        return master.iloc[[position]]
+
+    @staticmethod
+    def save_lc_output(df, output_path, header, comment_text="", output_format="text"):
         """
         Save the processed DataFrame to the output directory.
 
-        file contains:
+        text file contains:
          * comment lines starting with '#'
          * header line with column names (using lc_column_mapping)
          * data lines
+
+        The binary backends ("parquet", "feather", "npz") write the header
+        columns with their dtypes and keep the comment lines (#fs, #Obssrcmag,
+        #Event, ...) as file-level key/value metadata; read them back with
+        ``load_lc_output``. Parquet and Feather require pyarrow.
         """
-        with open(output_path, 'w') as f:
-            # Write comment lines
-            for line in comment_text.splitlines():
-                f.write(f"# {line}\n")
-            # Write header
-            f.write(",".join(header) + "\n")
-            # Write DataFrame
-            df.to_csv(f, index=False)
-            f.write("\n")
+        if output_format == "text":
+            with open(output_path, 'w') as f:
+                # Write comment lines
+                for line in comment_text.splitlines():
+                    f.write(f"# {line}\n")
+                # Write header
+                f.write(",".join(header) + "\n")
+                # Write DataFrame
+                df.to_csv(f, index=False)
+                f.write("\n")
+        elif output_format in ("parquet", "feather"):
+            try:
+                import pyarrow as pa
+                import pyarrow.feather
+                import pyarrow.parquet
+            except ImportError:
+                raise ImportError(f"pyarrow is required for the '{output_format}' output format.")
+
+            table = pa.Table.from_pandas(df[header], preserve_index=False)
+            metadata = dict(table.schema.metadata or {})
+            metadata.update({k.encode(): v.encode() for k, v in GullsParser.parse_comment_metadata(comment_text).items()})
+            table = table.replace_schema_metadata(metadata)
+            if output_format == "parquet":
+                pyarrow.parquet.write_table(table, output_path)
+            else:
+                pyarrow.feather.write_feather(table, output_path)
+        elif output_format == "npz":
+            metadata = GullsParser.parse_comment_metadata(comment_text)
+            np.savez(
+                output_path,
+                __columns__=np.array(header),
+                __metadata_keys__=np.array(list(metadata), dtype=str),
+                __metadata_values__=np.array(list(metadata.values()), dtype=str),
+                **{col: df[col].to_numpy() for col in header},
+            )
+        else:
+            raise ValueError(f"Unknown output format '{output_format}'. Choose from: {', '.join(OUTPUT_FORMATS)}")
 
         print(f"Saved processed data to: {output_path}")
 
     @staticmethod
-    def load_lc_file(file_path):
+    def load_lc_output(output_path):
+        """
+        Load a light curve written by ``save_lc_output`` in one of the binary formats.
+
+        Returns:
+            tuple: (df, metadata, header) where metadata maps the comment keys
+            (e.g. "fs", "Event") to their value strings.
+        """
+        output_path = pathlib.Path(output_path)
+        if not output_path.exists():
+            raise FileNotFoundError(f"Output file not found: {output_path}")
+
+        if output_path.suffix in (".parquet", ".feather"):
+            try:
+                import pyarrow.feather
+                import pyarrow.parquet
+            except ImportError:
+                raise ImportError(f"pyarrow is required to read {output_path.suffix} files.")
+
+            if output_path.suffix == ".parquet":
+                table = pyarrow.parquet.read_table(output_path)
+            else:
+                table = pyarrow.feather.read_table(output_path)
+            metadata = {
+                k.decode(): v.decode() for k, v in (table.schema.metadata or {}).items() if k != b"pandas"
+            }
+            df = table.to_pandas()
+        elif output_path.suffix == ".npz":
+            with np.load(output_path, allow_pickle=False) as data:
+                header = data["__columns__"].tolist()
+                metadata = dict(zip(data["__metadata_keys__"].tolist(), data["__metadata_values__"].tolist()))
+                df = pd.DataFrame({col: data[col] for col in header})
+        else:
+            raise ValueError(f"Not a binary light curve output file: {output_path}")
+
+        return df, metadata, df.columns.tolist()
+
+    @staticmethod
+    def parse_comment_metadata(comment_text):
+        """
+        Split comment lines like "#fs: 0.97 0.95 0.91" into an ordered {key: value} dict.
+        """
+        metadata = {}
+        for line in comment_text.splitlines():
+            line = line.strip().lstrip("#").strip()
+            if not line:
+                continue
+            key, _, value = line.partition(":")
+            metadata[key.strip()] = value.strip()
+        return metadata
+
+    def output_path_for(self, output_dir, data_file):
+        """
+        Output file path for a data file under the configured output format.
+        """
+        suffix = OUTPUT_FORMATS[self.output_format]
+        name = pathlib.Path(data_file).name
+        if suffix is not None:
+            name = pathlib.Path(name).with_suffix(suffix).name
+        return pathlib.Path(output_dir) / name
+
+    def write_event(self, lens, output_dir, data_file, key, df, header, comment_text=""):
+        """
+        Save one processed event with the configured output format.
+
+        "hdf5" appends the event to the run's EventStore (``event_store_path``);
+        every other format writes its own file under output_dir via ``save_lc_output``.
+        During a pipelined run the event is queued for the writer thread instead.
+
+        Args:
+            lens (str): EventStore group, "single", "binary" or "triple".
+            output_dir (Path): Directory for per-event output files.
+            data_file (Path): Input light curve file.
+            key (tuple): (SubRun, Field, EventID) of the event.
+            df (DataFrame): Processed light curve.
+            header (list): Columns to write, in order.
+            comment_text (str): Comment lines of the input file.
+        """
+        if self.write_queue is not None:
+            # pipelined run: the writer thread saves it (see _run_pipelined)
+            self.write_queue.put((lens, output_dir, data_file, key, df, header, comment_text))
+        else:
+            self.save_event(lens, output_dir, data_file, key, df, header, comment_text)
+
+    def save_event(self, lens, output_dir, data_file, key, df, header, comment_text=""):
+        """
+        Write one processed event now; see ``write_event`` for the arguments.
+        """
+        if self.output_format != "hdf5":
+            output_path = self.output_path_for(output_dir, data_file)
+            GullsParser.save_lc_output(df, output_path, header, comment_text, output_format=self.output_format)
+            self.record_event(data_file, output_path)
+        elif self.deferred_events is not None:
+            # pool worker: the parent process owns the store
+            self.deferred_events.append((lens, key, df[header], header, comment_text, str(data_file)))
+        else:
+            if self.event_store is not None:
+                self.event_store.append(lens, key, df, header, comment_text, source=data_file)
+            else:
+                with EventStore(self.event_store_path) as store:
+                    store.append(lens, key, df, header, comment_text, source=data_file)
+            self.record_event(data_file, EventStore.group_name(lens, key), n_rows=len(df))
+
+    def config_hash(self, add_astrometry=True, lens=None):
+        """
+        Hash of the settings that determine an event's output, for the run manifest.
+
+        With lens, the path, size and mtime of that lens type's master files
+        are included too, so editing or replacing a master file invalidates
+        the events finished against the old one.
+        """
+        config = {
+            "add_astrometry": bool(add_astrometry),
+            "output_format": self.output_format,
+            "filters": self.filters,
+            "noise_seed": self.noise_seed,
+            "astrometric_floor": self.astrometric_floor,
+            "master_column_mapping": self.master_column_mapping,
+            "additional_master_columns_for_2L": self.additional_master_columns_for_2L,
+            "additional_master_columns_for_3L": self.additional_master_columns_for_3L,
+        }
+        if lens is not None:
+            config["master_files"] = [
+                {"path": os.path.abspath(f), "signature": RunManifest.file_signature(f)}
+                for f in sorted(self.master_files(lens))
+            ]
+        return hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()[:16]
+
+    def event_output(self, lens, data_file):
+        """
+        Where an event is written: its output file, or its EventStore group for "hdf5".
+        """
+        if self.output_format == "hdf5":
+            return EventStore.group_name(lens, GullsParser.parse_event_key(data_file))
+        return self.output_path_for(getattr(self, f"output_{lens}_lens_dir"), data_file)
+
+    def record_event(self, data_file, output, n_rows=None):
+        """
+        Add a finished event to the run manifest (resumable runs only).
+
+        For the "hdf5" format output is the EventStore group and n_rows the
+        number of rows written to it.
+        """
+        if self.manifest is None:
+            return
+        if self.output_format == "hdf5":
+            output_signature = {"n_rows": n_rows}
+        else:
+            output_signature = RunManifest.file_signature(output)
+        self.manifest.record(data_file, self.run_config, output, output_signature)
+
+    def pending_events(self, method_name, data_files, config):
+        """
+        Drop the data files whose output is up to date according to the manifest.
+
+        An event is kept if it has no manifest entry under config, if its input
+        changed (size or mtime), or if its output is missing or differs from
+        the one recorded (e.g. truncated by a crash or edited since). For the
+        "hdf5" format the event's group must be in the store index and hold
+        the number of rows recorded in the manifest.
+
+        Args:
+            method_name (str): Per-event method, e.g. "process_single_lens_file".
+            data_files (list): Data files of the run.
+            config (str): ``config_hash`` of the run.
+        Returns:
+            list: Data files still to process, in input order.
+        """
+        lens = EVENT_METHODS[method_name]
+        stored_rows = None
+        if self.output_format == "hdf5":
+            stored_rows = {}  # group: rows in the index and in the group itself
+            if self.event_store_path.exists():
+                with EventStore(self.event_store_path, mode="r") as store:
+                    index = store.read_index(lens)
+                    for group, n_rows in zip(index["group"], index["n_rows"]):
+                        stored_rows[group] = (int(n_rows), store.stored_rows(group))
+
+        pending = []
+        for data_file in data_files:
+            entry = self.manifest.lookup(data_file, config)
+            try:
+                output = str(self.event_output(lens, data_file))
+            except ValueError:
+                output = None  # unparseable name, let the processing method report it
+            if entry is None or output is None or entry["output"] != output:
+                pending.append(data_file)
+            elif stored_rows is not None:
+                n_rows = (entry["output_signature"] or {}).get("n_rows")
+                if n_rows is None or stored_rows.get(output) != (n_rows, n_rows):
+                    pending.append(data_file)
+            elif RunManifest.file_signature(output) != entry["output_signature"]:
+                pending.append(data_file)
+
+        skipped = len(data_files) - len(pending)
+        if skipped:
+            print(f"Skipping {skipped} of {len(data_files)} events already up to date in {self.manifest_path}")
+        return pending
+
+    @contextlib.contextmanager
+    def _event_store_session(self):
+        """
+        Keep the run's EventStore open while events are written (hdf5 output only).
+        """
+        if self.output_format != "hdf5" or self.event_store is not None:
+            yield
+            return
+        self.event_store = EventStore(self.event_store_path)
+        try:
+            yield
+        finally:
+            self.event_store.close()
+            self.event_store = None
+
+    def read_event(self, data_file):
+        """
+        Read a light curve for the process_* methods: (df, LcHeader, header).
+        """
+        return GullsParser.load_lc_file(data_file, cache_dir=self.lc_cache_dir, parse_header=True)
+
+    @staticmethod
+    def load_lc_file(file_path, cache_dir=None, parse_header=False):
         """
         Load a light curve file (.lc or .dat) and return the DataFrame, comment text, and header.
+
+        With a cache_dir, the parsed light curve is kept in a LightCurveCache
+        and repeat loads of an unchanged file skip the text parse.
+
+        With parse_header=True the comment text is returned parsed, as an
+        LcHeader (the raw text stays available as ``LcHeader.comment_text``).
         
         The lightcurve columns are:
           Simulation_time measured_relative_flux measured_relative_flux_error true_relative_flux true_relative_flux_error 
@@ -245,36 +1324,87 @@ class GullsParser:
           sigma_m = 2.5/ln(10) sigma_F/F
         these are listed in the header information in lines #fs and #Obssrcmag with order matching the observatory code order. 
         The observatory codes correspond to 0=W146, 1=Z087, 2=K213
+
+        The file is read in a single pass: the ``#`` comment block and the
+        header line are consumed from the open handle, which is then passed
+        directly to the pandas C parser with the known column dtypes
+        (``LC_COLUMN_DTYPES``).
         """
+        file_path = pathlib.Path(file_path)
         if not file_path.exists():
             raise FileNotFoundError(f"Data file not found: {file_path}")
 
-        # Read the file
-        with open(file_path, 'r') as f:
-            lines = f.readlines()
+        if cache_dir is not None:
+            cache = LightCurveCache(cache_dir)
+            cached = cache.load(file_path)
+            if cached is not None:
+                df, comment_text, header = cached
+                if parse_header:
+                    return df, LcHeader.from_comment_text(comment_text), header
+                return cached
 
-        # Extract comment lines and header
-        comment_lines = [line for line in lines if line.startswith("#")]
-        header_line = next((line for line in lines if not line.startswith("#")), None)
-        
-        if header_line is None:
-            raise ValueError("No header found in the file.")
-
-        # Split header by whitespace (not comma)
-        header = header_line.strip().split()
-        
-        # Load the data into a DataFrame
-        data_lines = [line for line in lines if not line.startswith("#") and line.strip() != header_line.strip()]
-        
-        # Create a StringIO object with space-separated data
-        data_text = "".join(data_lines)
-        df = pd.read_csv(StringIO(data_text), sep=r'\s+', names=header)
+        comment_lines = []
+        with open(file_path, 'r') as f:
+            # Consume the comment block and the header line
+            header_line = f.readline()
+            while header_line.startswith("#"):
+                comment_lines.append(header_line)
+                header_line = f.readline()
+
+            # Split header by whitespace (not comma)
+            header = header_line.strip().split()
+            if not header or GullsParser._is_numeric_line(header):
+                raise ValueError("No header found in the file.")
+
+            # Parse the remaining data lines straight from the file handle
+            dtype = {col: LC_COLUMN_DTYPES[col] for col in header if col in LC_COLUMN_DTYPES}
+            df = pd.read_csv(
+                f,
+                sep=r'\s+',
+                names=header,
+                dtype=dtype,
+                comment="#",
+                engine="c",
+            )
 
         # Join comment lines into a single string
         comment_text = "\n".join(comment_lines)
 
+        if cache_dir is not None:
+            cache.store(file_path, df, comment_text, header)
+
+        if parse_header:
+            return df, LcHeader.from_comment_text(comment_text), header
         return df, comment_text, header
 
+    @staticmethod
+    def header_parameters(lc_header):
+        """
+        Per-observatory photometric parameters of an LcHeader as event dictionary entries.
+
+        Returns:
+            dict: "fs", "ms" (#Obssrcmag) and "FL" (#Obslensmag) arrays, plus
+            FS_i, ms_i and FL_i floats for each observatory code i.
+        """
+        parameters = {}
+        for name, values in (("fs", lc_header.fs), ("ms", lc_header.obssrcmag), ("FL", lc_header.obslensmag)):
+            parameters[name] = values
+            prefix = "FS" if name == "fs" else name
+            for i, value in enumerate(values):
+                parameters[f"{prefix}_{i}"] = float(value)
+        return parameters
+
+    @staticmethod
+    def _is_numeric_line(tokens):
+        """
+        Return True if every token parses as a float (i.e. a data row, not a header).
+        """
+        try:
+            [float(token) for token in tokens]
+        except ValueError:
+            return False
+        return True
+
     @staticmethod
     def get_magnitudes(F, fs, ms, observatory_codes):
         """
@@ -304,14 +1434,109 @@ class GullsParser:
         return mag, mag_err
     
     @staticmethod
-    def get_zeropoint(elements, table_path="input/Roman_zeropoints_20240301.ecsv"):
+    def photometry_constants(fs, ms, zp, dtype=np.float64):
+        """
+        Per-observatory constants of the photometry kernel.
+
+        Parameters:
+        - fs: Source flux fractions per observatory (#fs).
+        - ms: Source magnitudes per observatory (#Obssrcmag).
+        - zp: Zero points per observatory (see ``get_zeropoint``).
+        - dtype: Floating point type of the returned arrays.
+        Returns:
+        - offset: ms + 2.5 log10(fs), so that mag = offset - 2.5 log10(F).
+        - scale: 10 ** ((zp - offset) / 2.5), so that the physical flux is scale * F.
+        """
+        fs = np.asarray(fs, dtype=np.float64)
+        ms = np.asarray(ms, dtype=np.float64)
+        zp = np.asarray(zp, dtype=np.float64)
+        if not len(fs) == len(ms) == len(zp):
+            raise ValueError(f"fs, ms and zp must have one entry per observatory, got {len(fs)}, {len(ms)} and {len(zp)}.")
+        offset = ms + 2.5 * np.log10(fs)
+        scale = 10 ** ((zp - offset) / 2.5)
+        return offset.astype(dtype), scale.astype(dtype)
+
+    @staticmethod
+    def photometry(observatory_codes, true_F, true_F_err, F, F_err, fs, ms, zp, dtype=np.float64, out=None):
+        """
+        Magnitudes and physical fluxes for the true and measured relative fluxes in one pass.
+
+        With offset = ms + 2.5 log10(fs) per observatory (``photometry_constants``):
+          mag = offset - 2.5 log10(F)
+          mag_err = 2.5 / ln(10) * F_err / F
+          flux = 10 ** ((zp - mag) / 2.5) = scale * F,  flux_err = scale * F_err
+        The per-observatory constants are gathered once per epoch and shared by
+        the true and measured columns, and the physical fluxes come straight from
+        the relative fluxes instead of a second pass through the magnitudes.
+        Epochs with a non-positive flux have no magnitude: their mag and mag_err
+        are NaN (the physical fluxes are still written).
+
+        Parameters:
+        - observatory_codes: Observatory code of each epoch (index into fs, ms, zp).
+        - true_F, true_F_err: True relative flux and its error.
+        - F, F_err: Measured relative flux and its error.
+        - fs, ms, zp: Per-observatory source flux fraction, source magnitude and zero point.
+        - dtype: Floating point type of the results (np.float64 or np.float32).
+        - out: Optional dict of preallocated arrays keyed like the result; missing keys are allocated.
+        Returns:
+        - dict with "true_mag", "true_mag_err", "mag", "mag_err" and the physical
+          fluxes "true_F", "true_F_err", "F", "F_err".
+        """
+        dtype = np.dtype(dtype)
+        codes = np.asarray(observatory_codes)
+        offset, scale = GullsParser.photometry_constants(fs, ms, zp, dtype=dtype)
+        if len(codes) and (codes.min() < 0 or codes.max() >= len(offset)):
+            raise ValueError(f"Observatory codes must be between 0 and {len(offset) - 1}.")
+
+        n = len(codes)
+        out = {} if out is None else out
+        result = {}
+        for key in PHOTOMETRY_KEYS:
+            buffer = out.get(key)
+            if buffer is None:
+                buffer = np.empty(n, dtype=dtype)
+            elif buffer.shape != (n,) or buffer.dtype != dtype:
+                raise ValueError(f"out['{key}'] must be a {dtype} array of shape ({n},).")
+            result[key] = buffer
+
+        offset = offset[codes]
+        scale = scale[codes]
+        mag_err_factor = dtype.type(2.5 / np.log(10))
+        for prefix, flux, flux_err in (("true_", true_F, true_F_err), ("", F, F_err)):
+            flux = np.asarray(flux, dtype=dtype)
+            flux_err = np.asarray(flux_err, dtype=dtype)
+            if flux.shape != (n,) or flux_err.shape != (n,):
+                raise ValueError("Fluxes, flux errors and observatory codes must have the same length.")
+
+            mag = result[prefix + "mag"]
+            mag_err = result[prefix + "mag_err"]
+            # log10 of a non-positive flux warns; those epochs are set to NaN below
+            with np.errstate(divide="ignore", invalid="ignore"):
+                np.log10(flux, out=mag)
+                np.divide(flux_err, flux, out=mag_err)
+            mag *= dtype.type(-2.5)
+            mag += offset
+            mag_err *= mag_err_factor
+            fluxless = flux <= 0
+            if fluxless.any():
+                mag[fluxless] = np.nan
+                mag_err[fluxless] = np.nan
+
+            np.multiply(flux, scale, out=result[prefix + "F"])
+            np.multiply(flux_err, scale, out=result[prefix + "F_err"])
+        return result
+
+    @staticmethod
+    def get_zeropoint(elements, table_path="input/Roman_zeropoints_20240301.ecsv", detector=None):
         """
         Look up the AB zero point for the flux calculation based on the elements.
         
         Parameters:
         - elements: List of elements (as they appear in the roman technical information table).
+        - table_path: Path to the zero point table (downloaded if missing).
+        - detector: Detector to take the zero points from (default: first detector listed per element).
         Returns:
-        - A dictionary with observatory codes as keys and their corresponding zero points as values.
+        - A NumPy array of zero points indexed by observatory code (the position in elements).
         """
         # Check if the table path exists
         if not path.exists(table_path):
@@ -330,48 +1555,8 @@ class GullsParser:
             else:
                 raise ValueError(f"Failed to retrieve zero point table from URL: {url}")
 
-        # Load the zero point table
-        """
-        # %ECSV 1.0
-        # ---
-        # datatype:
-        # - {name: detector, datatype: string}
-        # - {name: element, datatype: string}
-        # - {name: VegaMag, datatype: float64}
-        # - {name: ABMag, datatype: float64}
-        # - {name: STMag, datatype: float64}
-        # - {name: FLAM, datatype: float64}
-        # - {name: FNU, datatype: float64}
-        # - {name: PHOTLAM, datatype: float64}
-        # - {name: PHOTNU, datatype: float64}
-        # meta: !!omap
-        # - {comments: "Zero points for each detector and imaging optical element (filter) using effective area curves as of 2024 03 01.\nThe\
-        #     \ zeropoints are computed using synphot version 1.4.0. The method unit_response() \ndetermines the flux density that generates a\
-        #     \ count rate of 1 count per second through \nthe bandpass. This is computed as:\n\n\\dfrac{hc}{\\int P_\\lambda \\lambda d\\lambda}\n\
-        #     \nwhere h is the Planck constant, c is the speed of light, P is the effective \narea, and lambda is the wavelength. The integrals\
-        #     \ are approximated using the trapezoid \nmethod. Conversions to other units are performed at the pivot wavelength, which is a \n\
-        #     measure of the effective wavelength of the bandpass. The pivot wavelength is defined as:\n\n\\sqrt{\\dfrac{\\int P_\\lambda \\lambda\
-        #     \ d\\lambda}{\\int (P_\\lambda / \\lambda) d\\lambda}}"}
-        # schema: astropy-2.0
-        detector element VegaMag ABMag STMag FLAM FNU PHOTLAM PHOTNU
-        WFI01 F062 26.417663323428016 26.57551933086481 26.880632649382186 6.423133376578637e-20 8.507310180127394e-31 2.0375262991355374e-08 2.6986623522593194e-19
-        WFI01 F087 25.626924239161607 26.22624275057486 27.242258374678336 4.603590128457495e-20 1.1735535182435983e-30 2.0259717908486147e-08 5.16463511448471e-19
-        ...
-        """
-        # Read the table into a DataFrame
-        if table_path.suffix == ".ecsv":
-            zp_table = pd.read_csv(table_path, comment='#', delim_whitespace=True)
-
-        zp = np.zeros(len(elements))
-
-        for i, element in enumerate(elements):
-            if element not in zp_table['element'].values:
-                raise ValueError(f"Element '{element}' not found in the zero point table.")
-            # get the "ABMag" column value for the <element> row
-            abmag = zp_table.loc[zp_table['element'] == element, 'ABMag'].values[0]
-            zp[i] = abmag
-
-        return zp
+        # Parsed once per table path and modification time
+        return ZERO_POINTS.lookup(elements, table_path, detector=detector)
     
     @staticmethod
     def get_fluxes(mag, mag_err, observatory_codes, zp):
@@ -399,9 +1584,108 @@ class GullsParser:
         
         return F, F_err
 
-    def process_single_lens(self, add_astrometry=True):
+    @staticmethod
+    def astrometric_precision(observatory_codes, true_F, F_err, fwhm, floor=0.0):
+        """
+        Per-epoch 1-sigma centroid precision of a photon-noise limited PSF fit.
+
+          sigma = fwhm / (2 sqrt(2 ln 2) * SNR),  SNR = true_F / F_err
+        i.e. the Gaussian PSF width divided by the signal-to-noise ratio, with
+        floor added in quadrature. Epochs with true_F <= 0 have no defined
+        precision and get NaN.
+
+        Parameters:
+        - observatory_codes: Observatory code of each epoch (index into fwhm).
+        - true_F: True physical flux of each epoch.
+        - F_err: Measured physical flux error of each epoch.
+        - fwhm: PSF FWHM per observatory code (mas).
+        - floor: Systematic floor (mas).
+        Returns:
+        - Numpy array of centroid uncertainties (mas), the same in x and y;
+          NaN where true_F <= 0.
+        """
+        codes = np.asarray(observatory_codes)
+        fwhm = np.asarray(fwhm, dtype=np.float64)
+        true_F = np.asarray(true_F, dtype=np.float64)
+        F_err = np.asarray(F_err, dtype=np.float64)
+        if true_F.shape != codes.shape or F_err.shape != codes.shape:
+            raise ValueError("Fluxes, flux errors and observatory codes must have the same length.")
+        if len(codes) and (codes.min() < 0 or codes.max() >= len(fwhm)):
+            raise ValueError(f"Observatory codes must be between 0 and {len(fwhm) - 1}.")
+
+        sigma = np.full(codes.shape, np.nan)
+        positive = true_F > 0
+        sigma[positive] = fwhm[codes[positive]] / (2 * np.sqrt(2 * np.log(2))) * F_err[positive] / true_F[positive]
+        if floor:
+            sigma = np.hypot(sigma, floor)
+        return sigma
+
+    @staticmethod
+    def event_rng(seed, lens, key):
+        """
+        Counter-based (Philox) generator for one event.
+
+        The Philox key is derived from the run seed, the lens type and the
+        (SubRun, Field, EventID) key alone, so an event gets the same noise
+        stream whichever worker processes it and in whatever order.
+        """
+        event = json.dumps([int(seed), lens, [int(k) for k in key]])
+        philox_key = int.from_bytes(hashlib.sha256(event.encode()).digest()[:16], "little")
+        return np.random.Generator(np.random.Philox(key=philox_key))
+
+    @staticmethod
+    def astrometric_noise(sigma, rng):
+        """
+        Draw independent Gaussian centroid offsets in x and y.
+
+        Parameters:
+        - sigma: Per-epoch 1-sigma centroid uncertainty (``astrometric_precision``).
+        - rng: numpy Generator, e.g. from ``event_rng``.
+        Returns:
+        - Tuple of numpy arrays (dx, dy) in the units of sigma (NaN where sigma is NaN).
+        """
+        sigma = np.asarray(sigma, dtype=np.float64)
+        draws = rng.standard_normal((2,) + sigma.shape)
+        return draws[0] * sigma, draws[1] * sigma
+
+    def add_astrometric_noise(self, dic, lens, key):
+        """
+        Fill the astrometry columns of dic["data"] from the photometry in dic.
+
+        sigma_x_err and sigma_y_err hold the per-epoch 1-sigma centroid
+        precision from ``astrometric_precision`` with the PSF width of each
+        filter in ``self.filters``. sigma_x and sigma_y hold a noise
+        realisation drawn from the event's ``event_rng``: offsets from the
+        noiseless centroid along the x and y axes of the light curve's
+        source_x/source_y frame. No model centroid shift is included, so
+        noisy centroids are the model shift plus these offsets (converted to
+        mas). All four columns are in mas and NaN at epochs with true_F <= 0.
+        """
+        unknown = [f for f in self.filters if f not in ROMAN_PSF_FWHM]
+        if unknown:
+            raise KeyError(f"No PSF width for filter(s) {', '.join(unknown)}. "
+                           f"Known filters: {', '.join(ROMAN_PSF_FWHM)}")
+        fwhm = [ROMAN_PSF_FWHM[f] for f in self.filters]
+
+        sigma = GullsParser.astrometric_precision(dic["obs"], dic["true_F"], dic["F_err"], fwhm,
+                                                  floor=self.astrometric_floor)
+        dx, dy = GullsParser.astrometric_noise(sigma, GullsParser.event_rng(self.noise_seed, lens, key))
+
+        data = dic["data"]
+        data["sigma_x"] = dx
+        data["sigma_y"] = dy
+        data["sigma_x_err"] = sigma
+        data["sigma_y_err"] = sigma
+
+    def process_single_lens(self, add_astrometry=True, workers=1):
         """
         Process single lens data and save the output.
+
+        With workers > 1 the events are spread over a process pool and a failing
+        event is reported instead of aborting the batch (see ``_run_events``).
+
+        Returns:
+            dict: Failed data files mapped to their error messages (parallel mode only).
         """
         # load master file(s) with meta data (.csv, .out, .hdf5)
         self.load_single_lens_master()
@@ -412,124 +1696,86 @@ class GullsParser:
             raise FileNotFoundError(f"No data files found in: {self.single_lens_dir}")
         
         # Process each data file
-        for data_file in data_files:
+        return self._run_events("process_single_lens_file", data_files, add_astrometry=add_astrometry, workers=workers)
 
-            # Strip the file name to get the SubRun, EventID, and Field
-            file_name = data_file.stem
-            parts = file_name.split("_")
-            SubRun = parts[-3]
-            Field = parts[-2]
-            EventID = parts[-1] 
-
-            # get row from master file based on SubRun, Field, and EventID
-            row = self.single_lens_master[
-                (self.single_lens_master["SubRun"] == SubRun) &
-                (self.single_lens_master["Field"] == Field) &
-                (self.single_lens_master["EventID"] == EventID)
-            ]
+    def process_single_lens_file(self, data_file, add_astrometry=True, lc=None):
+        """
+        Process one single lens data file and save the output.
 
-            if row.empty:
-                raise ValueError(f"No matching row found in master file for SubRun: {SubRun}, Field: {Field}, EventID: {EventID}")
+        Requires the single lens master to be loaded (``load_single_lens_master``).
+        lc is the ``read_event`` result for data_file when it was read ahead.
+        """
+        # Strip the file name to get the SubRun, Field, and EventID
+        key = GullsParser.parse_event_key(data_file)
 
-            # Load the data file
-            df, comment_text, header = GullsParser.load_lc_file(data_file)
+        # get row from master file based on SubRun, Field, and EventID
+        row = GullsParser.get_master_row(self.single_lens_master, self.single_lens_master_index, key)
 
-            dic = {
-                "row": row,
-                "data": df,
-                "BJD": df["BJD"].to_numpy(),
-                "obs": df["observatory_code"].to_numpy()
-            }
+        # Load the data file
+        df, lc_header, header = lc if lc is not None else self.read_event(data_file)
 
-            # Extract parameters from comment text
-            for line in comment_text.splitlines():
-                if "Obslensmag" in line:
-                    parts = line.split()
-                    dic["ml_0"] = float(parts[1])
-                    dic["ml_1"] = float(parts[2])
-                    dic["ml_2"] = float(parts[3])
-                    dic["ml"] = [float(m) for m in parts[1:]]
-                elif "fs" in line:
-                    parts = line.split()
-                    dic["FS_0"] = float(parts[1])
-                    dic["FS_1"] = float(parts[2])
-                    dic["FS_2"] = float(parts[3])
-                    dic["fs"] = [float(f) for f in parts[1:]]
-                elif "Obssrcmag" in line:
-                    parts = line.split()
-                    dic["ms_0"] = float(parts[1])
-                    dic["ms_1"] = float(parts[2])
-                    dic["ms_2"] = float(parts[3])
-                    dic["ms"] = [float(m) for m in parts[1:]]
-            
-            # Calculate magnitudes and their errors
-            dic["true_mag"], dic["true_mag_err"] = GullsParser.get_magnitudes(
-                df["true_relative_flux"].to_numpy(),
-                df["fs"].to_numpy(),
-                df["ms"].to_numpy(),
-                df["observatory_code"].to_numpy()
-            )
-            dic["mag"], dic["mag_err"] = GullsParser.get_magnitudes(
-                df["measured_relative_flux"].to_numpy(),
-                df["fs"].to_numpy(),
-                df["ms"].to_numpy(),
-                df["observatory_code"].to_numpy()
-            )
+        dic = {
+            "row": row,
+            "data": df,
+            "BJD": df["BJD"].to_numpy(),
+            "obs": df["observatory_code"].to_numpy()
+        }
 
-            # look up the zero points for the flux calculation
-            elements = self.filters
-            if not len(elements) == len(df["observatory_code"].unique()):
-                raise ValueError("Number of elements does not match the number of unique observatory codes.\n"
-                                 "You can change the observatory codes using the 'filters' attribute.\n"
-                                 "Currently, the filters are: " + ", ".join(self.filters) + " and the unique "
-                                 "observatory codes are: " + ", ".join(df["observatory_code"].unique()))
-            zp = GullsParser.get_zeropoint(elements)
-            
-            # Calculate the fluxes
-            dic["true_F"], dic["true_F_err"] = GullsParser.get_fluxes(
-                dic["true_mag"],
-                dic["true_mag_err"],
-                df["observatory_code"].to_numpy(),
-                zp
-            )
-            dic["F"], dic["F_err"] = GullsParser.get_fluxes(
-                dic["mag"],
-                dic["mag_err"],
-                df["observatory_code"].to_numpy(),
-                zp
-            )
+        # Photometric parameters from the comment header
+        dic.update(GullsParser.header_parameters(lc_header))
+
+        # look up the zero points for the flux calculation
+        elements = self.filters
+        if not len(elements) == len(df["observatory_code"].unique()):
+            raise ValueError("Number of elements does not match the number of unique observatory codes.\n"
+                             "You can change the observatory codes using the 'filters' attribute.\n"
+                             "Currently, the filters are: " + ", ".join(self.filters) + " and the unique "
+                             "observatory codes are: " + ", ".join(map(str, df["observatory_code"].unique())))
+        zp = GullsParser.get_zeropoint(elements)
+
+        # Calculate magnitudes, fluxes and their errors
+        dic.update(GullsParser.photometry(
+            dic["obs"],
+            df["true_relative_flux"].to_numpy(),
+            df["true_relative_flux_error"].to_numpy(),
+            df["measured_relative_flux"].to_numpy(),
+            df["measured_relative_flux_error"].to_numpy(),
+            dic["fs"],
+            dic["ms"],
+            zp,
+        ))
+
+        # Add the parameters from the master file to the dictionary
+        for gulls_key, df_key in self.master_column_mapping.items():
+            if gulls_key in row.columns:
+                dic[df_key] = row[gulls_key].values[0]
+            else:
+                raise KeyError(f"Key '{gulls_key}' not found in master file for {data_file.name}")
 
-            # Add the parameters from the master file to the dictionary
-            for gulls_key, df_key in self.master_column_mapping.items():
-                if df_key in row.columns:
-                    dic[df_key] = row[gulls_key].values[0]
-                else:
-                    raise KeyError(f"Key '{gulls_key}' not found in master file for {data_file.name}")
 
-            
-            if add_astrometry:
-                ##################################################################
-                # Here you would add your astrometric processing logic
-                # For now, we just add 4 dummy columns the same length as BJD and
-                # save the DataFrame to the output directory
-                dic["data"]["sigma_x"] = 0
-                dic["data"]["sigma_y"] = 0
-                dic["data"]["sigma_x_err"] = 0
-                dic["data"]["sigma_y_err"] = 0
-                ##################################################################
-
-                # Add the new columns to the header
-                # we are just being explicit to be careful
-                header += ["sigma_x", "sigma_y", "sigma_x_err", "sigma_y_err"]
-                if header != dic["data"].columns.tolist():
-                    raise ValueError("Header does not match DataFrame columns.")
-
-            output_path = self.output_single_lens_dir / data_file.name
-            GullsParser.save_lc_output(dic["data"], output_path, header, comment_text)
-
-    def process_binary_lens(self, add_astrometry=True):
+        if add_astrometry:
+            # Per-epoch centroid precision and a noise realisation
+            self.add_astrometric_noise(dic, "single", key)
+
+            # Add the new columns to the header
+            # we are just being explicit to be careful
+            header += ASTROMETRY_COLUMNS
+            if header != dic["data"].columns.tolist():
+                raise ValueError("Header does not match DataFrame columns.")
+
+        self.write_event(
+            "single", self.output_single_lens_dir, data_file, key, dic["data"], header, lc_header.comment_text
+        )
+
+    def process_binary_lens(self, add_astrometry=True, workers=1):
         """
         Process binary lens data and save the output.
+
+        With workers > 1 the events are spread over a process pool and a failing
+        event is reported instead of aborting the batch (see ``_run_events``).
+
+        Returns:
+            dict: Failed data files mapped to their error messages (parallel mode only).
         """
         # load master file(s) with meta data (.csv, .out)
         self.load_binary_lens_master()
@@ -540,126 +1786,92 @@ class GullsParser:
             raise FileNotFoundError(f"No data files found in: {self.binary_lens_dir}")
 
         # Process each data file
-        for data_file in data_files:
+        return self._run_events("process_binary_lens_file", data_files, add_astrometry=add_astrometry, workers=workers)
 
-            # Strip the file name to get the SubRun, EventID, and Field
-            file_name = data_file.stem
-            parts = file_name.split("_")
-            SubRun = parts[-3]
-            Field = parts[-2]
-            EventID = parts[-1] 
-
-            # get row from master file based on SubRun, Field, and EventID
-            row = self.binary_lens_master[
-                (self.binary_lens_master["SubRun"] == SubRun) &
-                (self.binary_lens_master["Field"] == Field) &
-                (self.binary_lens_master["EventID"] == EventID)
-            ]
+    def process_binary_lens_file(self, data_file, add_astrometry=True, lc=None):
+        """
+        Process one binary lens data file and save the output.
 
-            if row.empty:
-                raise ValueError(f"No matching row found in master file for SubRun: {SubRun}, Field: {Field}, EventID: {EventID}")
+        Requires the binary lens master to be loaded (``load_binary_lens_master``).
+        lc is the ``read_event`` result for data_file when it was read ahead.
+        """
+        # Strip the file name to get the SubRun, Field, and EventID
+        key = GullsParser.parse_event_key(data_file)
 
-            # Load the data file
-            df, comment_text, header = GullsParser.load_lc_file(data_file)
+        # get row from master file based on SubRun, Field, and EventID
+        row = GullsParser.get_master_row(self.binary_lens_master, self.binary_lens_master_index, key)
 
-            dic = {
-                "row": row,
-                "data": df,
-                "BJD": df["BJD"].to_numpy(),
-                "obs": df["observatory_code"].to_numpy()
-            }
+        # Load the data file
+        df, lc_header, header = lc if lc is not None else self.read_event(data_file)
 
-            # Extract parameters from comment text
-            for line in comment_text.splitlines():
-                if "Obslensmag" in line:
-                    parts = line.split()
-                    dic["FL_0"] = float(parts[1])
-                    dic["FL_1"] = float(parts[2])
-                    dic["FL_2"] = float(parts[3])
-                    dic["FL"] = [float(f) for f in parts[1:]]
-                elif "fs" in line:
-                    parts = line.split()
-                    dic["FS_0"] = float(parts[1])
-                    dic["FS_1"] = float(parts[2])
-                    dic["FS_2"] = float(parts[3])
-                    dic["fs"] = [float(f) for f in parts[1:]]
-                elif "Obssrcmag" in line:
-                    parts = line.split()
-                    dic["ms_0"] = float(parts[1])
-                    dic["ms_1"] = float(parts[2])
-                    dic["ms_2"] = float(parts[3])
-                    dic["ms"] = [float(m) for m in parts[1:]]
-
-            # Calculate magnitudes and their errors
-            dic["true_mag"], dic["true_mag_err"] = GullsParser.get_magnitudes(
-                df["true_relative_flux"].to_numpy(),
-                df["fs"].to_numpy(),
-                df["ms"].to_numpy(),
-                df["observatory_code"].to_numpy()
-            )
-            dic["mag"], dic["mag_err"] = GullsParser.get_magnitudes(
-                df["measured_relative_flux"].to_numpy(),
-                df["fs"].to_numpy(),
-                df["ms"].to_numpy(),
-                df["observatory_code"].to_numpy()
-            )
+        dic = {
+            "row": row,
+            "data": df,
+            "BJD": df["BJD"].to_numpy(),
+            "obs": df["observatory_code"].to_numpy()
+        }
 
-            # look up the zero points for the flux calculation
-            elements = self.filters
-            if not len(elements) == len(df["observatory_code"].unique()):
-                raise ValueError("Number of elements does not match the number of unique observatory codes.\n"
-                                 "You can change the observatory codes using the 'filters' attribute.\n"
-                                 "Currently, the filters are: " + ", ".join(self.filters) + " and the unique "
-                                 "observatory codes are: " + ", ".join(df["observatory_code"].unique()))
-            zp = GullsParser.get_zeropoint(elements)
-
-            # Calculate the fluxes
-            dic["true_F"], dic["true_F_err"] = GullsParser.get_fluxes(
-                dic["true_mag"],
-                zp
-            )
-            dic["F"], dic["F_err"] = GullsParser.get_fluxes(
-                dic["mag"],
-                zp
-            )
+        # Photometric parameters from the comment header
+        dic.update(GullsParser.header_parameters(lc_header))
+
+        # look up the zero points for the flux calculation
+        elements = self.filters
+        if not len(elements) == len(df["observatory_code"].unique()):
+            raise ValueError("Number of elements does not match the number of unique observatory codes.\n"
+                             "You can change the observatory codes using the 'filters' attribute.\n"
+                             "Currently, the filters are: " + ", ".join(self.filters) + " and the unique "
+                             "observatory codes are: " + ", ".join(map(str, df["observatory_code"].unique())))
+        zp = GullsParser.get_zeropoint(elements)
+
+        # Calculate magnitudes, fluxes and their errors
+        dic.update(GullsParser.photometry(
+            dic["obs"],
+            df["true_relative_flux"].to_numpy(),
+            df["true_relative_flux_error"].to_numpy(),
+            df["measured_relative_flux"].to_numpy(),
+            df["measured_relative_flux_error"].to_numpy(),
+            dic["fs"],
+            dic["ms"],
+            zp,
+        ))
+
+        # Add the parameters from the master file to the dictionary
+        for gulls_key, df_key in self.master_column_mapping.items():
+            if gulls_key in row.columns:
+                dic[df_key] = row[gulls_key].values[0]
+            else:
+                raise KeyError(f"Key '{gulls_key}' not found in master file for {data_file.name}")
+        # Add additional columns for binary lens systems
+        for gulls_key, df_key in self.additional_master_columns_for_2L.items():
+            if gulls_key in row.columns:
+                dic[df_key] = row[gulls_key].values[0]
+            else:
+                raise KeyError(f"Key '{gulls_key}' not found in master file for {data_file.name}")
 
-            # Add the parameters from the master file to the dictionary
-            for gulls_key, df_key in self.master_column_mapping.items():
-                if df_key in row.columns:
-                    dic[df_key] = row[gulls_key].values[0]
-                else:
-                    raise KeyError(f"Key '{gulls_key}' not found in master file for {data_file.name}")
-            # Add additional columns for binary lens systems
-            for gulls_key, df_key in self.additional_master_columns_for_2L.items():
-                if df_key in row.columns:
-                    dic[df_key] = row[gulls_key].values[0]
-                else:
-                    raise KeyError(f"Key '{gulls_key}' not found in master file for {data_file.name}")
-                
-            if add_astrometry:
-                ##################################################################
-                # Here you would add your astrometric processing logic
-                # For now, we just add 4 dummy columns the same length as BJD and
-                # save the DataFrame to the output directory
-                dic["data"]["sigma_x"] = 0
-                dic["data"]["sigma_y"] = 0
-                dic["data"]["sigma_x_err"] = 0
-                dic["data"]["sigma_y_err"] = 0
-                ##################################################################
-
-                # Add the new columns to the header
-                # we are just being explicit to be careful
-                header += ["sigma_x", "sigma_y", "sigma_x_err", "sigma_y_err"]
-                if header != dic["data"].columns.tolist():
-                    raise ValueError("Header does not match DataFrame columns.")
-
-            # Save the processed DataFrame to the output directory
-            output_path = self.output_binary_lens_dir / data_file.name
-            GullsParser.save_lc_output(dic["data"], output_path, header, comment_text)
-
-    def process_triple_lens_astrometry(self, add_astrometry=True):
+        if add_astrometry:
+            # Per-epoch centroid precision and a noise realisation
+            self.add_astrometric_noise(dic, "binary", key)
+
+            # Add the new columns to the header
+            # we are just being explicit to be careful
+            header += ASTROMETRY_COLUMNS
+            if header != dic["data"].columns.tolist():
+                raise ValueError("Header does not match DataFrame columns.")
+
+        # Save the processed DataFrame to the output directory
+        self.write_event(
+            "binary", self.output_binary_lens_dir, data_file, key, dic["data"], header, lc_header.comment_text
+        )
+
+    def process_triple_lens_astrometry(self, add_astrometry=True, workers=1):
         """
         Process triple lens data and save the output.
+
+        With workers > 1 the events are spread over a process pool and a failing
+        event is reported instead of aborting the batch (see ``_run_events``).
+
+        Returns:
+            dict: Failed data files mapped to their error messages (parallel mode only).
         """
         # load master file(s) with meta data (.csv, .out)
         self.load_triple_lens_master()
@@ -670,141 +1882,274 @@ class GullsParser:
             raise FileNotFoundError(f"No data files found in: {self.triple_lens_dir}")
 
         # Process each data file
-        for data_file in data_files:
+        return self._run_events("process_triple_lens_file", data_files, add_astrometry=add_astrometry, workers=workers)
 
-            # Strip the file name to get the SubRun, EventID, and Field
-            file_name = data_file.stem
-            parts = file_name.split("_")
-            SubRun = parts[-3]
-            Field = parts[-2]
-            EventID = parts[-1] 
-
-            # get row from master file based on SubRun, Field, and EventID
-            row = self.triple_lens_master[
-                (self.triple_lens_master["SubRun"] == SubRun) &
-                (self.triple_lens_master["Field"] == Field) &
-                (self.triple_lens_master["EventID"] == EventID)
-            ]
+    def process_triple_lens_file(self, data_file, add_astrometry=True, lc=None):
+        """
+        Process one triple lens data file and save the output.
 
-            if row.empty:
-                raise ValueError(f"No matching row found in master file for SubRun: {SubRun}, Field: {Field}, EventID: {EventID}")
+        Requires the triple lens master to be loaded (``load_triple_lens_master``).
+        lc is the ``read_event`` result for data_file when it was read ahead.
+        """
+        # Strip the file name to get the SubRun, Field, and EventID
+        key = GullsParser.parse_event_key(data_file)
 
-            # Load the data file
-            df, comment_text, header = GullsParser.load_lc_file(data_file)
+        # get row from master file based on SubRun, Field, and EventID
+        row = GullsParser.get_master_row(self.triple_lens_master, self.triple_lens_master_index, key)
 
-            dic = {
-                "row": row,
-                "data": df,
-                "BJD": df["BJD"].to_numpy(),
-                "obs": df["observatory_code"].to_numpy()
-            }
+        # Load the data file
+        df, lc_header, header = lc if lc is not None else self.read_event(data_file)
 
-            # Extract parameters from comment text
-            for line in comment_text.splitlines():
-                if "Obslensmag" in line:
-                    parts = line.split()
-                    dic["FL_0"] = float(parts[1])
-                    dic["FL_1"] = float(parts[2])
-                    dic["FL_2"] = float(parts[3])
-                    dic["FL"] = [float(f) for f in parts[1:]]
-                elif "fs" in line:
-                    parts = line.split()
-                    dic["FS_0"] = float(parts[1])
-                    dic["FS_1"] = float(parts[2])
-                    dic["FS_2"] = float(parts[3])
-                    dic["fs"] = [float(f) for f in parts[1:]]
-                elif "Obssrcmag" in line:
-                    parts = line.split()
-                    dic["ms_0"] = float(parts[1])
-                    dic["ms_1"] = float(parts[2])
-                    dic["ms_2"] = float(parts[3])
-                    dic["ms"] = [float(m) for m in parts[1:]]
-
-            # Calculate magnitudes and their errors
-            dic["true_mag"], dic["true_mag_err"] = GullsParser.get_magnitudes(
-                df["true_relative_flux"].to_numpy(),
-                df["true_relative_flux_error"].to_numpy()
-            )
-            dic["mag"], dic["mag_err"] = GullsParser.get_magnitudes(
-                df["measured_relative_flux"].to_numpy(),
-                df["measured_relative_flux_error"].to_numpy()
-            )
+        dic = {
+            "row": row,
+            "data": df,
+            "BJD": df["BJD"].to_numpy(),
+            "obs": df["observatory_code"].to_numpy()
+        }
 
-            # look up the zero points for the flux calculation
-            elements = self.filters
-            if not len(elements) == len(df["observatory_code"].unique()):
-                raise ValueError("Number of elements does not match the number of unique observatory codes.\n"
-                                 "You can change the observatory codes using the 'filters' attribute.\n"
-                                 "Currently, the filters are: " + ", ".join(self.filters) + " and the unique "
-                                 "observatory codes are: " + ", ".join(df["observatory_code"].unique()))
-            zp = GullsParser.get_zeropoint(elements)
-
-            # Calculate the fluxes
-            dic["true_F"], dic["true_F_err"] = GullsParser.get_fluxes(
-                dic["true_mag"],
-                dic["true_mag_err"],
-                df["observatory_code"].to_numpy(),
-                zp
-            )
-            dic["F"], dic["F_err"] = GullsParser.get_fluxes(
-                dic["mag"],
-                dic["mag_err"],
-                df["observatory_code"].to_numpy(),
-                zp
-            )
+        # Photometric parameters from the comment header
+        dic.update(GullsParser.header_parameters(lc_header))
+
+        # look up the zero points for the flux calculation
+        elements = self.filters
+        if not len(elements) == len(df["observatory_code"].unique()):
+            raise ValueError("Number of elements does not match the number of unique observatory codes.\n"
+                             "You can change the observatory codes using the 'filters' attribute.\n"
+                             "Currently, the filters are: " + ", ".join(self.filters) + " and the unique "
+                             "observatory codes are: " + ", ".join(map(str, df["observatory_code"].unique())))
+        zp = GullsParser.get_zeropoint(elements)
+
+        # Calculate magnitudes, fluxes and their errors
+        dic.update(GullsParser.photometry(
+            dic["obs"],
+            df["true_relative_flux"].to_numpy(),
+            df["true_relative_flux_error"].to_numpy(),
+            df["measured_relative_flux"].to_numpy(),
+            df["measured_relative_flux_error"].to_numpy(),
+            dic["fs"],
+            dic["ms"],
+            zp,
+        ))
+
+        # Add the parameters from the master file to the dictionary
+        for gulls_key, df_key in self.master_column_mapping.items():
+            if gulls_key in row.columns:
+                dic[df_key] = row[gulls_key].values[0]
+            else:
+                raise KeyError(f"Key '{gulls_key}' not found in master file for {data_file.name}")
+        # Add additional columns for binary lens systems
+        for gulls_key, df_key in self.additional_master_columns_for_2L.items():
+            if gulls_key in row.columns:
+                dic[df_key] = row[gulls_key].values[0]
+            else:
+                raise KeyError(f"Key '{gulls_key}' not found in master file for {data_file.name}")
+        # Add additional columns for triple lens systems
+        for gulls_key, df_key in self.additional_master_columns_for_3L.items():
+            if gulls_key in row.columns:
+                dic[df_key] = row[gulls_key].values[0]
+            else:
+                raise KeyError(f"Key '{gulls_key}' not found in master file for {data_file.name}")
 
-            # Add the parameters from the master file to the dictionary
-            for gulls_key, df_key in self.master_column_mapping.items():
-                if df_key in row.columns:
-                    dic[df_key] = row[gulls_key].values[0]
-                else:
-                    raise KeyError(f"Key '{gulls_key}' not found in master file for {data_file.name}")
-            # Add additional columns for binary lens systems
-            for gulls_key, df_key in self.additional_master_columns_for_2L.items():
-                if df_key in row.columns:
-                    dic[df_key] = row[gulls_key].values[0]
-                else:
-                    raise KeyError(f"Key '{gulls_key}' not found in master file for {data_file.name}")
-            # Add additional columns for triple lens systems
-            for gulls_key, df_key in self.additional_master_columns_for_3L.items():
-                if df_key in row.columns:
-                    dic[df_key] = row[gulls_key].values[0]
+        if add_astrometry:
+            # Per-epoch centroid precision and a noise realisation
+            self.add_astrometric_noise(dic, "triple", key)
+
+            # Add the new columns to the header
+            # we are just being explicit to be careful
+            header += ASTROMETRY_COLUMNS
+            if header != dic["data"].columns.tolist():
+                raise ValueError("Header does not match DataFrame columns.")
+
+        # Save the processed DataFrame to the output directory
+        self.write_event(
+            "triple", self.output_triple_lens_dir, data_file, key, dic["data"], header, lc_header.comment_text
+        )
+
+    def _run_events(self, method_name, data_files, add_astrometry=True, workers=1):
+        """
+        Run a per-event processing method over a list of data files.
+
+        With workers <= 1 the files are processed serially and the first error
+        is raised; with ``prefetch`` > 0 the reads and writes of that serial run
+        overlap the computation (see ``_run_pipelined``). Otherwise they are spread over a process pool: the parser
+        (including the loaded master and its index) is handed to each worker
+        once, by fork inheritance where available or the pool initializer
+        otherwise, so only the file path is sent per task. Failing events are
+        reported and collected instead of aborting the batch. With the "hdf5"
+        output format the workers return their results and the parent appends
+        them to the run's EventStore as they arrive.
+
+        With ``resume`` the events already finished under the same configuration
+        are skipped (``pending_events``) and each finished event is added to
+        the run manifest; in the pool the parent records them as the results
+        arrive.
+
+        Args:
+            method_name (str): Name of the per-event method, e.g. "process_single_lens_file".
+            data_files (list): Data files to process.
+            add_astrometry (bool): Passed through to the per-event method.
+            workers (int): Number of worker processes.
+        Returns:
+            dict: Failed data files mapped to their error messages.
+        """
+        if self.manifest is not None:
+            self.run_config = self.config_hash(add_astrometry, lens=EVENT_METHODS[method_name])
+            data_files = self.pending_events(method_name, data_files, self.run_config)
+            if not data_files:
+                return {}
+
+        if workers is None or workers <= 1:
+            with self._event_store_session():
+                if self.prefetch > 0:
+                    self._run_pipelined(method_name, data_files, add_astrometry=add_astrometry)
                 else:
-                    raise KeyError(f"Key '{gulls_key}' not found in master file for {data_file.name}")
-            
-            if add_astrometry:
-                ##################################################################
-                # Here you would add your astrometric processing logic
-                # For now, we just add 4 dummy columns the same length as BJD and
-                # save the DataFrame to the output directory
-                dic["data"]["sigma_x"] = 0
-                dic["data"]["sigma_y"] = 0
-                dic["data"]["sigma_x_err"] = 0
-                dic["data"]["sigma_y_err"] = 0
-                ##################################################################
-
-                # Add the new columns to the header
-                # we are just being explicit to be careful
-                header += ["sigma_x", "sigma_y", "sigma_x_err", "sigma_y_err"]
-                if header != dic["data"].columns.tolist():
-                    raise ValueError("Header does not match DataFrame columns.")
-            
-            # Save the processed DataFrame to the output directory
-            output_path = self.output_triple_lens_dir / data_file.name
-            GullsParser.save_lc_output(dic["data"], output_path, header, comment_text)
+                    for data_file in data_files:
+                        getattr(self, method_name)(data_file, add_astrometry=add_astrometry)
+            return {}
+
+        global _WORKER_PARSER
+        if "fork" in multiprocessing.get_all_start_methods():
+            # workers inherit the parser copy-on-write, nothing is pickled
+            _WORKER_PARSER = self
+            pool_kwargs = {"mp_context": multiprocessing.get_context("fork")}
+        else:
+            pool_kwargs = {"initializer": _init_worker, "initargs": (self,)}
+
+        failures = {}
+        chunksize = max(1, len(data_files) // (workers * 4))
+        try:
+            with ProcessPoolExecutor(max_workers=workers, **pool_kwargs) as executor:
+                results = executor.map(
+                    _run_event,
+                    [method_name] * len(data_files),
+                    data_files,
+                    [add_astrometry] * len(data_files),
+                    chunksize=chunksize,
+                )
+                # opened after the workers are started so they never inherit the HDF5 handle
+                with self._event_store_session():
+                    for data_file, error, events in results:
+                        if error is not None:
+                            print(f"Failed to process {data_file}: {error}")
+                            failures[data_file] = error
+                        for lens, key, df, header, comment_text, source in events:
+                            self.event_store.append(lens, key, df, header, comment_text, source=source)
+                            self.record_event(source, EventStore.group_name(lens, key), n_rows=len(df))
+                        if error is None and self.output_format != "hdf5":
+                            self.record_event(data_file, self.event_output(EVENT_METHODS[method_name], data_file))
+        finally:
+            _WORKER_PARSER = None
+
+        if failures:
+            print(f"{len(failures)} of {len(data_files)} events failed.")
+        return failures
+
+    def _run_pipelined(self, method_name, data_files, add_astrometry=True):
+        """
+        Serial run with reading and writing moved off the compute thread.
 
-    def process_all_astrometry(self, single=False, binary=False, triple=False, add_astrometry=True):
+        A pool of ``prefetch`` reader threads keeps up to ``prefetch`` light
+        curves loaded ahead of the event being computed, and ``write_event``
+        hands results to a single writer thread through a queue of the same
+        depth, so at most about 2 * prefetch + 1 events are held in memory.
+        Events are computed and written in input order, so the outputs are
+        the same as those of the plain serial loop. The first error, from any
+        stage, is raised once the writes queued before it have finished.
+
+        Args:
+            method_name (str): Name of the per-event method, e.g. "process_single_lens_file".
+            data_files (list): Data files to process.
+            add_astrometry (bool): Passed through to the per-event method.
+        """
+        method = getattr(self, method_name)
+        write_queue = queue.Queue(maxsize=self.prefetch)
+        write_errors = []
+
+        def writer():
+            while True:
+                item = write_queue.get()
+                if item is None:
+                    return
+                if write_errors:
+                    continue  # keep draining so the compute thread never blocks
+                try:
+                    self.save_event(*item)
+                except Exception as e:
+                    write_errors.append(e)
+
+        writer_thread = threading.Thread(target=writer, name="gulls-writer", daemon=True)
+        writer_thread.start()
+        self.write_queue = write_queue
+        try:
+            with ThreadPoolExecutor(max_workers=self.prefetch, thread_name_prefix="gulls-reader") as readers:
+                files = iter(data_files)
+                pending = collections.deque(
+                    (data_file, readers.submit(self.read_event, data_file))
+                    for data_file in itertools.islice(files, self.prefetch)
+                )
+                while pending:
+                    data_file, future = pending.popleft()
+                    for next_file in itertools.islice(files, 1):
+                        pending.append((next_file, readers.submit(self.read_event, next_file)))
+                    method(data_file, add_astrometry=add_astrometry, lc=future.result())
+                    if write_errors:
+                        break
+        finally:
+            self.write_queue = None
+            write_queue.put(None)
+            writer_thread.join()
+        if write_errors:
+            raise write_errors[0]
+
+    def process_all_astrometry(self, single=False, binary=False, triple=False, add_astrometry=True, workers=1):
         """
         Process all lens types: single, binary, and triple.
+
+        Returns:
+            dict: Failed data files mapped to their error messages (parallel mode only).
         """
+        failures = {}
         if single:
-            self.process_single_lens(add_astrometry=add_astrometry)
+            failures.update(self.process_single_lens(add_astrometry=add_astrometry, workers=workers))
         if binary:
-            self.process_binary_lens(add_astrometry=add_astrometry)
+            failures.update(self.process_binary_lens(add_astrometry=add_astrometry, workers=workers))
         if triple:
-            self.process_triple_lens(add_astrometry=add_astrometry)
+            failures.update(self.process_triple_lens_astrometry(add_astrometry=add_astrometry, workers=workers))
+        return failures
 
-if __name__ == "__main__":
+
+# parser used by the worker processes of GullsParser._run_events
+_WORKER_PARSER = None
+
+
+def _init_worker(parser):
+    """
+    Pool initializer for platforms without fork: receive the parser once per worker.
+    """
+    global _WORKER_PARSER
+    _WORKER_PARSER = parser
+
+
+def _run_event(method_name, data_file, add_astrometry):
+    """
+    Process one event in a worker.
+
+    Returns (data_file, error message or None, events), where events holds the
+    results destined for the parent's EventStore (hdf5 output only).
+    """
+    _WORKER_PARSER.deferred_events = [] if _WORKER_PARSER.output_format == "hdf5" else None
+    _WORKER_PARSER.manifest = None  # the parent records finished events
+    try:
+        getattr(_WORKER_PARSER, method_name)(data_file, add_astrometry=add_astrometry)
+    except Exception as e:
+        return data_file, f"{type(e).__name__}: {e}", []
+    return data_file, None, _WORKER_PARSER.deferred_events or []
+
+
+def main(argv=None):
+    """
+    Command line entry point, also run by ``python -m gulls_parser``.
+    """
     import argparse
 
     parser = argparse.ArgumentParser(description="Process GULLS light curve data.")
@@ -814,11 +2159,31 @@ if __name__ == "__main__":
     parser.add_argument("--binary", action="store_true", help="Process binary lens systems.")
     parser.add_argument("--triple", action="store_true", help="Process triple lens systems.")
     parser.add_argument("--add_astrometry", action="store_true", help="Add simulatedastrometric data.")
-
-    args = parser.parse_args()
+    parser.add_argument("--output_format", type=str, default="text", choices=list(OUTPUT_FORMATS), help="Output file format.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes (1 = serial).")
+    parser.add_argument("--lc_cache_dir", type=str, default=None, help="Directory for the parsed light curve cache.")
+    parser.add_argument("--all_master_columns", action="store_true", help="Load every master column, not just the mapped ones.")
+    parser.add_argument("--master_chunksize", type=int, default=None, help="Stream master files in chunks of this many rows.")
+    parser.add_argument("--prefetch", type=int, default=0, help="Light curves read ahead and results queued for writing (serial runs).")
+    parser.add_argument("--noise_seed", type=int, default=0, help="Seed of the per-event astrometric noise.")
+    parser.add_argument("--astrometric_floor", type=float, default=0.0, help="Astrometric systematic floor in mas.")
+    parser.add_argument("--resume", action="store_true", help="Skip events finished by an earlier run (see output_dir/manifest.jsonl).")
+
+    args = parser.parse_args(argv)
 
     # Create the parser instance
-    parser = GullsParser(input_dir=args.input_dir, output_dir=args.output_dir)
+    parser = GullsParser(
+        input_dir=args.input_dir,
+        output_dir=args.output_dir,
+        output_format=args.output_format,
+        lc_cache_dir=args.lc_cache_dir,
+        load_all_master_columns=args.all_master_columns,
+        master_chunksize=args.master_chunksize,
+        prefetch=args.prefetch,
+        resume=args.resume,
+        noise_seed=args.noise_seed,
+        astrometric_floor=args.astrometric_floor,
+    )
 
     # Process all, if none are specified
     if not args.single and not args.binary and not args.triple: 
@@ -831,5 +2196,10 @@ if __name__ == "__main__":
         single=args.single, 
         binary=args.binary, 
         triple=args.triple, 
-        add_astrometry=args.add_astrometry
-    )
\ No newline at end of file
+        add_astrometry=args.add_astrometry,
+        workers=args.workers
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,663 @@
+"""
+Tests for the Astrometry module.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
+
+import pytest
+import numpy as np
+import pandas as pd
+
+pytest.importorskip("GCMicrolensing")
+
+from src.astrometry import Astrometry, CentroidCache
+
+
+def brute_force_shift(u, rho, n=600, gamma=0.0):
+    """Centroid shift of a (limb-darkened) disk by direct 2-D quadrature over the source."""
+    x, w = np.polynomial.legendre.leggauss(n)
+    r = (x + 1) / 2 * rho
+    phi = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    R, P = np.meshgrid(r, phi, indexing='ij')
+    X = u + R * np.cos(P)
+    U = np.hypot(X, R * np.sin(P))
+    A = (U * U + 2) / (U * np.sqrt(U * U + 4))
+    brightness = 1 - gamma * (1 - 1.5 * np.sqrt(1 - (r / rho) ** 2))
+    weights = (w / 2 * rho * r * brightness)[:, None]
+    return np.sum(A * (U * U + 3) / (U * U + 2) * X * weights) / np.sum(A * weights) - u
+
+
+class TestPointLensShift:
+    """Test the point lens centroid shift kernel."""
+
+    def test_point_source_limit(self):
+        """Test that rho = 0 and u >> rho give u / (u**2 + 2)."""
+        u = np.array([0.0, 0.1, 1.0, 5.0])
+        expected = u / (u * u + 2)
+
+        np.testing.assert_allclose(Astrometry.point_lens_shift(u, 0.0), expected)
+        np.testing.assert_allclose(Astrometry.point_lens_shift(u[1:], 1e-4), expected[1:], rtol=1e-6)
+
+    @pytest.mark.parametrize("u, rho", [(0.3, 0.1), (0.15, 0.1), (2.0, 0.1), (1.0, 0.9), (0.5, 0.01)])
+    def test_matches_direct_quadrature(self, u, rho):
+        """Test the annulus integral against a 2-D integration over the source disk."""
+        np.testing.assert_allclose(Astrometry.point_lens_shift(u, rho), brute_force_shift(u, rho), rtol=5e-6, atol=1e-10)
+
+    def test_lens_inside_source(self):
+        """Test that the shift vanishes at u = 0 and stays small inside the disk."""
+        shift = Astrometry.point_lens_shift(np.array([0.0, 0.05, 0.099]), 0.1)
+
+        assert shift[0] == 0.0
+        assert np.all(np.abs(shift) < 0.05 / (0.05 ** 2 + 2))
+
+    def test_matches_vbmicrolensing(self):
+        """Test against the VBMicrolensing ESPL centroid that OneL1S wraps."""
+        VBMicrolensing = pytest.importorskip("VBMicrolensing")
+        vbm = VBMicrolensing.VBMicrolensing()
+        vbm.astrometry = True
+        vbm.RelTol = 1e-3
+        vbm.Tol = 1e-3
+
+        rng = np.random.default_rng(3)
+        rho = 10 ** rng.uniform(-3, 0, 300)
+        u = rho * 10 ** rng.uniform(-2, 1.5, 300)
+        expected = []
+        for ui, rhoi in zip(u, rho):
+            vbm.ESPLMag2(ui, rhoi)
+            expected.append(vbm.astrox1 - ui)
+
+        np.testing.assert_allclose(Astrometry.point_lens_shift(u, rho), expected, atol=2e-3)
+
+
+class TestCentroidShift1LBatch:
+    """Test the vectorised 1L1S batch engine."""
+
+    @pytest.fixture
+    def events(self):
+        rng = np.random.default_rng(7)
+        n = 5
+        return {
+            "t0": rng.uniform(10, 20, n),
+            "tE": rng.uniform(5, 30, n),
+            "u0": rng.uniform(-0.3, 0.3, n),
+            "rho": 10 ** rng.uniform(-3, -1, n),
+        }
+
+    def test_matches_per_event_kernel(self, events):
+        """Test each event against the kernel evaluated along its own trajectory."""
+        times = np.tile(np.linspace(0, 30, 200), (5, 1))
+
+        dx, dy = Astrometry.centroid_shift_1l_batch(times=times, **events)
+
+        assert dx.shape == dy.shape == times.shape
+        for i in range(5):
+            tau = (times[i] - events["t0"][i]) / events["tE"][i]
+            u = np.hypot(tau, events["u0"][i])
+            shift = Astrometry.point_lens_shift(u, events["rho"][i])
+            np.testing.assert_allclose(dx[i], shift * tau / u)
+            np.testing.assert_allclose(dy[i], shift * events["u0"][i] / u)
+
+    def test_ragged_grids(self, events):
+        """Test that ragged time grids give the same values as a rectangular grid."""
+        times = np.tile(np.linspace(0, 30, 100), (5, 1))
+        dx, dy = Astrometry.centroid_shift_1l_batch(times=times, **events)
+
+        ragged = [times[i, : 20 * (i + 1)] for i in range(5)]
+        dx_r, dy_r = Astrometry.centroid_shift_1l_batch(times=ragged, chunk_size=37, **events)
+
+        assert [len(d) for d in dx_r] == [20, 40, 60, 80, 100]
+        for i in range(5):
+            np.testing.assert_allclose(dx_r[i], dx[i, : 20 * (i + 1)])
+            np.testing.assert_allclose(dy_r[i], dy[i, : 20 * (i + 1)])
+
+    def test_parallax(self, events):
+        """Test the parallax trajectory offsets and the required Sun offsets."""
+        times = np.tile(np.linspace(0, 30, 50), (5, 1))
+        zero = np.zeros_like(times)
+        piEN = np.full(5, 0.2)
+        piEE = np.full(5, -0.1)
+
+        no_parallax = Astrometry.centroid_shift_1l_batch(times=times, **events)
+        static = Astrometry.centroid_shift_1l_batch(times=times, piEN=piEN, piEE=piEE, q_n=zero, q_e=zero, **events)
+        np.testing.assert_allclose(static, no_parallax)
+
+        q_n = np.full_like(times, 0.5)
+        q_e = np.full_like(times, 0.25)
+        tau, beta = Astrometry.trajectory_1l(0.0, 1.0, 0.1, np.array([1.0]), piEN=0.2, piEE=-0.1, q_n=0.5, q_e=0.25)
+        np.testing.assert_allclose([tau[0], beta[0]], [1.0 + 0.1 - 0.025, 0.1 - 0.05 - 0.05])
+        moved = Astrometry.centroid_shift_1l_batch(times=times, piEN=piEN, piEE=piEE, q_n=q_n, q_e=q_e, **events)
+        assert not np.allclose(moved, no_parallax)
+
+        with pytest.raises(ValueError, match="q_n and q_e"):
+            Astrometry.centroid_shift_1l_batch(times=times, piEN=piEN, **events)
+
+    def test_length_mismatch(self, events):
+        """Test that mismatched parameters and grids raise."""
+        with pytest.raises(ValueError, match="Expected 5 time grids"):
+            Astrometry.centroid_shift_1l_batch(times=np.zeros((4, 10)), **events)
+        events["rho"] = events["rho"][:3]
+        with pytest.raises(ValueError, match="same length"):
+            Astrometry.centroid_shift_1l_batch(times=np.zeros((5, 10)), **events)
+
+
+@pytest.fixture(scope="module")
+def cache_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("fs_table")
+
+
+@pytest.fixture(scope="module")
+def table(cache_dir):
+    """Finite-source lookup table, built once for the module (a few seconds)."""
+    return Astrometry.finite_source_table(cache_dir)
+
+
+class TestFiniteSourceTable:
+    """Test the limb-darkened finite-source kernel and its lookup table."""
+
+    @pytest.mark.parametrize("u, rho, gamma", [(0.3, 0.1, 0.5), (0.15, 0.1, 0.8), (0.12, 0.1, 0.3), (2.0, 0.1, 1.0)])
+    def test_limb_darkened_matches_direct_quadrature(self, u, rho, gamma):
+        """Test the disk-stack integral against a 2-D integration over the source."""
+        np.testing.assert_allclose(
+            Astrometry.limb_darkened_shift(u, rho, gamma), brute_force_shift(u, rho, gamma=gamma), rtol=2e-5, atol=1e-9
+        )
+
+    def test_limb_darkened_uniform_limit(self):
+        """Test that gamma = 0 reduces to the uniform disk kernel."""
+        u = np.array([0.0, 0.005, 0.01, 0.03, 0.5])
+
+        np.testing.assert_allclose(Astrometry.limb_darkened_shift(u, 0.01, 0.0), Astrometry.point_lens_shift(u, 0.01),
+                                   rtol=1e-8, atol=1e-15)
+
+    def test_table_is_cached_and_memory_mapped(self, cache_dir, table):
+        """Test that the table is written once and shared by later calls."""
+        assert isinstance(table, np.memmap) and not table.flags.writeable
+        assert [p.name for p in cache_dir.iterdir()] == ["fs_1l_table_v1.npy"]
+        assert Astrometry.finite_source_table(cache_dir) is table
+
+    def test_table_build_is_announced(self, tmp_path, capsys):
+        """Test that building a table prints where it is written, and loading does not."""
+        with patch.dict("src.astrometry.astrometry._FS_TABLES"):
+            with patch.object(Astrometry, "build_finite_source_table", return_value=np.zeros((3, 2))):
+                Astrometry.finite_source_table(tmp_path)
+            assert str(tmp_path / "fs_1l_table_v1.npy") in capsys.readouterr().out
+
+        with patch.dict("src.astrometry.astrometry._FS_TABLES"):
+            Astrometry.finite_source_table(tmp_path)
+            assert capsys.readouterr().out == ""
+
+    @pytest.mark.parametrize("rho", [1e-3, 0.03])
+    @pytest.mark.parametrize("gamma", [0.0, 0.6])
+    def test_table_accuracy(self, table, rho, gamma):
+        """Test the documented 1e-4 rho accuracy against direct integration."""
+        rng = np.random.default_rng(11)
+        u = rho * np.concatenate([rng.uniform(0, 25, 400), rng.uniform(0.95, 1.05, 200), [0.0]])
+
+        fast = Astrometry.finite_source_shift(u, rho, gamma, table=table)
+
+        np.testing.assert_allclose(fast, Astrometry.limb_darkened_shift(u, rho, gamma), rtol=0, atol=1e-4 * rho)
+        assert fast[-1] == 0.0
+        np.testing.assert_array_equal(Astrometry.finite_source_shift(u, 0.0, gamma, table=table), u / (u * u + 2))
+
+    def test_centroid_shift_1l_fast(self, cache_dir, table):
+        """Test the fast single-event mode against the batch engine."""
+        data = {"t0": 10.0, "tE": 5.0, "u0": 0.02, "rho": 0.03, "LDgamma": 0.4, "BJD": np.linspace(0, 20, 300)}
+
+        model, system, dx, dy = Astrometry.centroid_shift_1l(data, fast=True, cache_dir=cache_dir)
+        bdx, bdy = Astrometry.centroid_shift_1l_batch(
+            [10.0], [5.0], [0.02], [0.03], data["BJD"][None, :], gamma=[0.4]
+        )
+
+        assert model is None and system is None
+        np.testing.assert_allclose(dx, bdx[0], rtol=0, atol=3e-6)
+        np.testing.assert_allclose(dy, bdy[0], rtol=0, atol=3e-6)
+        fdx, _ = Astrometry.centroid_shift_1l_batch(
+            [10.0], [5.0], [0.02], [0.03], data["BJD"][None, :], gamma=[0.4], fast=True, cache_dir=cache_dir
+        )
+        np.testing.assert_array_equal(fdx[0], dx)
+
+        with pytest.raises(ValueError, match="time grid"):
+            Astrometry.centroid_shift_1l({k: v for k, v in data.items() if k != "BJD"}, fast=True)
+
+
+class TestAdaptiveSampling:
+    """Test adaptive time-grid sampling of the 2L/3L centroid solvers."""
+
+    @staticmethod
+    def counting_solver(calls):
+        """Smooth drift plus a narrow feature at t = 61.3, counting the solved epochs."""
+        def solve(t):
+            calls.append(len(t))
+            bump = 0.05 / (1 + ((t - 61.3) / 0.2) ** 2)
+            return 0.01 * np.sin(t / 15) + bump, 0.002 * t / 100, 1 + 20 * bump
+        return solve
+
+    def test_interpolation_error_and_savings(self):
+        """Test that the interpolated shift meets the tolerance with far fewer solves."""
+        times = np.linspace(0, 100, 8000)
+        calls = []
+        solve = self.counting_solver(calls)
+
+        dx, dy, solved = Astrometry.adaptive_sample(solve, times, tol=1e-5, max_step=5.0)
+
+        expected_x, expected_y, _ = solve(times)
+        assert sum(calls[:-1]) == len(solved) < len(times) / 10
+        np.testing.assert_array_equal(np.unique(solved), solved)
+        np.testing.assert_allclose(dx, expected_x, rtol=0, atol=2e-5)
+        np.testing.assert_allclose(dy, expected_y, rtol=0, atol=2e-5)
+        np.testing.assert_array_equal(dx[solved], expected_x[solved])
+        # the solves cluster on the narrow feature
+        assert np.mean(np.abs(times[solved] - 61.3) < 2) > 0.3
+
+    def test_linear_signal_needs_one_level(self):
+        """Test that an exactly linear shift stops after the first midpoint test."""
+        times = np.linspace(0, 10, 101)
+        calls = []
+        dx, _, solved = Astrometry.adaptive_sample(
+            lambda t: (calls.append(len(t)) or 0.1 * t, 0.0 * t, np.ones_like(t)), times, max_step=2.5
+        )
+
+        assert calls == [5, 4]
+        np.testing.assert_allclose(dx, 0.1 * times)
+
+    def test_unsorted_times(self):
+        """Test that shuffled epochs give the same per-epoch result as sorted ones."""
+        times = np.linspace(0, 100, 2000)
+        solve = self.counting_solver([])
+        dx, dy, solved = Astrometry.adaptive_sample(solve, times, tol=1e-5, max_step=5.0)
+
+        order = np.random.default_rng(0).permutation(len(times))
+        shuffled_x, shuffled_y, shuffled_solved = Astrometry.adaptive_sample(solve, times[order], tol=1e-5, max_step=5.0)
+
+        np.testing.assert_array_equal(shuffled_x, dx[order])
+        np.testing.assert_array_equal(shuffled_y, dy[order])
+        np.testing.assert_array_equal(np.sort(order[shuffled_solved]), solved)
+
+    def test_binary_solver_tolerance_below_sampling(self):
+        """Test that the adaptive 2L mode solves at a tolerance below the sampling tolerance."""
+        data = {"t0": 50.0, "tE": 10.0, "u0": 0.1, "rho": 0.005, "q": 0.01, "s": 1.2, "alpha": 40.0,
+                "BJD": np.linspace(40, 60, 100)}
+        with patch.object(Astrometry, "binary_lens_solver", wraps=Astrometry.binary_lens_solver) as solver:
+            Astrometry.centroid_shifts_2l(data, adaptive=True, tol=1e-3)
+
+        assert solver.call_args.kwargs["tol"] < 1e-3
+
+    def test_triple_solver_tolerance_below_sampling(self):
+        """Test that the adaptive 3L mode solves at a tolerance below the sampling tolerance."""
+        data = {"t0": 50.0, "tE": 10.0, "u0": 0.2, "rho": 0.005, "q2": 0.01, "q3": 0.001, "s2": 1.2, "s3": 0.9,
+                "alpha": 40.0, "psi": 60.0, "t_lc": np.linspace(40, 60, 100)}
+        with patch.object(Astrometry, "triple_lens_solver", wraps=Astrometry.triple_lens_solver) as solver:
+            Astrometry.centroid_shifts_3l(data, adaptive=True, tol=1e-3)
+            assert solver.call_args.kwargs["tol"] < 1e-3
+            Astrometry.centroid_shifts_3l(data, adaptive=True)
+            assert solver.call_args.kwargs["tol"] < Astrometry.three_lens_resolution(data)["tol"]
+
+    def test_binary_lens_adaptive(self):
+        """Test the adaptive 2L mode against the solver on every epoch."""
+        data = {"t0": 50.0, "tE": 10.0, "u0": 0.1, "rho": 0.005, "q": 0.01, "s": 1.2, "alpha": 40.0,
+                "BJD": np.linspace(20, 80, 1500)}
+        full_x, full_y, _ = Astrometry.binary_lens_solver(data)(data["BJD"])
+
+        model, system, dx, dy = Astrometry.centroid_shifts_2l(data, adaptive=True, tol=1e-4)
+
+        assert model is None and system is None
+        np.testing.assert_allclose(dx, full_x, rtol=0, atol=2e-4)
+        np.testing.assert_allclose(dy, full_y, rtol=0, atol=2e-4)
+
+        with pytest.raises(ValueError, match="time grid"):
+            Astrometry.centroid_shifts_2l({k: v for k, v in data.items() if k != "BJD"}, adaptive=True)
+
+    def test_triple_lens_adaptive(self):
+        """Test the adaptive 3L mode against the solver on every epoch."""
+        data = {"t0": 50.0, "tE": 10.0, "u0": 0.2, "rho": 0.005, "q2": 0.01, "q3": 0.001, "s2": 1.2, "s3": 0.9,
+                "alpha": 40.0, "psi": 60.0, "t_lc": np.linspace(40, 60, 200)}
+        full_x, full_y, _ = Astrometry.triple_lens_solver(data)(data["t_lc"])
+
+        _, _, dx, dy = Astrometry.centroid_shifts_3l(data, adaptive=True, tol=1e-4)
+
+        np.testing.assert_allclose(dx, full_x, rtol=0, atol=2e-4)
+        np.testing.assert_allclose(dy, full_y, rtol=0, atol=2e-4)
+
+
+class TestBinaryLensBatch:
+    """Test the batched 2L centroid evaluation."""
+
+    @staticmethod
+    def events():
+        return pd.DataFrame({
+            "t0": [50.0, 55.0, 48.0, 60.0],
+            "tE": [10.0, 20.0, 5.0, 12.0],
+            "u0": [0.1, 0.3, 0.05, 0.2],
+            "rho": [0.005, 0.001, 0.01, 0.002],
+            "q": [0.01, 0.01, 0.001, 0.0101],
+            "s": [1.2, 1.2, 0.8, 1.201],
+            "alpha": [40.0, 120.0, 250.0, 10.0],
+        })
+
+    def test_matches_per_event_solver(self):
+        """Test ragged per-event grids against binary_lens_solver."""
+        params = self.events()
+        grids = [np.linspace(30, 70, n) for n in (50, 80, 10, 30)]
+
+        delta_x, delta_y = Astrometry.centroid_shifts_2l_batch(params, grids)
+
+        assert [len(x) for x in delta_x] == [50, 80, 10, 30]
+        for (_, row), grid, dx, dy in zip(params.iterrows(), grids, delta_x, delta_y):
+            expected_x, expected_y, _ = Astrometry.binary_lens_solver(row.to_dict())(grid)
+            np.testing.assert_allclose(dx, expected_x, rtol=0, atol=1e-6)
+            np.testing.assert_allclose(dy, expected_y, rtol=0, atol=1e-6)
+
+    def test_shared_grid_and_padding(self):
+        """Test a shared time grid and NaN padding of ragged grids."""
+        params = self.events()
+        grid = np.linspace(40, 60, 25)
+
+        shared_x, _ = Astrometry.centroid_shifts_2l_batch(params, grid, padded=True)
+        ragged_x, _ = Astrometry.centroid_shifts_2l_batch(params, [grid, grid[:5], grid, grid[:10]], padded=True)
+
+        assert shared_x.shape == ragged_x.shape == (4, 25)
+        assert not np.isnan(shared_x).any()
+        np.testing.assert_array_equal(np.isnan(ragged_x).sum(axis=1), [0, 20, 0, 15])
+        np.testing.assert_allclose(ragged_x[1, :5], shared_x[1, :5], rtol=0, atol=1e-6)
+
+    def test_group_tolerance(self):
+        """Test that bucketed grouping evaluates near-identical lenses at the bucket centre."""
+        params = self.events()
+        grid = np.linspace(55, 65, 20)
+
+        exact_x, _ = Astrometry.centroid_shifts_2l_batch(params, grid, padded=True)
+        with pytest.warns(UserWarning, match="bucket centre"):
+            bucket_x, _ = Astrometry.centroid_shifts_2l_batch(params, grid, group_tol=0.01, padded=True)
+
+        centre = params.iloc[[3]].assign(q=10 ** -2.0, s=10 ** 0.08)
+        centre_x, _ = Astrometry.centroid_shifts_2l_batch(centre, grid, padded=True)
+        np.testing.assert_allclose(bucket_x[3], centre_x[0], rtol=0, atol=1e-6)
+        assert not np.allclose(bucket_x[3], exact_x[3], rtol=0, atol=1e-9)
+
+    def test_grid_count_mismatch(self):
+        """Test that a wrong number of time grids raises."""
+        with pytest.raises(ValueError, match="time grids"):
+            Astrometry.centroid_shifts_2l_batch(self.events(), [np.linspace(0, 1, 5)] * 3)
+
+
+def _cache_round_trip(args):
+    """Store and reload entries from a worker process; returns the keys that read back wrong."""
+    cache_dir, seed = args
+    cache = CentroidCache(cache_dir, max_bytes=40_000)
+    bad = []
+    for i in range(40):
+        data = {"t0": 0.0, "tE": 10.0, "rho": 0.01, "u0": (seed + i) % 25 / 100, "t_lc": np.arange(50.0)}
+        key = cache.key(1, data)
+        expected = np.full(50, data["u0"])
+        cache.store(key, expected, -expected)
+        hit = CentroidCache(cache_dir).load(key)
+        if hit is not None and not (np.array_equal(hit[0], expected) and np.array_equal(hit[1], -expected)):
+            bad.append(key)
+    return bad
+
+
+class TestCentroidCache:
+    """Test the on-disk centroid cache."""
+
+    data = {"t0": 50.0, "tE": 10.0, "u0": 0.1, "rho": 0.01, "LDgamma": 0.5, "t_lc": np.linspace(30, 70, 400)}
+
+    def test_key_is_canonical(self, tmp_path):
+        """Test that the key depends on values, not on their types or on unrelated keys."""
+        cache = CentroidCache(tmp_path)
+        key = cache.key(1, self.data, fast=True)
+
+        assert key == cache.key(1, {**self.data, "t0": np.float32(50.0), "tE": 10, "name": "ev1"}, fast=True)
+        assert key == cache.key(1, {**self.data, "t_lc": list(self.data["t_lc"])}, fast=True)
+        assert key != cache.key(1, {**self.data, "u0": 0.1000001}, fast=True)
+        assert key != cache.key(1, {**self.data, "LDgamma": 0.4}, fast=True)
+        assert key != cache.key(1, {**self.data, "t_lc": self.data["t_lc"] + 1e-9}, fast=True)
+        assert key != cache.key(1, self.data, fast=False)
+        assert key != cache.key(2, self.data, fast=True)
+
+    def test_cached_centroid_shift(self, tmp_path, cache_dir, table):
+        """Test that a repeated computation is served from the cache."""
+        cache = CentroidCache(tmp_path / "centroids")
+        _, _, dx, dy = Astrometry.centroid_shift_1l(self.data, fast=True, cache_dir=cache_dir, cache=cache)
+        entries = list(cache.cache_dir.glob("*/*.npy"))
+        assert len(entries) == 1
+
+        os.utime(entries[0], ns=(0, 0))
+        model, system, dx_hit, dy_hit = Astrometry.centroid_shift_1l(
+            self.data, fast=True, cache_dir=cache_dir, cache=cache
+        )
+
+        assert model is None and system is None
+        np.testing.assert_array_equal(dx_hit, dx)
+        np.testing.assert_array_equal(dy_hit, dy)
+        assert entries[0].stat().st_mtime_ns > 0  # the hit refreshed the entry's recency
+
+    def test_lru_eviction(self, tmp_path):
+        """Test that the least recently used entries are evicted first."""
+        cache = CentroidCache(tmp_path, max_bytes=10 ** 9)
+        keys = [cache.key(1, {**self.data, "u0": u0}) for u0 in (0.1, 0.2, 0.3, 0.4)]
+        for i, key in enumerate(keys):
+            cache.store(key, np.zeros(100), np.zeros(100))
+            os.utime(cache.entry_path(key), ns=(i * 10 ** 9, i * 10 ** 9))
+        cache.load(keys[0])  # most recently used now
+        entry_size = cache.entry_path(keys[0]).stat().st_size
+
+        cache.max_bytes = 2 * entry_size
+        assert cache.evict() == 2 * entry_size
+
+        assert [cache.load(key) is not None for key in keys] == [True, False, False, True]
+
+    def test_concurrent_processes(self, tmp_path):
+        """Test that processes storing, loading and evicting concurrently only ever read complete entries."""
+        with ProcessPoolExecutor(max_workers=4) as pool:
+            bad = list(pool.map(_cache_round_trip, [(tmp_path, seed) for seed in range(8)]))
+
+        assert bad == [[]] * 8
+        assert CentroidCache(tmp_path, max_bytes=40_000).evict() <= 40_000
+        assert not list(tmp_path.glob("*/*.tmp"))
+
+
+class TestThreeLensResolution:
+    """Test the 3L1S resolution presets."""
+
+    data = {"t0": 0.0, "tE": 20.0, "u0": 0.05, "rho": 0.002, "q2": 0.01, "q3": 0.001, "s2": 1.05, "s3": 0.95,
+            "alpha": 30.0, "psi": 70.0, "t_lc": np.linspace(-30, 30, 300)}
+
+    def test_presets(self):
+        """Test named presets, overrides and unknown names."""
+        standard = {"secnum": 45, "basenum": 2, "tol": 1e-4, "max_step": 0.1}
+        assert Astrometry.three_lens_resolution(self.data) == standard
+        assert Astrometry.three_lens_resolution(self.data, "fast")["secnum"] < 45
+        assert Astrometry.three_lens_resolution(self.data, {"secnum": 60}) == {**standard, "secnum": 60}
+        with pytest.raises(ValueError, match="Unknown resolution"):
+            Astrometry.three_lens_resolution(self.data, "ultra")
+
+    def test_caustic_approach(self):
+        """Test the closest approach against a densely sampled trajectory."""
+        wide = {**self.data, "u0": 0.8}
+        tau = np.linspace(-1.5, 1.5, 20001)
+        alpha = np.radians(wide["alpha"])
+        y1 = wide["u0"] * np.sin(alpha) + tau * np.cos(alpha)
+        y2 = wide["u0"] * np.cos(alpha) - tau * np.sin(alpha)
+
+        import VBMicrolensing
+        vbm = VBMicrolensing.VBMicrolensing()
+        psi = np.radians(wide["psi"])
+        m1 = 1 / (1 + wide["q2"] + wide["q3"])
+        vbm.SetLensGeometry([0, 0, m1, wide["s2"], 0, wide["q2"] * m1,
+                             wide["s3"] * np.cos(psi), wide["s3"] * np.sin(psi), wide["q3"] * m1])
+        caustics = np.hstack([np.asarray(curve) for curve in vbm.Multicaustics()])
+        expected = np.min(np.hypot(caustics[0][:, None] - y1, caustics[1][:, None] - y2))
+
+        approach = Astrometry.caustic_approach_3l(wide, times=wide["tE"] * tau)
+        assert approach == pytest.approx(expected, abs=1e-4)
+
+    def test_auto(self):
+        """Test that auto refines crossings and relaxes distant, non-resonant events."""
+        crossing = Astrometry.three_lens_resolution(self.data, "auto")
+        distant = Astrometry.three_lens_resolution({**self.data, "u0": 1.5, "s2": 2.0, "s3": 0.5}, "auto")
+
+        precise = Astrometry.three_lens_resolution(self.data, "precise")
+        fast = Astrometry.three_lens_resolution(self.data, "fast")
+        assert (crossing["secnum"], crossing["max_step"]) == (precise["secnum"], precise["max_step"])
+        assert (distant["secnum"], distant["max_step"]) == (fast["secnum"], fast["max_step"])
+        assert crossing["tol"] == distant["tol"] == 1e-4
+
+    def test_auto_sets_adaptive_grid(self):
+        """Test that auto reaches the VBMicrolensing path through the adaptive grid spacing."""
+        with patch.object(Astrometry, "adaptive_sample", wraps=Astrometry.adaptive_sample) as sample:
+            Astrometry.centroid_shifts_3l(self.data, adaptive=True, resolution="standard")
+            assert sample.call_args.kwargs["max_step"] == pytest.approx(self.data["tE"] / 10)
+            Astrometry.centroid_shifts_3l(self.data, adaptive=True, resolution="auto")
+            assert sample.call_args.kwargs["max_step"] == pytest.approx(self.data["tE"] / 40)
+            Astrometry.centroid_shifts_3l(self.data, adaptive=True, resolution="auto", max_step=1.0)
+            assert sample.call_args.kwargs["max_step"] == 1.0
+
+        trajectory = ((self.data["t_lc"] - self.data["t0"]) / self.data["tE"], np.full(300, self.data["u0"]))
+        with patch.object(Astrometry, "caustic_approach_3l") as approach:
+            auto = Astrometry.centroid_shifts_3l(self.data, resolution="auto", trajectory=trajectory)
+            approach.assert_not_called()
+        standard = Astrometry.centroid_shifts_3l(self.data, resolution="standard", trajectory=trajectory)
+        np.testing.assert_array_equal(auto[2], standard[2])
+
+    def test_adaptive_accuracy_follows_preset(self):
+        """Test that the preset tolerance sets the adaptive centroid error."""
+        ref_x, ref_y, _ = Astrometry.triple_lens_solver(self.data, tol=1e-7)(self.data["t_lc"])
+        errors = {}
+        for preset in ("fast", "precise"):
+            _, _, dx, dy = Astrometry.centroid_shifts_3l(self.data, adaptive=True, resolution=preset)
+            errors[preset] = max(np.max(np.abs(dx - ref_x)), np.max(np.abs(dy - ref_y)))
+
+        assert errors["precise"] < 5e-5 < errors["fast"] < 1e-3
+
+    def test_cache_hit_skips_auto(self, tmp_path):
+        """Test that cache hits do not resolve the resolution, and that the spec is part of the key."""
+        cache = CentroidCache(tmp_path)
+        first = Astrometry.centroid_shifts_3l(self.data, adaptive=True, cache=cache, resolution="auto")
+
+        with patch.object(Astrometry, "three_lens_resolution", wraps=Astrometry.three_lens_resolution) as resolve:
+            hit = Astrometry.centroid_shifts_3l(self.data, adaptive=True, cache=cache, resolution="auto")
+            assert resolve.call_count == 0
+            Astrometry.centroid_shifts_3l(self.data, adaptive=True, cache=cache, resolution={"tol": 1e-3})
+            assert resolve.call_count == 1
+
+        np.testing.assert_array_equal(hit[2], first[2])
+        np.testing.assert_array_equal(hit[3], first[3])
+
+
+class TestTrajectories:
+    """Test the parallax trajectory stage and its use by the centroid methods."""
+
+    @staticmethod
+    def light_curve(times, parallax=True):
+        lc = pd.DataFrame({"BJD": times})
+        if parallax:
+            lc["parallax_shift_t"] = 0.05 * np.sin(times / 30.0)
+            lc["parallax_shift_u"] = 0.03 * np.cos(times / 30.0)
+        return lc
+
+    def test_batch_trajectories(self):
+        """Test tau/beta with and without the light curves' parallax columns."""
+        params = pd.DataFrame({"t0": [10.0, 20.0], "tE": [5.0, 8.0], "u0": [0.1, -0.3]})
+        lcs = [self.light_curve(np.linspace(0, 20, 50)), self.light_curve(np.linspace(5, 40, 30), parallax=False)]
+
+        (tau_a, beta_a), (tau_b, beta_b) = Astrometry.trajectories(params, lcs)
+
+        np.testing.assert_allclose(tau_a, (lcs[0]["BJD"] - 10.0) / 5.0 + lcs[0]["parallax_shift_t"])
+        np.testing.assert_allclose(beta_a, 0.1 + lcs[0]["parallax_shift_u"])
+        np.testing.assert_allclose(tau_b, (lcs[1]["BJD"] - 20.0) / 8.0)
+        np.testing.assert_allclose(beta_b, -0.3)
+
+        (tau_r, beta_r), _ = Astrometry.trajectories(params.to_dict("records"), lcs, parallax=False)
+        np.testing.assert_allclose(tau_r, (lcs[0]["BJD"] - 10.0) / 5.0)
+        np.testing.assert_allclose(beta_r, 0.1)
+
+        with pytest.raises(ValueError, match="light curves"):
+            Astrometry.trajectories(params, lcs[:1])
+
+    def test_parallax_without_shift_columns(self):
+        """Test that piEN/piEE are rejected when the light curve cannot apply them."""
+        params = [{"t0": 10.0, "tE": 5.0, "u0": 0.1, "piEN": 0.2, "piEE": 0.0}]
+        lcs = [self.light_curve(np.linspace(0, 20, 50), parallax=False)]
+
+        with pytest.raises(ValueError, match="parallax_shift_t/u"):
+            Astrometry.trajectories(params, lcs)
+        (tau, beta), = Astrometry.trajectories(params, lcs, parallax=False)
+        np.testing.assert_allclose(beta, 0.1)
+
+        params[0]["piEN"] = 0.0
+        (tau, beta), = Astrometry.trajectories(params, lcs)
+        np.testing.assert_allclose(tau, (lcs[0]["BJD"] - 10.0) / 5.0)
+
+    def test_sample_light_curves(self):
+        """Test the trajectory stage on the input/1L samples."""
+        from src.gulls_parser import GullsParser
+        from pathlib import Path
+
+        data_files = sorted((Path(__file__).parent.parent / "input" / "1L").glob("*.lc"))
+        if not data_files:
+            pytest.skip("no sample light curves")
+        lcs = [GullsParser.load_lc_file(f)[0] for f in data_files]
+        params = [{"t0": lc["BJD"].median(), "tE": 20.0, "u0": 0.1} for lc in lcs]
+
+        for lc, (tau, beta) in zip(lcs, Astrometry.trajectories(params, lcs)):
+            assert len(tau) == len(beta) == len(lc)
+            np.testing.assert_allclose(beta - 0.1, lc["parallax_shift_u"])
+
+    def test_single_lens(self, cache_dir, table):
+        """Test centroid_shift_1l on a precomputed trajectory."""
+        times = np.linspace(0, 40, 400)
+        data = {"t0": 20.0, "tE": 10.0, "u0": 0.2, "rho": 0.01, "BJD": times}
+        rectilinear = ((times - 20.0) / 10.0, np.full_like(times, 0.2))
+
+        _, _, fast_x, fast_y = Astrometry.centroid_shift_1l(data, fast=True, cache_dir=cache_dir)
+        _, _, dx, dy = Astrometry.centroid_shift_1l(data, fast=True, cache_dir=cache_dir, trajectory=rectilinear)
+        np.testing.assert_array_equal(dx, fast_x)
+        np.testing.assert_array_equal(dy, fast_y)
+
+        (tau, beta), = Astrometry.trajectories([data], [self.light_curve(times)])
+        model, _, dx, dy = Astrometry.centroid_shift_1l(data, trajectory=(tau, beta))
+        u = np.hypot(tau, beta)
+        shift = Astrometry.point_lens_shift(u, 0.01)
+        assert model is None
+        np.testing.assert_allclose(dx, shift * tau / u, rtol=1e-12)
+        np.testing.assert_allclose(dy, shift * beta / u, rtol=1e-12)
+        assert not np.allclose(dx, fast_x, rtol=0, atol=1e-6)
+
+        with pytest.raises(ValueError, match="does not match"):
+            Astrometry.centroid_shift_1l(data, trajectory=(tau[:-1], beta[:-1]))
+
+    def test_binary_and_triple_lens(self):
+        """Test the 2L/3L methods on precomputed trajectories."""
+        times = np.linspace(30, 70, 300)
+        lc = self.light_curve(times)
+        binary = {"t0": 50.0, "tE": 10.0, "u0": 0.1, "rho": 0.005, "q": 0.01, "s": 1.2, "alpha": 40.0, "BJD": times}
+        (tau, beta), = Astrometry.trajectories([binary], [lc])
+
+        rectilinear = ((times - 50.0) / 10.0, np.full_like(times, 0.1))
+        full_x, full_y, _ = Astrometry.binary_lens_solver(binary)(times)
+        _, _, dx, dy = Astrometry.centroid_shifts_2l(binary, trajectory=rectilinear)
+        np.testing.assert_allclose(dx, full_x, rtol=0, atol=1e-9)
+        np.testing.assert_allclose(dy, full_y, rtol=0, atol=1e-9)
+
+        _, _, dx, dy = Astrometry.centroid_shifts_2l(binary, trajectory=(tau, beta))
+        _, _, adaptive_x, adaptive_y = Astrometry.centroid_shifts_2l(binary, adaptive=True, trajectory=(tau, beta))
+        np.testing.assert_allclose(adaptive_x, dx, rtol=0, atol=2e-4)
+        np.testing.assert_allclose(adaptive_y, dy, rtol=0, atol=2e-4)
+        assert not np.allclose(dx, full_x, rtol=0, atol=1e-4)
+
+        batch_x, batch_y = Astrometry.centroid_shifts_2l_batch(
+            pd.DataFrame([{k: v for k, v in binary.items() if k != "BJD"}]), [times], trajectories=[(tau, beta)]
+        )
+        np.testing.assert_allclose(batch_x[0], dx, rtol=0, atol=1e-9)
+        np.testing.assert_allclose(batch_y[0], dy, rtol=0, atol=1e-9)
+
+        triple = {"t0": 50.0, "tE": 10.0, "u0": 0.1, "rho": 0.005, "q2": 0.01, "q3": 0.001, "s2": 1.2, "s3": 0.9,
+                  "alpha": 40.0, "psi": 60.0, "BJD": times[::10]}
+        full_x, full_y, _ = Astrometry.triple_lens_solver(triple)(triple["BJD"])
+        _, _, dx, dy = Astrometry.centroid_shifts_3l(triple, trajectory=(rectilinear[0][::10], rectilinear[1][::10]))
+        np.testing.assert_allclose(dx, full_x, rtol=0, atol=1e-9)
+        np.testing.assert_allclose(dy, full_y, rtol=0, atol=1e-9)
+
+        with patch.object(Astrometry, "triple_lens_solver", wraps=Astrometry.triple_lens_solver) as solver:
+            Astrometry.centroid_shifts_3l(triple, tol=1e-2, trajectory=(tau[::10], beta[::10]))
+        assert solver.call_args.kwargs["tol"] == 1e-2
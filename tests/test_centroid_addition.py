@@ -0,0 +1,224 @@
+"""
+Tests for the CentroidAddition module.
+"""
+import pytest
+import numpy as np
+import pandas as pd
+
+from src.centroid_addition import CentroidAddition, GaussianPSF, MoffatPSF, RadialPSF, TabulatedPSF
+
+
+def reference_shifts(relative_flux, source_position, lens_positions, lens_fluxes):
+    """Per-epoch loop over add_centroids, as simulate_astrometric_shift used to do."""
+    shifts = []
+    for flux in relative_flux:
+        if flux <= 0:
+            shifts.append(np.array([0.0, 0.0]))
+            continue
+        all_positions = np.vstack([source_position, lens_positions])
+        all_fluxes = np.hstack([flux, lens_fluxes])
+        shifts.append(CentroidAddition.add_centroids(all_positions, all_fluxes) - source_position)
+    return np.array(shifts)
+
+
+class TestSimulateAstrometricShift:
+    """Test the vectorised simulate_astrometric_shift."""
+
+    def test_matches_per_epoch_loop(self):
+        """Test against the per-epoch add_centroids loop."""
+        rng = np.random.default_rng(42)
+        relative_flux = rng.uniform(-0.5, 5.0, size=200)
+        source_position = np.array([0.3, -0.2])
+        lens_positions = np.array([[0.5, 0.1], [-1.0, 2.0]])
+        lens_fluxes = np.array([0.2, 0.05])
+
+        df = pd.DataFrame({'relative_flux': relative_flux})
+        result = CentroidAddition().simulate_astrometric_shift(df, source_position, lens_positions, lens_fluxes)
+
+        expected = reference_shifts(relative_flux, source_position, lens_positions, lens_fluxes)
+        np.testing.assert_allclose(result['astrometric_shift_x'], expected[:, 0], rtol=1e-12, atol=1e-15)
+        np.testing.assert_allclose(result['astrometric_shift_y'], expected[:, 1], rtol=1e-12, atol=1e-15)
+
+    def test_non_positive_flux_gives_zero_shift(self):
+        """Test that epochs with relative_flux <= 0 are not shifted."""
+        df = pd.DataFrame({'relative_flux': [0.0, -1.0, 1.0]})
+        result = CentroidAddition().simulate_astrometric_shift(
+            df, np.array([0.0, 0.0]), np.array([[1.0, 0.0]]), np.array([1.0])
+        )
+
+        np.testing.assert_array_equal(result['astrometric_shift_x'], [0.0, 0.0, 0.5])
+        np.testing.assert_array_equal(result['astrometric_shift_y'], [0.0, 0.0, 0.0])
+
+    def test_zero_total_flux(self):
+        """Test that zero total flux gives a zero centroid, as in add_centroids."""
+        source_position = np.array([0.4, 0.6])
+        df = pd.DataFrame({'relative_flux': [1.0]})
+        result = CentroidAddition().simulate_astrometric_shift(
+            df, source_position, np.array([[1.0, 1.0]]), np.array([-1.0])
+        )
+
+        expected = reference_shifts([1.0], source_position, np.array([[1.0, 1.0]]), np.array([-1.0]))
+        np.testing.assert_array_equal(result[['astrometric_shift_x', 'astrometric_shift_y']].to_numpy(), expected)
+
+    def test_mismatched_lens_inputs(self):
+        """Test that mismatched lens positions and fluxes raise."""
+        df = pd.DataFrame({'relative_flux': [1.0]})
+        with pytest.raises(ValueError):
+            CentroidAddition().simulate_astrometric_shift(
+                df, np.array([0.0, 0.0]), np.array([[1.0, 0.0], [2.0, 0.0]]), np.array([1.0])
+            )
+
+
+class TestAddCentroidsBatch:
+    """Test the batched add_centroids_batch."""
+
+    def test_matches_add_centroids(self):
+        """Test each element against the single-set add_centroids."""
+        rng = np.random.default_rng(1)
+        positions = rng.normal(size=(4, 5, 3, 2))
+        fluxes = rng.uniform(0.1, 2.0, size=(4, 5, 3))
+
+        result = CentroidAddition.add_centroids_batch(positions, fluxes)
+
+        assert result.shape == (4, 5, 2)
+        for i in range(4):
+            for j in range(5):
+                np.testing.assert_allclose(result[i, j], CentroidAddition.add_centroids(positions[i, j], fluxes[i, j]))
+
+    def test_broadcast_fixed_positions(self):
+        """Test a fixed (N, 2) position array against an (epochs, N) flux history."""
+        positions = np.array([[0.0, 0.0], [1.0, 2.0]])
+        fluxes = np.array([[1.0, 1.0], [3.0, 1.0], [1.0, 0.0]])
+
+        result = CentroidAddition.add_centroids_batch(positions, fluxes)
+
+        np.testing.assert_allclose(result, [[0.5, 1.0], [0.25, 0.5], [0.0, 0.0]])
+
+    def test_zero_total_flux_masked_per_element(self):
+        """Test that only the zero-flux elements become zero vectors."""
+        positions = np.array([[1.0, 1.0], [3.0, 3.0]])
+        fluxes = np.array([[1.0, -1.0], [1.0, 1.0]])
+
+        result = CentroidAddition.add_centroids_batch(positions, fluxes)
+
+        np.testing.assert_array_equal(result, [[0.0, 0.0], [2.0, 2.0]])
+
+    def test_out_buffer(self):
+        """Test that results are written into the supplied buffer."""
+        positions = np.array([[0.0, 0.0], [2.0, 0.0]])
+        fluxes = np.array([[1.0, 1.0], [0.0, 2.0]])
+        out = np.full((2, 2), np.nan)
+
+        result = CentroidAddition.add_centroids_batch(positions, fluxes, out=out)
+
+        assert result is out
+        np.testing.assert_array_equal(out, [[1.0, 0.0], [2.0, 0.0]])
+
+        with pytest.raises(ValueError, match="out must have shape"):
+            CentroidAddition.add_centroids_batch(positions, fluxes, out=np.empty((3, 2)))
+
+    def test_shape_mismatch(self):
+        """Test that mismatched N raises."""
+        with pytest.raises(ValueError):
+            CentroidAddition.add_centroids_batch(np.zeros((3, 2)), np.ones(2))
+
+
+def grid_centroid(psf, positions, fluxes, center, aperture, n=2001):
+    """Centroid of the summed PSF images inside the aperture on a dense pixel grid."""
+    x = np.linspace(-aperture, aperture, n)
+    X, Y = np.meshgrid(x, x)
+    inside = X ** 2 + Y ** 2 < aperture ** 2
+    image = sum(f * psf.profile(np.hypot(X + center[0] - px, Y + center[1] - py))
+                for (px, py), f in zip(positions, fluxes)) * inside
+    return np.array([center[0] + (image * X).sum() / image.sum(), center[1] + (image * Y).sum() / image.sum()])
+
+
+class TestPsfCentroids:
+    """Test the PSF-convolved aperture centroids."""
+
+    positions = np.array([[0.1, 0.05], [0.6, -0.3], [-1.2, 0.9]])
+    fluxes = np.array([3.0, 1.0, 0.5])
+    center = np.array([0.0, 0.0])
+
+    @pytest.mark.parametrize("psf", [GaussianPSF(1.0), MoffatPSF(1.0, beta=2.5)], ids=["gaussian", "moffat"])
+    def test_matches_pixel_grid(self, psf):
+        """Test against direct integration of the blended image in the aperture."""
+        result = CentroidAddition.psf_centroids(self.positions, self.fluxes, psf, aperture=1.5, center=self.center)
+        expected = grid_centroid(psf, self.positions, self.fluxes, self.center, 1.5)
+        np.testing.assert_allclose(result, expected, rtol=0, atol=2e-4)
+
+    def test_truncation_pulls_towards_center(self):
+        """Test that the aperture biases the centroid away from flux weighting, less as it grows."""
+        psf = MoffatPSF(1.0)
+        weighted = CentroidAddition.add_centroids(self.positions, self.fluxes)
+        bias = [np.linalg.norm(CentroidAddition.psf_centroids(
+            self.positions, self.fluxes, psf, aperture=aperture, center=self.center) - weighted)
+            for aperture in (1.0, 3.0, 30.0)]
+        assert bias[0] > bias[1] > bias[2]
+        assert bias[2] < 1e-3
+
+        gaussian = CentroidAddition.psf_centroids(self.positions, self.fluxes, GaussianPSF(1.0), aperture=20.0)
+        np.testing.assert_allclose(gaussian, weighted, rtol=0, atol=1e-9)
+        np.testing.assert_array_equal(CentroidAddition.psf_centroids(self.positions, self.fluxes), weighted)
+
+    def test_tabulated_profile(self, tmp_path):
+        """Test that a tabulated profile reproduces the analytic PSF."""
+        gaussian = GaussianPSF(1.0)
+        radius = np.linspace(0, 6, 6001)
+        np.savetxt(tmp_path / "psf.txt", np.column_stack([radius, 7.0 * gaussian.profile(radius)]))
+        tabulated = TabulatedPSF.from_file(tmp_path / "psf.txt")
+
+        np.testing.assert_allclose(tabulated.enclosed([0.5, 1.0, 2.0]), gaussian.enclosed([0.5, 1.0, 2.0]), atol=1e-6)
+        result = CentroidAddition.psf_centroids(self.positions, self.fluxes, tabulated, aperture=1.5, center=self.center)
+        expected = CentroidAddition.psf_centroids(self.positions, self.fluxes, gaussian, aperture=1.5, center=self.center)
+        np.testing.assert_allclose(result, expected, rtol=0, atol=1e-5)
+
+    def test_batched_epochs_and_recentering(self):
+        """Test per-epoch fluxes, per-element equality and re-centring."""
+        psf = GaussianPSF(0.8)
+        fluxes = np.array([[3.0, 1.0, 0.5], [10.0, 1.0, 0.5], [1.0, 1.0, 0.0]])
+        batch = CentroidAddition.psf_centroids(self.positions, fluxes, psf, aperture=1.2, center=self.center)
+        for row, flux in zip(batch, fluxes):
+            single = CentroidAddition.psf_centroids(self.positions, flux, psf, aperture=1.2, center=self.center)
+            np.testing.assert_allclose(row, single, rtol=0, atol=1e-14)
+
+        once = CentroidAddition.psf_centroids(self.positions, fluxes, psf, aperture=1.2, center=self.center)
+        again = CentroidAddition.psf_centroids(self.positions, fluxes, psf, aperture=1.2, center=once)
+        recentred = CentroidAddition.psf_centroids(self.positions, fluxes, psf, aperture=1.2, center=self.center,
+                                                   iterations=1)
+        np.testing.assert_allclose(recentred, again, rtol=0, atol=1e-14)
+
+    def test_simulate_with_aperture(self):
+        """Test simulate_astrometric_shift with a PSF aperture around the source."""
+        df = pd.DataFrame({'relative_flux': [1.0, 5.0]})
+        source_position = np.array([0.0, 0.0])
+        lens_positions = np.array([[0.5, 0.0]])
+
+        result = CentroidAddition().simulate_astrometric_shift(
+            df.copy(), source_position, lens_positions, np.array([1.0]), psf=GaussianPSF(1.0), aperture=1.0
+        )
+        weighted = CentroidAddition().simulate_astrometric_shift(df.copy(), source_position, lens_positions, np.array([1.0]))
+
+        assert np.all(result['astrometric_shift_x'] > 0)
+        assert np.all(result['astrometric_shift_x'] < weighted['astrometric_shift_x'])
+        np.testing.assert_array_equal(result['astrometric_shift_y'], 0.0)
+
+    def test_invalid_inputs(self):
+        """Test that an aperture without a PSF and a non-normalisable Moffat raise."""
+        with pytest.raises(ValueError, match="PSF model"):
+            CentroidAddition.psf_centroids(self.positions, self.fluxes, aperture=1.0)
+        with pytest.raises(ValueError, match="beta"):
+            MoffatPSF(1.0, beta=1.0)
+        with pytest.raises(ValueError, match="increasing"):
+            TabulatedPSF([0.0, 1.0, 0.5], [1.0, 0.5, 0.1])
+
+    def test_incomplete_subclass(self):
+        """Test that a PSF missing one of the abstract methods cannot be instantiated."""
+        class ProfileOnly(RadialPSF):
+            def profile(self, r):
+                return np.exp(-r)
+
+        with pytest.raises(TypeError, match="abstract"):
+            ProfileOnly()
+        with pytest.raises(TypeError):
+            RadialPSF()
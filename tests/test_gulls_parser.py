@@ -3,6 +3,8 @@ Tests for the GullsParser module.
 """
 import pytest
 import pathlib
+import json
+import warnings
 import pandas as pd
 import numpy as np
 import tempfile
@@ -10,7 +12,7 @@ import shutil
 from unittest.mock import patch, mock_open
 
 # Import the module to test
-from src.gulls_parser import GullsParser
+from src.gulls_parser import GullsParser, LcHeader, ZeroPointRegistry, EventStore, LightCurveCache, RunManifest
 
 
 class TestGullsParserInit:
@@ -42,9 +44,9 @@ class TestGullsParserInit:
         parser = GullsParser()
         
         expected_mapping = {
-            "t0_lens1": "t0",
+            "t0lens1": "t0",
             "tE_ref": "tE",
-            "u0_lens1": "u0",
+            "u0lens1": "u0",
             "rho": "rho",
             "piEN": "pi_EN",
             "piEE": "pi_EE"
@@ -153,6 +155,20 @@ class TestStaticMethods:
                           'parallax_shift_y', 'parallax_shift_z']
         assert header == expected_columns
     
+    def test_load_lc_file_dtypes(self, temp_dir, sample_lc_file_content):
+        """Test that known light curve columns get their declared dtypes."""
+        lc_file = temp_dir / "test.lc"
+        lc_file.write_text(sample_lc_file_content)
+
+        df, comment_text, header = GullsParser.load_lc_file(lc_file)
+
+        assert df["observatory_code"].dtype == np.int64
+        assert df["saturation_flag"].dtype == np.int64
+        # all-zero column must stay float rather than being inferred as int
+        assert df["lens1_y"].dtype == np.float64
+        assert df["BJD"].iloc[0] == pytest.approx(2458346.5059686)
+        assert comment_text.count("#") == 10
+
     def test_load_lc_file_not_exists(self, temp_dir):
         """Test loading a non-existent light curve file."""
         non_existent_file = temp_dir / "non_existent.lc"
@@ -185,6 +201,184 @@ class TestStaticMethods:
         assert "Simulation_time,measured_relative_flux,sigma_x,sigma_y" in content
 
 
+class TestLcHeader:
+    """Test the parsed GULLS comment header."""
+
+    def test_load_lc_file_parse_header(self, temp_dir, sample_lc_file_content):
+        """Test that load_lc_file returns every keyword as a float array."""
+        lc_file = temp_dir / "wg09_test_ffp_1_841_67.det.lc"
+        lc_file.write_text(sample_lc_file_content)
+
+        _, comment_text, _ = GullsParser.load_lc_file(lc_file)
+        df, lc_header, header = GullsParser.load_lc_file(lc_file, parse_header=True)
+
+        assert isinstance(lc_header, LcHeader)
+        assert lc_header.comment_text == comment_text
+        np.testing.assert_array_equal(lc_header.fs, [0.968348, 0.946456, 0.911917])
+        np.testing.assert_array_equal(lc_header.obssrcmag, [19.3117, 26.1783, 16.5804])
+        np.testing.assert_array_equal(lc_header.obslensmag, [24.9053, 31.7535, 22.1803])
+        np.testing.assert_array_equal(lc_header.obsgroup, [0, 3.51242e+06, 0, 1044.31, 0, 1, 2])
+        assert len(lc_header.sourcedata) == len(lc_header.lensdata) == 27
+        assert len(lc_header.planet) == 7 and len(lc_header.event) == 8
+        assert lc_header.extra == {}
+
+        GullsParser.load_lc_file(lc_file, cache_dir=temp_dir / "cache")  # fill the cache
+        cached = GullsParser.load_lc_file(lc_file, cache_dir=temp_dir / "cache", parse_header=True)
+        np.testing.assert_array_equal(cached[1].event, lc_header.event)
+
+    def test_keyword_dispatch_is_anchored(self):
+        """Test that only the keyword before ':' selects a field."""
+        lc_header = LcHeader.from_comment_text(
+            "#Obssrcmag: 1 2 3\n#halfs: 9 9 9\n# fs : 0.5 0.25\nnot a comment: 7\n#no colon 5"
+        )
+
+        np.testing.assert_array_equal(lc_header.fs, [0.5, 0.25])
+        np.testing.assert_array_equal(lc_header.obssrcmag, [1, 2, 3])
+        np.testing.assert_array_equal(lc_header.extra["halfs"], [9, 9, 9])
+        assert lc_header.obslensmag.shape == (0,)
+
+    def test_frozen(self):
+        """Test that neither the fields nor their arrays can be modified."""
+        lc_header = LcHeader.from_comment_text("#fs: 0.5 0.25")
+
+        with pytest.raises(AttributeError):
+            lc_header.fs = np.zeros(2)
+        with pytest.raises(ValueError):
+            lc_header.fs[0] = 1.0
+
+    def test_non_numeric_line(self):
+        """Test that a malformed keyword line raises."""
+        with pytest.raises(ValueError, match="#fs"):
+            LcHeader.from_comment_text("#fs: 0.5 abc")
+
+    def test_header_parameters(self):
+        """Test the per-observatory event dictionary entries."""
+        lc_header = LcHeader.from_comment_text("#fs: 0.5 0.25 0.1\n#Obssrcmag: 20 21 22\n#Obslensmag: 25 26 27")
+
+        parameters = GullsParser.header_parameters(lc_header)
+
+        assert parameters["FS_1"] == 0.25
+        assert parameters["ms_2"] == 22.0
+        assert parameters["FL_0"] == 25.0
+        np.testing.assert_array_equal(parameters["fs"], [0.5, 0.25, 0.1])
+
+
+class TestLightCurveCache:
+    """Test the parsed light curve cache behind load_lc_file."""
+
+    @pytest.fixture
+    def lc_file(self, temp_dir, sample_lc_file_content):
+        lc_file = temp_dir / "wg09_test_ffp_1_841_67.det.lc"
+        lc_file.write_text(sample_lc_file_content)
+        return lc_file
+
+    def test_cached_load_matches_parse(self, temp_dir, lc_file):
+        """Test that the cached triple equals the parsed one, dtypes included."""
+        cache_dir = temp_dir / "cache"
+        expected = GullsParser.load_lc_file(lc_file)
+
+        first = GullsParser.load_lc_file(lc_file, cache_dir=cache_dir)
+        array_path, sidecar_path = LightCurveCache(cache_dir).entry_paths(lc_file)
+        assert array_path.exists() and sidecar_path.exists()
+
+        with patch("src.gulls_parser.gulls_parser.pd.read_csv") as read_csv:
+            cached = GullsParser.load_lc_file(lc_file, cache_dir=cache_dir)
+            read_csv.assert_not_called()
+
+        for df, comment_text, header in (first, cached):
+            pd.testing.assert_frame_equal(df, expected[0])
+            assert comment_text == expected[1]
+            assert header == expected[2]
+        assert np.load(array_path, mmap_mode='r').dtype["observatory_code"] == np.int64
+
+    def test_modified_source_invalidates(self, temp_dir, lc_file, sample_lc_file_content):
+        """Test that a change in size or mtime forces a re-parse."""
+        cache_dir = temp_dir / "cache"
+        GullsParser.load_lc_file(lc_file, cache_dir=cache_dir)
+
+        lines = sample_lc_file_content.splitlines()
+        lc_file.write_text("\n".join(lines[:-1]) + "\n")
+        df, _, _ = GullsParser.load_lc_file(lc_file, cache_dir=cache_dir)
+
+        assert len(df) == len(GullsParser.load_lc_file(lc_file)[0])
+        assert LightCurveCache(cache_dir).load(lc_file) is not None
+
+    def test_corrupt_entry_falls_back_to_parse(self, temp_dir, lc_file):
+        """Test that an unreadable entry is ignored rather than raised."""
+        cache = LightCurveCache(temp_dir / "cache")
+        GullsParser.load_lc_file(lc_file, cache_dir=cache.cache_dir)
+        cache.entry_paths(lc_file)[1].write_text("{not json")
+
+        assert cache.load(lc_file) is None
+        df, _, _ = GullsParser.load_lc_file(lc_file, cache_dir=cache.cache_dir)
+        pd.testing.assert_frame_equal(df, GullsParser.load_lc_file(lc_file)[0])
+
+    def test_cached_load_does_not_copy(self, temp_dir, lc_file):
+        """Test that cached columns view the memory-mapped entry and edits stay in memory."""
+        cache = LightCurveCache(temp_dir / "cache")
+        GullsParser.load_lc_file(lc_file, cache_dir=cache.cache_dir)
+        array_path = cache.entry_paths(lc_file)[0]
+        df, _, header = cache.load(lc_file)
+
+        for col in header:
+            base = df[col].to_numpy()
+            while base is not None and not isinstance(base, np.memmap):
+                base = base.base
+            assert base is not None, col
+
+        before = np.load(array_path)
+        df.loc[0, header[0]] = -1
+        np.testing.assert_array_equal(np.load(array_path), before)
+
+
+class TestBinaryOutput:
+    """Test the columnar output backends of save_lc_output."""
+
+    @pytest.fixture
+    def processed(self, temp_dir, sample_lc_file_content):
+        lc_file = temp_dir / "wg09_test_ffp_1_841_67.det.lc"
+        lc_file.write_text(sample_lc_file_content)
+        df, comment_text, header = GullsParser.load_lc_file(lc_file)
+        df["sigma_x"] = 0.0
+        header = header + ["sigma_x"]
+        return df, comment_text, header
+
+    @pytest.mark.parametrize("output_format", ["npz", "parquet", "feather"])
+    def test_round_trip(self, temp_dir, processed, output_format):
+        """Test that columns, dtypes, and comment metadata survive a round trip."""
+        if output_format != "npz":
+            pytest.importorskip("pyarrow")
+        df, comment_text, header = processed
+        output_file = temp_dir / f"out.{output_format}"
+
+        GullsParser.save_lc_output(df, output_file, header, comment_text, output_format=output_format)
+        loaded, metadata, loaded_header = GullsParser.load_lc_output(output_file)
+
+        assert loaded_header == header
+        pd.testing.assert_frame_equal(loaded, df[header])
+        assert loaded["observatory_code"].dtype == np.int64
+        assert metadata["fs"] == "0.968348 0.946456 0.911917"
+        assert metadata["Obssrcmag"] == "19.3117 26.1783 16.5804"
+        assert metadata["Event"].startswith("0.92019 327.325")
+        assert list(metadata)[0] == "fs"
+
+    def test_unknown_format(self, temp_dir, processed):
+        """Test that unknown formats are rejected."""
+        df, comment_text, header = processed
+        with pytest.raises(ValueError, match="Unknown output format"):
+            GullsParser.save_lc_output(df, temp_dir / "out.x", header, comment_text, output_format="xls")
+        with pytest.raises(ValueError, match="Unknown output format"):
+            GullsParser(output_format="xls")
+
+    def test_output_path_for(self):
+        """Test that binary formats swap the .lc suffix and text keeps the name."""
+        data_file = pathlib.Path("input/1L/wg09_test_ffp_1_841_67.det.lc")
+
+        assert GullsParser().output_path_for("output/1L", data_file) == pathlib.Path("output/1L/wg09_test_ffp_1_841_67.det.lc")
+        assert (GullsParser(output_format="parquet").output_path_for("output/1L", data_file)
+                == pathlib.Path("output/1L/wg09_test_ffp_1_841_67.det.parquet"))
+
+
 class TestMasterFileLoading:
     """Test master file loading methods."""
     
@@ -236,6 +430,255 @@ class TestMasterFileLoading:
             parser.load_triple_lens_master()
 
 
+class TestMasterProjection:
+    """Test that only the mapped master columns are loaded."""
+
+    def test_master_columns(self):
+        """Test the columns requested for each lens type."""
+        parser = GullsParser()
+
+        single = parser.master_columns("single")
+        assert single[:3] == ["SubRun", "Field", "EventID"]
+        assert set(single[3:]) == set(parser.master_column_mapping)
+        assert set(parser.master_columns("binary")) == set(single) | {"q", "s", "alpha"}
+        assert set(parser.master_columns("triple")) == set(single) | {"q", "s", "alpha", "q3", "s3", "psi"}
+        assert GullsParser(load_all_master_columns=True).master_columns("single") is None
+        with pytest.raises(ValueError, match="Unknown lens type"):
+            parser.master_columns("quad")
+
+    def test_read_csv_projection(self, temp_dir, sample_master_data):
+        """Test that a CSV master is read with only the requested columns and compact dtypes."""
+        master_file = temp_dir / "master.csv"
+        sample_master_data.to_csv(master_file, index=False)
+
+        df = GullsParser.read_master(master_file, columns=["SubRun", "Field", "EventID", "tE_ref", "not_there"])
+
+        assert list(df.columns) == ["EventID", "SubRun", "Field", "tE_ref"]
+        assert df["SubRun"].dtype == np.int32 and df["Field"].dtype == np.int32
+        assert df["EventID"].dtype == np.int64
+        np.testing.assert_array_equal(df["tE_ref"], sample_master_data["tE_ref"])
+        assert len(GullsParser.read_master(master_file).columns) == len(sample_master_data.columns)
+
+    @pytest.mark.parametrize("hdf_format", ["table", "fixed"])
+    def test_read_hdf5_projection(self, temp_dir, sample_master_data, hdf_format):
+        """Test HDF5 masters in table (column-wise read) and fixed format."""
+        pytest.importorskip("tables")
+        master_file = temp_dir / "master.hdf5"
+        sample_master_data.to_hdf(master_file, key="data", mode="w", format=hdf_format)
+
+        df = GullsParser.read_master(master_file, columns=["SubRun", "Field", "EventID", "rho", "not_there"])
+
+        assert list(df.columns) == ["SubRun", "Field", "EventID", "rho"]
+        assert df["Field"].dtype == np.int32
+        np.testing.assert_array_equal(df["rho"], sample_master_data["rho"])
+
+    def test_load_single_lens_master_projection(self, test_project_structure):
+        """Test that the lens master loaders use the projection unless told otherwise."""
+        test_project_structure['master_files'][1].unlink()
+        kwargs = {"input_dir": str(test_project_structure['input_dir'])}
+
+        parser = GullsParser(**kwargs)
+        parser.load_single_lens_master()
+        assert set(parser.single_lens_master.columns) <= set(parser.master_columns("single"))
+        assert "galactic_l" not in parser.single_lens_master.columns
+        assert parser.get_master_row(parser.single_lens_master, parser.single_lens_master_index, (1, 841, 76))["rho"].iloc[0] == 0.003156
+
+        parser = GullsParser(load_all_master_columns=True, **kwargs)
+        parser.load_single_lens_master()
+        assert "galactic_l" in parser.single_lens_master.columns
+
+
+class TestMasterStreaming:
+    """Test chunked master reading filtered to the events on disk."""
+
+    def test_event_keys(self, test_project_structure):
+        """Test that keys come from the light curve file names, skipping unparseable ones."""
+        (test_project_structure['single_lens_dir'] / "notes.dat").write_text("x")
+
+        assert GullsParser.event_keys(test_project_structure['single_lens_dir']) == {(1, 841, 67), (1, 841, 76)}
+
+    def test_stream_csv(self, temp_dir, sample_master_data):
+        """Test that chunked CSV reading keeps only the requested events."""
+        master_file = temp_dir / "master.csv"
+        sample_master_data.to_csv(master_file, index=False)
+
+        df = GullsParser.stream_master([master_file], {(1, 841, 84), (1, 841, 67), (2, 1, 1)},
+                                       columns=["SubRun", "Field", "EventID", "rho"], chunksize=1)
+
+        assert list(df["EventID"]) == [67, 84]
+        assert df["Field"].dtype == np.int32
+        np.testing.assert_array_equal(df["rho"], sample_master_data["rho"].iloc[[0, 2]])
+
+    @pytest.mark.parametrize("hdf_format", ["table", "fixed"])
+    def test_stream_hdf5(self, temp_dir, sample_master_data, hdf_format):
+        """Test HDF5 masters: table stores are iterated, fixed stores read whole."""
+        pytest.importorskip("tables")
+        master_file = temp_dir / "master.hdf5"
+        sample_master_data.to_hdf(master_file, key="data", mode="w", format=hdf_format)
+
+        chunks = list(GullsParser.iter_master_chunks(master_file, chunksize=2))
+        assert [len(chunk) for chunk in chunks] == ([2, 1] if hdf_format == "table" else [3])
+
+        df = GullsParser.stream_master([master_file], {(1, 841, 76)}, chunksize=2)
+        assert list(df["EventID"]) == [76]
+        assert df["q"].iloc[0] == 0.005
+
+    def test_stream_no_matches(self, temp_dir, sample_master_data):
+        """Test that no matching events gives an empty frame with the master columns."""
+        master_file = temp_dir / "master.csv"
+        sample_master_data.to_csv(master_file, index=False)
+
+        df = GullsParser.stream_master([master_file], set(), chunksize=2)
+
+        assert df.empty
+        assert list(df.columns) == list(sample_master_data.columns)
+
+    def test_stream_missing_key_column(self, temp_dir, sample_master_data):
+        """Test that a master without the key columns raises KeyError."""
+        master_file = temp_dir / "master.csv"
+        sample_master_data.drop(columns="Field").to_csv(master_file, index=False)
+
+        with pytest.raises(KeyError, match="Field"):
+            GullsParser.stream_master([master_file], {(1, 841, 67)})
+
+    def test_load_single_lens_master_streaming(self, test_project_structure):
+        """Test that master_chunksize builds only the events with light curves."""
+        test_project_structure['master_files'][1].unlink()
+
+        parser = GullsParser(input_dir=str(test_project_structure['input_dir']), master_chunksize=1)
+        parser.load_single_lens_master()
+
+        assert set(parser.single_lens_master_index) == {(1, 841, 67), (1, 841, 76)}
+        assert "galactic_l" not in parser.single_lens_master.columns
+        assert parser.get_master_row(parser.single_lens_master, parser.single_lens_master_index, (1, 841, 76))["rho"].iloc[0] == 0.003156
+
+
+class TestMasterIndex:
+    """Test the (SubRun, Field, EventID) master index."""
+
+    def test_build_master_index(self, sample_master_data):
+        """Test that keys map to row positions."""
+        index = GullsParser.build_master_index(sample_master_data)
+
+        assert index == {(1, 841, 67): 0, (1, 841, 76): 1, (1, 841, 84): 2}
+
+    def test_build_master_index_normalises_dtypes(self, sample_master_data):
+        """Test that str and float key columns are normalised to int."""
+        master = sample_master_data.copy()
+        master["SubRun"] = master["SubRun"].astype(str)
+        master["Field"] = master["Field"].astype(float)
+
+        index = GullsParser.build_master_index(master)
+
+        assert (1, 841, 76) in index
+
+    def test_build_master_index_duplicates(self, sample_master_data):
+        """Test that duplicated keys raise a clear error."""
+        master = pd.concat([sample_master_data, sample_master_data.iloc[[1]]], ignore_index=True)
+
+        with pytest.raises(ValueError, match=r"Duplicate .*\(1, 841, 76\)"):
+            GullsParser.build_master_index(master)
+
+    def test_parse_event_key(self):
+        """Test that the light curve suffixes, and only those, are stripped before parsing."""
+        assert GullsParser.parse_event_key("wg09_test_ffp_1_841_67.det.lc") == (1, 841, 67)
+        assert GullsParser.parse_event_key(pathlib.Path("input/1L/wg09_test_ffp_2_8_573.lc")) == (2, 8, 573)
+        assert GullsParser.parse_event_key("run.v1.2_test_3_841_12.det.lc") == (3, 841, 12)
+        assert GullsParser.parse_event_key("run.v1.2_test_3_841_12.dat") == (3, 841, 12)
+
+        with pytest.raises(ValueError, match="Cannot parse"):
+            GullsParser.parse_event_key("master.csv")
+
+    def test_get_master_row(self, sample_master_data):
+        """Test row lookup and the missing-key error."""
+        index = GullsParser.build_master_index(sample_master_data)
+
+        row = GullsParser.get_master_row(sample_master_data, index, ("1", "841", "84"))
+        assert len(row) == 1
+        assert row["EventID"].values[0] == 84
+
+        with pytest.raises(ValueError, match="No matching row"):
+            GullsParser.get_master_row(sample_master_data, index, (1, 841, 999))
+
+
+ZEROPOINT_TABLE = """# %ECSV 1.0
+# schema: astropy-2.0
+detector element VegaMag ABMag STMag FLAM FNU PHOTLAM PHOTNU
+WFI01 F087 25.6 26.2 27.2 4.6e-20 1.1e-30 2.0e-08 5.1e-19
+WFI01 F146 26.3 27.5 28.5 1.7e-20 1.0e-30 1.2e-08 6.9e-19
+WFI02 F146 26.3 27.6 28.5 1.7e-20 1.0e-30 1.2e-08 6.9e-19
+WFI01 F213 24.3 26.0 29.1 7.6e-21 1.1e-30 8.3e-09 1.1e-18
+"""
+
+
+class TestZeroPoints:
+    """Test the cached zero point registry behind get_zeropoint."""
+
+    def test_lookup_order_and_default_detector(self, temp_dir):
+        """Test that zero points follow the element order, first detector by default."""
+        table = temp_dir / "zp.ecsv"
+        table.write_text(ZEROPOINT_TABLE)
+
+        zp = GullsParser.get_zeropoint(["F146", "F087", "F213"], table_path=table)
+
+        np.testing.assert_array_equal(zp, [27.5, 26.2, 26.0])
+        assert GullsParser.get_zeropoint(["F146"], table_path=table, detector="WFI02")[0] == 27.6
+
+    def test_table_parsed_once(self, temp_dir):
+        """Test that repeated lookups do not re-read the table."""
+        table = temp_dir / "zp.ecsv"
+        table.write_text(ZEROPOINT_TABLE)
+        registry = ZeroPointRegistry()
+
+        with patch.object(ZeroPointRegistry, "read_table", wraps=ZeroPointRegistry.read_table) as read_table:
+            for _ in range(5):
+                registry.lookup(["F146", "F087"], table)
+            registry.lookup(["F213"], table)
+
+        assert read_table.call_count == 1
+
+    def test_modified_table_is_reloaded(self, temp_dir):
+        """Test that a rewritten table is picked up."""
+        table = temp_dir / "zp.ecsv"
+        table.write_text(ZEROPOINT_TABLE)
+        registry = ZeroPointRegistry()
+        assert registry.lookup(["F087"], table)[0] == 26.2
+
+        table.write_text(ZEROPOINT_TABLE.replace("26.2", "26.25"))
+
+        assert registry.lookup(["F087"], table)[0] == 26.25
+
+    def test_returned_array_is_independent(self, temp_dir):
+        """Test that callers cannot corrupt the memoised array."""
+        table = temp_dir / "zp.ecsv"
+        table.write_text(ZEROPOINT_TABLE)
+        registry = ZeroPointRegistry()
+
+        registry.lookup(["F087"], table)[0] = 0.0
+
+        assert registry.lookup(["F087"], table)[0] == 26.2
+
+    def test_unknown_element(self, temp_dir):
+        """Test that a missing element raises."""
+        table = temp_dir / "zp.ecsv"
+        table.write_text(ZEROPOINT_TABLE)
+
+        with pytest.raises(ValueError, match="Element 'F999' not found"):
+            GullsParser.get_zeropoint(["F999"], table_path=table)
+        with pytest.raises(ValueError, match="for detector 'WFI02'"):
+            GullsParser.get_zeropoint(["F087"], table_path=table, detector="WFI02")
+
+    def test_real_table(self):
+        """Test the shipped Roman table."""
+        table = pathlib.Path("input/Roman_zeropoints_20240301.ecsv")
+        if not table.exists():
+            pytest.skip("Roman zero point table not available")
+
+        zp = GullsParser.get_zeropoint(["F146", "F087", "F213"], table_path=table)
+
+        assert zp[0] == pytest.approx(27.538551048094657)
+
+
 class TestProcessing:
     """Test data processing methods."""
     
@@ -269,6 +712,8 @@ class TestProcessing:
         
         # Create master file
         master_data = pd.DataFrame({'EventID': [1], 'SubRun': [1], 'Field': [841]})
+        for gulls_key in GullsParser().master_column_mapping:
+            master_data[gulls_key] = 0.5
         master_file = single_lens_dir / "master.csv"
         master_data.to_csv(master_file, index=False)
         
@@ -306,6 +751,357 @@ class TestProcessing:
             pass
 
 
+    def test_process_single_lens_file_gulls_master(self, temp_dir):
+        """Test one real light curve against a master with the columns of the GULLS 1L_master.head."""
+        sample = pathlib.Path("input/1L/wg09_test_ffp_1_673_851.det.lc")
+        master_head = pathlib.Path("1L_master.head")
+        if not sample.exists() or not master_head.exists() or not pathlib.Path("input/Roman_zeropoints_20240301.ecsv").exists():
+            pytest.skip("sample light curve, master header or Roman zero point table not available")
+        single_lens_dir = temp_dir / "input" / "1L"
+        single_lens_dir.mkdir(parents=True)
+        data_file = single_lens_dir / sample.name
+        shutil.copy(sample, data_file)
+        master = pd.read_csv(master_head, sep=r"\s+").head(1)
+        master[["SubRun", "Field", "EventID"]] = [1, 673, 851]
+        master.to_csv(single_lens_dir / "master.csv", index=False)
+        (temp_dir / "output" / "1L").mkdir(parents=True)
+
+        parser = GullsParser(input_dir=str(temp_dir / "input"), output_dir=str(temp_dir / "output"), output_format="npz")
+        parser.load_single_lens_master()
+        parser.process_single_lens_file(data_file)
+
+        df, _, header = GullsParser.load_lc_output(parser.output_path_for(parser.output_single_lens_dir, data_file))
+        assert header[-4:] == ["sigma_x", "sigma_y", "sigma_x_err", "sigma_y_err"]
+        assert len(df) == len(GullsParser.load_lc_file(sample)[0])
+
+    def test_missing_mapped_column_fails_at_load(self, temp_dir):
+        """Test that a master without a mapped column is rejected when it is loaded."""
+        single_lens_dir = temp_dir / "input" / "1L"
+        single_lens_dir.mkdir(parents=True)
+        pd.DataFrame({"SubRun": [1], "Field": [673], "EventID": [851], "t0_lens1": [0.5], "tE_ref": [10.0],
+                      "u0lens1": [0.1], "rho": [0.001], "piEN": [0.0], "piEE": [0.0]}).to_csv(
+            single_lens_dir / "master.csv", index=False
+        )
+
+        for kwargs in ({}, {"master_chunksize": 10}, {"load_all_master_columns": True}):
+            parser = GullsParser(input_dir=str(temp_dir / "input"), output_dir=str(temp_dir / "output"), **kwargs)
+            with pytest.raises(KeyError, match="t0lens1"):
+                parser.load_single_lens_master()
+
+
+class CopyingParser(GullsParser):
+    """Parser whose per-event step just copies the light curve, for driver tests."""
+
+    def process_single_lens_file(self, data_file, add_astrometry=True, lc=None):
+        key = GullsParser.parse_event_key(data_file)
+        GullsParser.get_master_row(self.single_lens_master, self.single_lens_master_index, key)
+        df, lc_header, header = lc if lc is not None else self.read_event(data_file)
+        self.write_event("single", self.output_single_lens_dir, data_file, key, df, header, lc_header.comment_text)
+
+
+class TestParallelProcessing:
+    """Test the process-pool driver behind the process_* methods."""
+
+    def _make_parser(self, test_project_structure, output_dir):
+        input_dir = test_project_structure['input_dir']
+        # keep a single master so the keys are unique
+        test_project_structure['master_files'][1].unlink()
+        parser = CopyingParser(input_dir=str(input_dir), output_dir=str(output_dir))
+        (output_dir / "1L").mkdir(parents=True, exist_ok=True)
+        return parser
+
+    def test_parallel_matches_serial(self, test_project_structure):
+        """Test that the pool produces the same files as the serial loop."""
+        temp_dir = test_project_structure['temp_dir']
+        serial = self._make_parser(test_project_structure, temp_dir / "serial")
+        parallel = CopyingParser(input_dir=str(test_project_structure['input_dir']), output_dir=str(temp_dir / "parallel"))
+        (temp_dir / "parallel" / "1L").mkdir(parents=True)
+
+        assert serial.process_single_lens(workers=1) == {}
+        assert parallel.process_single_lens(workers=2) == {}
+
+        serial_files = sorted((temp_dir / "serial" / "1L").glob("*.lc"))
+        assert len(serial_files) == 2
+        for serial_file in serial_files:
+            parallel_file = temp_dir / "parallel" / "1L" / serial_file.name
+            assert parallel_file.read_text() == serial_file.read_text()
+
+    def test_parallel_reports_failures_per_event(self, test_project_structure):
+        """Test that a failing event is reported without aborting the others."""
+        single_lens_dir = test_project_structure['single_lens_dir']
+        orphan = single_lens_dir / "wg09_test_ffp_1_841_999.det.lc"
+        orphan.write_text(test_project_structure['lc_files'][0].read_text())
+        parser = self._make_parser(test_project_structure, test_project_structure['temp_dir'] / "out")
+
+        failures = parser.process_single_lens(workers=2)
+
+        assert list(failures) == [orphan]
+        assert "No matching row" in failures[orphan]
+        assert len(list((test_project_structure['temp_dir'] / "out" / "1L").glob("*.lc"))) == 2
+
+    def test_serial_raises(self, test_project_structure):
+        """Test that the serial path still raises on the first failure."""
+        single_lens_dir = test_project_structure['single_lens_dir']
+        (single_lens_dir / "wg09_test_ffp_1_841_999.det.lc").write_text("")
+        parser = self._make_parser(test_project_structure, test_project_structure['temp_dir'] / "out")
+
+        with pytest.raises(ValueError):
+            parser.process_single_lens(workers=1)
+
+
+class TestPipelinedProcessing:
+    """Test the prefetching reader / background writer pipeline of serial runs."""
+
+    def _make_parser(self, test_project_structure, output_dir, **kwargs):
+        test_project_structure['master_files'][1].unlink(missing_ok=True)
+        parser = CopyingParser(input_dir=str(test_project_structure['input_dir']), output_dir=str(output_dir), **kwargs)
+        (output_dir / "1L").mkdir(parents=True, exist_ok=True)
+        return parser
+
+    @pytest.mark.parametrize("prefetch", [1, 4])
+    def test_pipelined_matches_serial(self, test_project_structure, prefetch):
+        """Test that prefetching produces the same files as the plain serial loop."""
+        temp_dir = test_project_structure['temp_dir']
+        serial = self._make_parser(test_project_structure, temp_dir / "serial")
+        pipelined = self._make_parser(test_project_structure, temp_dir / "pipelined", prefetch=prefetch)
+
+        serial.process_single_lens(workers=1)
+        assert pipelined.process_single_lens(workers=1) == {}
+        assert pipelined.write_queue is None
+
+        serial_files = sorted((temp_dir / "serial" / "1L").glob("*.lc"))
+        assert len(serial_files) == 2
+        for serial_file in serial_files:
+            assert (temp_dir / "pipelined" / "1L" / serial_file.name).read_text() == serial_file.read_text()
+
+    def test_pipelined_into_store(self, test_project_structure):
+        """Test that the writer thread fills the hdf5 store."""
+        pytest.importorskip("tables")
+        output_dir = test_project_structure['temp_dir'] / "out"
+        parser = self._make_parser(test_project_structure, output_dir, output_format="hdf5", prefetch=2)
+
+        parser.process_single_lens()
+
+        with EventStore(output_dir / "events.h5", mode="r") as store:
+            assert sorted(store.read_index()["EventID"].tolist()) == [67, 76]
+
+    def test_compute_error_raises(self, test_project_structure):
+        """Test that the first failing event raises as in the serial loop."""
+        single_lens_dir = test_project_structure['single_lens_dir']
+        (single_lens_dir / "wg09_test_ffp_1_841_999.det.lc").write_text(test_project_structure['lc_files'][0].read_text())
+        parser = self._make_parser(test_project_structure, test_project_structure['temp_dir'] / "out", prefetch=2)
+
+        with pytest.raises(ValueError, match="No matching row"):
+            parser.process_single_lens()
+        assert parser.write_queue is None
+
+    def test_write_error_raises(self, test_project_structure):
+        """Test that an error in the writer thread reaches the caller."""
+        output_dir = test_project_structure['temp_dir'] / "out"
+        parser = self._make_parser(test_project_structure, output_dir, prefetch=2)
+        (output_dir / "1L").rmdir()
+        (output_dir / "1L").write_text("not a directory")
+
+        with pytest.raises(OSError):
+            parser.process_single_lens()
+
+
+class CountingParser(CopyingParser):
+    """CopyingParser that remembers which events it processed."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.processed = []
+
+    def process_single_lens_file(self, data_file, add_astrometry=True, lc=None):
+        self.processed.append(pathlib.Path(data_file).name)
+        super().process_single_lens_file(data_file, add_astrometry=add_astrometry, lc=lc)
+
+
+class TestResume:
+    """Test resumable runs driven by the completion manifest."""
+
+    @pytest.fixture
+    def project(self, test_project_structure):
+        test_project_structure['master_files'][1].unlink()
+        (test_project_structure['temp_dir'] / "out" / "1L").mkdir(parents=True)
+        return test_project_structure
+
+    def _run(self, project, workers=1, **kwargs):
+        parser = CountingParser(
+            input_dir=str(project['input_dir']), output_dir=str(project['temp_dir'] / "out"), resume=True, **kwargs
+        )
+        assert parser.process_single_lens(workers=workers) == {}
+        return parser
+
+    def test_rerun_skips_finished_events(self, project):
+        """Test that a second run with the same configuration does nothing."""
+        assert len(self._run(project).processed) == 2
+        assert self._run(project).processed == []
+
+        entries = RunManifest(project['temp_dir'] / "out" / "manifest.jsonl").entries
+        assert sorted(pathlib.Path(source).name for source in entries) == sorted(f.name for f in project['lc_files'])
+
+    def test_changed_input_or_config_is_redone(self, project):
+        """Test that a touched input file or a new configuration invalidates entries."""
+        self._run(project)
+        lc_file = project['lc_files'][0]
+        lc_file.write_text(lc_file.read_text() + "\n")
+
+        assert self._run(project).processed == [lc_file.name]
+
+        parser = CountingParser(
+            input_dir=str(project['input_dir']), output_dir=str(project['temp_dir'] / "out"), resume=True
+        )
+        parser.process_single_lens(add_astrometry=False)
+        assert len(parser.processed) == 2
+
+    def test_damaged_output_is_redone(self, project):
+        """Test that truncated or missing outputs are detected."""
+        self._run(project)
+        outputs = sorted((project['temp_dir'] / "out" / "1L").glob("*.lc"))
+        outputs[0].write_text("# half written\n")
+        outputs[1].unlink()
+
+        assert sorted(self._run(project).processed) == sorted(f.name for f in outputs)
+
+    def test_resume_after_failure(self, project):
+        """Test that events finished before a crash are not redone."""
+        orphan = project['single_lens_dir'] / "wg09_test_ffp_1_841_999.det.lc"
+        orphan.write_text(project['lc_files'][0].read_text())
+        parser = CountingParser(
+            input_dir=str(project['input_dir']), output_dir=str(project['temp_dir'] / "out"), resume=True
+        )
+        with pytest.raises(ValueError, match="No matching row"):
+            parser.process_single_lens()
+        finished = parser.processed[:parser.processed.index(orphan.name)]
+        # a crash while writing the manifest leaves a torn last line
+        with open(project['temp_dir'] / "out" / "manifest.jsonl", 'a') as f:
+            f.write('{"source": "')
+        orphan.unlink()
+
+        redone = self._run(project).processed
+        assert sorted(redone + finished) == sorted(f.name for f in project['lc_files'])
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_resume_into_store(self, project, workers):
+        """Test resumable runs with the hdf5 event store, serial and parallel."""
+        pytest.importorskip("tables")
+        self._run(project, workers=workers, output_format="hdf5")
+
+        assert self._run(project, output_format="hdf5").processed == []
+
+    def test_changed_master_is_redone(self, project):
+        """Test that editing the master file invalidates the finished events."""
+        self._run(project)
+        master = project['master_files'][0]
+        master.write_text(master.read_text() + "\n")
+
+        assert len(self._run(project).processed) == 2
+
+    def test_resume_into_store_checks_rows(self, project):
+        """Test that an event whose stored rows disagree with the manifest is redone."""
+        pytest.importorskip("tables")
+        parser = self._run(project, output_format="hdf5")
+        manifest_path = project['temp_dir'] / "out" / "manifest.jsonl"
+        entries = list(RunManifest(manifest_path).entries.values())
+        entries[0]["output_signature"]["n_rows"] += 1
+        with open(manifest_path, 'a') as f:
+            f.write(json.dumps(entries[0]) + "\n")
+
+        redone = self._run(project, output_format="hdf5").processed
+        assert redone == [pathlib.Path(entries[0]["source"]).name]
+        with EventStore(parser.event_store_path, mode="r") as store:
+            group = entries[0]["output"]
+            assert store.stored_rows(group) == store.read_index().set_index("group").loc[group, "n_rows"]
+
+    def test_resume_parallel_text(self, project):
+        """Test that the parent records the events written by pool workers."""
+        self._run(project, workers=2)
+
+        assert len(RunManifest(project['temp_dir'] / "out" / "manifest.jsonl").entries) == 2
+        assert self._run(project).processed == []
+
+
+class TestEventStore:
+    """Test the consolidated HDF5 event store."""
+
+    @pytest.fixture
+    def processed(self, temp_dir, sample_lc_file_content):
+        lc_file = temp_dir / "wg09_test_ffp_1_841_67.det.lc"
+        lc_file.write_text(sample_lc_file_content)
+        df, comment_text, header = GullsParser.load_lc_file(lc_file)
+        return df, comment_text, header
+
+    def test_round_trip(self, temp_dir, processed):
+        """Test that an event, its metadata, and its index row survive a round trip."""
+        pytest.importorskip("tables")
+        df, comment_text, header = processed
+
+        with EventStore(temp_dir / "events.h5") as store:
+            store.append("single", (1, 841, 67), df, header, comment_text, source="a.lc")
+        with EventStore(temp_dir / "events.h5", mode="r") as store:
+            loaded, metadata, loaded_header = store.read("single", (1, 841, 67))
+            index = store.read_index()
+
+        assert loaded_header == header
+        pd.testing.assert_frame_equal(loaded, df[header])
+        assert metadata["fs"] == "0.968348 0.946456 0.911917"
+        assert index[["lens", "SubRun", "Field", "EventID", "group", "n_rows"]].values.tolist() == [
+            ["single", 1, 841, 67, "/single/s1_f841_e67", len(df)]
+        ]
+
+    def test_rewrite_keeps_latest(self, temp_dir, processed):
+        """Test that re-writing an event replaces it and leaves one index row."""
+        pytest.importorskip("tables")
+        df, comment_text, header = processed
+
+        with EventStore(temp_dir / "events.h5") as store:
+            store.append("single", (1, 841, 67), df, header, comment_text, source="old.lc")
+            store.append("binary", (1, 841, 67), df, header, comment_text)
+            store.append("single", (1, 841, 67), df.iloc[:2], header, comment_text, source="new.lc")
+
+            index = store.read_index("single")
+            assert index["source"].tolist() == ["new.lc"]
+            assert index["n_rows"].tolist() == [2]
+            assert len(store.read("single", (1, 841, 67))[0]) == 2
+            assert len(store.read_index()) == 2
+
+            with pytest.raises(KeyError, match="No triple event"):
+                store.read("triple", (1, 841, 67))
+
+    def test_unknown_lens(self, temp_dir):
+        """Test that unknown lens groups are rejected."""
+        with pytest.raises(ValueError, match="Unknown lens group"):
+            EventStore.group_name("1L", (1, 841, 67))
+
+    def test_missing_store(self, temp_dir):
+        """Test that opening a missing store read-only raises."""
+        with pytest.raises(FileNotFoundError):
+            EventStore(temp_dir / "missing.h5", mode="r")
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_process_into_store(self, test_project_structure, workers):
+        """Test that the process_* drivers fill one store instead of one file per event."""
+        pytest.importorskip("tables")
+        test_project_structure['master_files'][1].unlink()
+        output_dir = test_project_structure['temp_dir'] / "out"
+        parser = CopyingParser(
+            input_dir=str(test_project_structure['input_dir']), output_dir=str(output_dir), output_format="hdf5"
+        )
+
+        assert parser.process_single_lens(workers=workers) == {}
+
+        assert [p.name for p in output_dir.iterdir()] == ["events.h5"]
+        with EventStore(output_dir / "events.h5", mode="r") as store:
+            index = store.read_index()
+            assert sorted(index["EventID"].tolist()) == [67, 76]
+            for lc_file in test_project_structure['lc_files']:
+                expected, _, header = GullsParser.load_lc_file(lc_file)
+                loaded, _, _ = store.read("single", GullsParser.parse_event_key(lc_file))
+                pd.testing.assert_frame_equal(loaded, expected[header])
+
+
 class TestErrorHandling:
     """Test error handling and edge cases."""
     
@@ -390,6 +1186,161 @@ class TestIntegration:
             assert EventID == "67"
 
 
+class TestPhotometry:
+    """Test the fused photometry kernel."""
+
+    @pytest.fixture
+    def inputs(self):
+        rng = np.random.default_rng(0)
+        n = 500
+        codes = rng.integers(0, 3, n)
+        true_F = rng.uniform(0.8, 20.0, n)
+        F = true_F * rng.normal(1.0, 0.01, n)
+        return {
+            "observatory_codes": codes,
+            "true_F": true_F,
+            "true_F_err": 0.004 * true_F,
+            "F": F,
+            "F_err": 0.004 * F,
+            "fs": np.array([0.968348, 0.946456, 0.911917]),
+            "ms": np.array([19.3117, 26.1783, 16.5804]),
+            "zp": np.array([27.54, 26.23, 25.92]),
+        }
+
+    def test_matches_reference_formulas(self, inputs):
+        """Test each output against the separate magnitude and flux formulas."""
+        result = GullsParser.photometry(**inputs)
+
+        codes = inputs["observatory_codes"]
+        fs, ms, zp = inputs["fs"][codes], inputs["ms"][codes], inputs["zp"][codes]
+        for prefix, F, F_err in (("true_", inputs["true_F"], inputs["true_F_err"]), ("", inputs["F"], inputs["F_err"])):
+            mag = ms + 2.5 * np.log10(fs) - 2.5 * np.log10(F)
+            mag_err = (2.5 / np.log(10)) * (F_err / F)
+            flux = 10 ** ((zp - mag) / 2.5)
+            np.testing.assert_allclose(result[prefix + "mag"], mag, rtol=1e-13)
+            np.testing.assert_allclose(result[prefix + "mag_err"], mag_err, rtol=1e-13)
+            np.testing.assert_allclose(result[prefix + "F"], flux, rtol=1e-12)
+            np.testing.assert_allclose(result[prefix + "F_err"], flux * mag_err * np.log(10) / 2.5, rtol=1e-12)
+
+    def test_float32_and_out_buffers(self, inputs):
+        """Test that float32 results are written into the supplied buffers."""
+        n = len(inputs["F"])
+        out = {"mag": np.empty(n, dtype=np.float32), "F_err": np.empty(n, dtype=np.float32)}
+
+        result = GullsParser.photometry(**inputs, dtype=np.float32, out=out)
+        reference = GullsParser.photometry(**inputs)
+
+        assert result["mag"] is out["mag"] and result["F_err"] is out["F_err"]
+        assert all(result[key].dtype == np.float32 for key in result)
+        for key in result:
+            np.testing.assert_allclose(result[key], reference[key], rtol=1e-5)
+
+        with pytest.raises(ValueError, match="out\\['mag'\\]"):
+            GullsParser.photometry(**inputs, out={"mag": np.empty(n)}, dtype=np.float32)
+
+    def test_non_positive_flux(self, inputs):
+        """Test that epochs without flux get NaN magnitudes and no warning."""
+        inputs["F"][:3] = [0.0, -0.5, np.nan]
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            result = GullsParser.photometry(**inputs)
+
+        assert np.isnan(result["mag"][:3]).all() and np.isnan(result["mag_err"][:3]).all()
+        assert np.isfinite(result["mag"][3:]).all() and np.isfinite(result["true_mag"]).all()
+        assert result["F"][0] == 0.0 and result["F"][1] < 0.0
+
+    def test_invalid_inputs(self, inputs):
+        """Test that bad observatory codes and lengths raise."""
+        with pytest.raises(ValueError, match="Observatory codes"):
+            GullsParser.photometry(**{**inputs, "observatory_codes": inputs["observatory_codes"] + 1})
+        with pytest.raises(ValueError, match="one entry per observatory"):
+            GullsParser.photometry(**{**inputs, "fs": inputs["fs"][:2]})
+        with pytest.raises(ValueError, match="same length"):
+            GullsParser.photometry(**{**inputs, "F": inputs["F"][:-1]})
+
+
+class TestAstrometricNoise:
+    """Test the per-epoch astrometric precision and noise model."""
+
+    @pytest.fixture
+    def dic(self):
+        rng = np.random.default_rng(3)
+        n = 2000
+        codes = rng.integers(0, 3, n)
+        true_F = rng.uniform(1e3, 1e5, n)
+        return {
+            "data": pd.DataFrame({"BJD": np.arange(n, dtype=float)}),
+            "obs": codes,
+            "true_F": true_F,
+            "F_err": np.sqrt(true_F),
+        }
+
+    def test_precision_scaling(self):
+        """Test sigma = FWHM / (2.3548 SNR) per filter, the floor and non-positive fluxes."""
+        fwhm = [105.0, 73.0]
+        sigma = GullsParser.astrometric_precision([0, 1, 0, 1], [100.0, 100.0, 400.0, 0.0], [1.0, 1.0, 2.0, 1.0], fwhm)
+
+        factor = 2 * np.sqrt(2 * np.log(2))
+        np.testing.assert_allclose(sigma[:3], [105.0 / factor / 100, 73.0 / factor / 100, 105.0 / factor / 200])
+        assert np.isnan(sigma[3])
+
+        floored = GullsParser.astrometric_precision([0], [100.0], [1.0], fwhm, floor=0.3)
+        np.testing.assert_allclose(floored, np.hypot(105.0 / factor / 100, 0.3))
+
+        with pytest.raises(ValueError, match="Observatory codes"):
+            GullsParser.astrometric_precision([2], [1.0], [1.0], fwhm)
+        with pytest.raises(ValueError, match="same length"):
+            GullsParser.astrometric_precision([0, 1], [1.0], [1.0, 1.0], fwhm)
+
+    def test_noise_reproducible_per_event(self):
+        """Test that an event's draws depend only on the seed, lens and key."""
+        sigma = np.full(100, 2.0)
+        first = GullsParser.astrometric_noise(sigma, GullsParser.event_rng(7, "single", (1, 841, 67)))
+        GullsParser.astrometric_noise(sigma, GullsParser.event_rng(7, "single", (1, 841, 76)))
+        again = GullsParser.astrometric_noise(sigma, GullsParser.event_rng(7, "single", ("1", "841", "67")))
+        np.testing.assert_array_equal(first, again)
+
+        for other in (GullsParser.event_rng(8, "single", (1, 841, 67)),
+                      GullsParser.event_rng(7, "binary", (1, 841, 67)),
+                      GullsParser.event_rng(7, "single", (1, 841, 76))):
+            assert not np.array_equal(GullsParser.astrometric_noise(sigma, other)[0], first[0])
+
+    def test_add_astrometric_noise(self, dic):
+        """Test the filled columns and that the draws follow the precision."""
+        parser = GullsParser(noise_seed=5)
+        parser.add_astrometric_noise(dic, "single", (1, 841, 67))
+        data = dic["data"]
+
+        fwhm = np.array([105.0, 73.0, 169.0])[dic["obs"]]
+        expected = fwhm / (2 * np.sqrt(2 * np.log(2))) / np.sqrt(dic["true_F"])
+        np.testing.assert_allclose(data["sigma_x_err"], expected)
+        np.testing.assert_array_equal(data["sigma_y_err"], data["sigma_x_err"])
+        for column in ("sigma_x", "sigma_y"):
+            pulls = data[column] / data["sigma_x_err"]
+            assert abs(pulls.mean()) < 0.1
+            assert abs(pulls.std() - 1) < 0.05
+
+        parser.filters = ["F146", "F999", "F213"]
+        with pytest.raises(KeyError, match="F999"):
+            parser.add_astrometric_noise(dic, "single", (1, 841, 67))
+
+    def test_non_positive_flux_is_nan(self, dic):
+        """Test that epochs without flux get NaN in every astrometry column, not inf."""
+        dic["true_F"][:5] = [0.0, -1.0, 0.0, -10.0, 0.0]
+        parser = GullsParser(astrometric_floor=0.1)
+        parser.add_astrometric_noise(dic, "single", (1, 841, 67))
+        data = dic["data"]
+
+        for column in ("sigma_x", "sigma_y", "sigma_x_err", "sigma_y_err"):
+            assert data[column][:5].isna().all()
+            assert np.isfinite(data[column][5:]).all()
+
+    def test_noise_settings_change_config_hash(self):
+        """Test that resumed runs do not mix noise configurations."""
+        assert GullsParser(noise_seed=1).config_hash() != GullsParser(noise_seed=2).config_hash()
+        assert GullsParser().config_hash() != GullsParser(astrometric_floor=0.1).config_hash()
+
+
 class TestUtilityFunctions:
     """Test utility and helper functions."""
     
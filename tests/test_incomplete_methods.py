@@ -180,6 +180,7 @@ Simulation_time measured_relative_flux measured_relative_flux_error true_relativ
         master_file = binary_dir / "master.csv"
         master_data = pd.DataFrame({
             'EventID': [1], 'SubRun': [1], 'Field': [841],
+            't0lens1': [100.0], 'tE_ref': [20.0], 'u0lens1': [0.1], 'rho': [0.001], 'piEN': [0.0], 'piEE': [0.0],
             'q': [0.1], 's': [1.5], 'alpha': [45.0]
         })
         master_data.to_csv(master_file, index=False)
@@ -203,6 +204,8 @@ Simulation_time measured_relative_flux measured_relative_flux_error true_relativ
         master_file = triple_dir / "master.csv"
         master_data = pd.DataFrame({
             'EventID': [1], 'SubRun': [1], 'Field': [841],
+            't0lens1': [100.0], 'tE_ref': [20.0], 'u0lens1': [0.1], 'rho': [0.001], 'piEN': [0.0], 'piEE': [0.0],
+            'q': [0.1], 's': [1.5], 'alpha': [45.0],
             'q3': [0.01], 's3': [2.0], 'psi': [30.0]
         })
         master_data.to_csv(master_file, index=False)
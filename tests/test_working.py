@@ -42,9 +42,9 @@ def test_master_column_mapping():
     parser = GullsParser()
     
     expected_mapping = {
-        "t0_lens1": "t0",
+        "t0lens1": "t0",
         "tE_ref": "tE", 
-        "u0_lens1": "u0",
+        "u0lens1": "u0",
         "rho": "rho",
         "piEN": "pi_EN",
         "piEE": "pi_EE"